@@ -0,0 +1,172 @@
+"""Benchmarks for KeyPresser start/stop latency, scheduling jitter and callback cost"""
+import random
+import threading
+import time
+
+from common import summarize, SlowBackend
+
+from core import key_presser
+from core.clock import VirtualClock
+from core.input_backend import RecordingBackend
+from core.key_presser import KeyPresser
+from core.precision_timer import PrecisionTimer
+from core.scheduler import Scheduler
+
+KEYS_CONFIG = [
+    {'key': 'l', 'press_twice': True},
+    {'key': 't', 'press_twice': True},
+    {'key': 'f1', 'press_twice': True},
+]
+
+
+def bench_start_to_first_press(iterations=50):
+    """Time from start() to the first injected key event (countdown disabled)"""
+    samples = []
+    startup_delay = key_presser.STARTUP_DELAY
+    key_presser.STARTUP_DELAY = 0
+    try:
+        for _ in range(iterations):
+            first_press = threading.Event()
+            backend = RecordingBackend(clock=time.perf_counter)
+            backend_send = backend.send
+
+            def send(events, backend_send=backend_send, first_press=first_press):
+                backend_send(events)
+                first_press.set()
+
+            backend.send = send
+            presser = KeyPresser(KEYS_CONFIG, 10, 14, backend=backend, scheduler=Scheduler())
+            started = time.perf_counter()
+            presser.start()
+            first_press.wait(5)
+            samples.append(backend.events[0][0] - started)
+            presser.stop()
+    finally:
+        key_presser.STARTUP_DELAY = startup_delay
+    return summarize(samples)
+
+
+def bench_stop_latency(iterations=50):
+    """Time spent in stop(), while idle and while a press is in progress"""
+    idle = []
+    mid_press = []
+    startup_delay = key_presser.STARTUP_DELAY
+    key_presser.STARTUP_DELAY = 0
+    try:
+        for _ in range(iterations):
+            # Idle: waiting for the next interval
+            presser = KeyPresser(KEYS_CONFIG, 10, 14, backend=RecordingBackend(), scheduler=Scheduler())
+            presser.start()
+            while presser.scheduler.next_deadline(presser) is None:
+                time.sleep(0.0005)
+            started = time.perf_counter()
+            presser.stop()
+            idle.append(time.perf_counter() - started)
+
+            # Worst case: inside a press, with a backend taking 5 ms per batch
+            backend = SlowBackend(0.005)
+            in_send = threading.Event()
+            backend_send = backend.send
+
+            def send(events, backend_send=backend_send, in_send=in_send):
+                in_send.set()
+                backend_send(events)
+
+            backend.send = send
+            presser = KeyPresser(KEYS_CONFIG, 10, 14, backend=backend, scheduler=Scheduler())
+            presser.start()
+            in_send.wait(5)
+            started = time.perf_counter()
+            presser.stop()
+            mid_press.append(time.perf_counter() - started)
+    finally:
+        key_presser.STARTUP_DELAY = startup_delay
+    return {'idle': summarize(idle), 'mid_press': summarize(mid_press)}
+
+
+class _JitterSession:
+    """Session that records how late each wake-up is relative to its deadline"""
+
+    # Woken like a key pressing session (spin before the deadline)
+    precise = True
+
+    def __init__(self, scheduler, period, fires, slips, done):
+        self.scheduler = scheduler
+        self.period = period
+        self.remaining = fires
+        self.slips = slips
+        self.done = done
+        self.deadline = None
+
+    def on_deadline(self, now):
+        self.slips.append(time.monotonic() - self.deadline)
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.done.release()
+            return None
+        self.deadline = time.monotonic() + self.period * random.uniform(0.5, 1.5)
+        return self.deadline
+
+
+def bench_wakeup_jitter(session_counts=(1, 10, 100), fires_per_session=20, period=0.01, spin_seconds=None):
+    """Lateness of scheduler wake-ups versus the planned deadline"""
+    results = {}
+    for count in session_counts:
+        timer = PrecisionTimer(spin_seconds=spin_seconds) if spin_seconds is not None else None
+        scheduler = Scheduler(timer=timer)
+        slips = []
+        done = threading.Semaphore(0)
+        for _ in range(count):
+            session = _JitterSession(scheduler, period, fires_per_session, slips, done)
+            session.deadline = time.monotonic() + period * random.random()
+            scheduler.register(session, session.deadline)
+        for _ in range(count):
+            done.acquire()
+        results[f'{count}_sessions'] = summarize(slips)
+    return results
+
+
+def bench_spin_budget(budgets=(0.0, 0.0005, 0.001, 0.002)):
+    """Deadline error of a single session for several precision timer spin budgets"""
+    return {
+        f'{budget * 1000:g}_ms': bench_wakeup_jitter(
+            session_counts=(1,), fires_per_session=100, spin_seconds=budget)['1_sessions']
+        for budget in budgets
+    }
+
+
+def bench_status_callback(days=7):
+    """Per-cycle cost of status callbacks, measured over a virtual-time session"""
+    def run(callback):
+        clock = VirtualClock()
+        scheduler = Scheduler(clock=clock, threaded=False)
+        presser = KeyPresser(KEYS_CONFIG, 10, 14, status_callback=callback, scheduler=scheduler,
+                             backend=RecordingBackend(clock=clock.monotonic), rng=random.Random(0))
+        presser.start()
+        started = time.perf_counter()
+        calls = scheduler.run_until(days * 24 * 60 * 60)
+        elapsed = time.perf_counter() - started
+        presser.stop()
+        return elapsed, calls
+
+    messages = []
+    baseline, calls = run(None)
+    with_callback, _ = run(messages.append)
+    return {
+        'scheduler_calls': calls,
+        'status_messages': len(messages),
+        'per_call_us_without_callback': baseline / calls * 1e6,
+        'per_call_us_with_callback': with_callback / calls * 1e6,
+        'overhead_per_message_us': max(0.0, with_callback - baseline) / max(1, len(messages)) * 1e6,
+    }
+
+
+def run():
+    """Run all key presser benchmarks"""
+    return {
+        'start_to_first_press_ms': bench_start_to_first_press(),
+        'stop_latency_ms': bench_stop_latency(),
+        'wakeup_jitter_ms': bench_wakeup_jitter(),
+        'deadline_error_ms_by_spin_budget': bench_spin_budget(),
+        'status_callback': bench_status_callback(),
+    }
@@ -0,0 +1,101 @@
+"""Benchmarks for the cost of logging on the key press path with a slow log disk"""
+import logging
+import random
+import time
+
+from common import summarize
+
+from core.clock import VirtualClock
+from core.input_backend import RecordingBackend
+from core.key_presser import KeyPresser
+from core.metrics import MetricsRegistry
+from core.scheduler import Scheduler
+from utils.log_setup import start_queue_logging, stop_logging
+
+KEYS_CONFIG = [
+    {'key': 'l', 'press_twice': True},
+    {'key': 't', 'press_twice': True},
+    {'key': 'f1', 'press_twice': True},
+]
+
+
+class SlowDiskHandler(logging.Handler):
+    """Handler that formats each record and then stalls, like a write to a slow disk"""
+
+    def __init__(self, delay):
+        super().__init__(logging.DEBUG)
+        self.delay = delay
+        self.records = 0
+
+    def emit(self, record):
+        self.format(record)
+        time.sleep(self.delay)
+        self.records += 1
+
+
+def _press_step_times(minutes):
+    """Run a KeyPresser for a span of virtual time and time every scheduler fire"""
+    clock = VirtualClock()
+    scheduler = Scheduler(clock=clock, threaded=False)
+    presser = KeyPresser(
+        KEYS_CONFIG, 1, 1,
+        scheduler=scheduler,
+        backend=RecordingBackend(clock=clock.monotonic),
+        rng=random.Random(0),
+        metrics=MetricsRegistry()
+    )
+
+    samples = []
+    on_deadline = presser.on_deadline
+
+    def timed_on_deadline(now):
+        started = time.perf_counter()
+        result = on_deadline(now)
+        samples.append(time.perf_counter() - started)
+        return result
+
+    presser.on_deadline = timed_on_deadline
+    presser.start()
+    scheduler.run_until(minutes * 60)
+    presser.stop()
+    return samples
+
+
+def bench_slow_disk(delay=0.005, minutes=120):
+    """Press step latency with a slow handler attached directly vs behind the queue"""
+    root = logging.getLogger()
+    previous_handlers = list(root.handlers)
+    previous_level = root.level
+    for handler in previous_handlers:
+        root.removeHandler(handler)
+
+    results = {'handler_delay_ms': delay * 1000}
+    try:
+        # Synchronous: the handler runs on the pressing thread
+        handler = SlowDiskHandler(delay)
+        root.setLevel(logging.DEBUG)
+        root.addHandler(handler)
+        results['direct'] = summarize(_press_step_times(minutes))
+        root.removeHandler(handler)
+
+        # Queued: the handler runs on the listener's writer thread
+        handler = SlowDiskHandler(delay)
+        start_queue_logging([handler])
+        results['queued'] = summarize(_press_step_times(minutes))
+        drain_started = time.perf_counter()
+        stop_logging()
+        results['queued']['drain_ms'] = (time.perf_counter() - drain_started) * 1000
+        results['queued']['records'] = handler.records
+    finally:
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in previous_handlers:
+            root.addHandler(handler)
+        root.setLevel(previous_level)
+    return results
+
+
+def run():
+    return {
+        'slow_disk': bench_slow_disk(),
+    }
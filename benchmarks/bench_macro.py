@@ -0,0 +1,114 @@
+"""Benchmarks for macro compilation, interpreter overhead and step timing accuracy"""
+import random
+import threading
+import time
+
+from common import summarize
+
+from core import key_presser
+from core.clock import VirtualClock
+from core.input_backend import RecordingBackend
+from core.key_presser import KeyPresser
+from core.macro import compile_macro
+from core.scheduler import Scheduler
+
+# A combo with holds, chords and fixed waits (about 1.3 s per cycle)
+MACRO = (
+    "tap l; wait 50ms; tap t; wait 50ms\n"
+    "hold shift 200ms; wait 100ms\n"
+    "ctrl+a; wait 100ms; down w; wait 300ms; up w; wait 100ms\n"
+    "f1; wait 250ms; tap e; wait 150ms; tap q"
+)
+
+
+def bench_compile(iterations=2000):
+    """Time to parse and compile the macro into a key plan"""
+    backend = RecordingBackend()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        compile_macro(MACRO, backend)
+        samples.append(time.perf_counter() - started)
+    return summarize(samples, scale=1e6)
+
+
+def bench_interpreter_overhead(days=1):
+    """Per-step cost of running the macro, measured over a virtual-time session"""
+    clock = VirtualClock()
+    scheduler = Scheduler(clock=clock, threaded=False)
+    backend = RecordingBackend(clock=clock.monotonic)
+    presser = KeyPresser([], 0.05, 0.05, scheduler=scheduler, backend=backend,
+                         rng=random.Random(0), macro=MACRO)
+    steps = len(compile_macro(MACRO, backend).steps)
+    presser.start()
+    started = time.perf_counter()
+    calls = scheduler.run_until(days * 24 * 60 * 60)
+    elapsed = time.perf_counter() - started
+    presser.stop()
+    return {
+        'scheduler_calls': calls,
+        'batches': backend.batch_count,
+        'steps_per_cycle': steps,
+        'per_batch_us': elapsed / max(1, backend.batch_count) * 1e6,
+    }
+
+
+def bench_step_accuracy(cycles=3):
+    """Lateness of each step past its absolute deadline (real time)"""
+    backend = RecordingBackend(clock=time.monotonic)
+    plan = compile_macro(MACRO, backend)
+    done = threading.Event()
+    expected_batches = len(plan.steps) * cycles
+    backend_send = backend.send
+
+    def send(events):
+        backend_send(events)
+        if backend.batch_count >= expected_batches:
+            done.set()
+
+    backend.send = send
+    interval_minutes = 0.01
+    startup_delay = key_presser.STARTUP_DELAY
+    # Short enough to keep the benchmark quick, long enough to read the
+    # first deadline before it is served
+    key_presser.STARTUP_DELAY = 0.2
+    try:
+        scheduler = Scheduler()
+        presser = KeyPresser([], interval_minutes, interval_minutes, backend=backend, scheduler=scheduler,
+                             macro=MACRO)
+        presser.start()
+        plan_start = scheduler.next_deadline(presser)
+        done.wait(10 * cycles)
+        presser.stop()
+    finally:
+        key_presser.STARTUP_DELAY = startup_delay
+
+    # One timestamp per batch, in order
+    batch_times = []
+    for timestamp, code, is_down in backend.events:
+        if not batch_times or timestamp != batch_times[-1]:
+            batch_times.append(timestamp)
+
+    # Every wait counts from the deadline before it, so the deadlines are the
+    # plan start plus the cumulative waits (the macro has no jitter and the
+    # interval is fixed)
+    deadlines = []
+    deadline = plan_start
+    for _ in range(cycles):
+        for gap in plan.gaps[:-1]:
+            deadlines.append(deadline)
+            deadline += gap
+        deadlines.append(deadline)
+        deadline += interval_minutes * 60
+
+    lateness = [max(0.0, sent - deadline) for sent, deadline in zip(batch_times, deadlines)]
+    return summarize(lateness)
+
+
+def run():
+    """Run all macro benchmarks"""
+    return {
+        'compile_us': bench_compile(),
+        'interpreter_overhead': bench_interpreter_overhead(),
+        'step_lateness_ms': bench_step_accuracy(),
+    }
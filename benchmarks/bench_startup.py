@@ -0,0 +1,100 @@
+"""Benchmarks for import time and memory of the headless and GUI entry paths"""
+import json
+import subprocess
+import sys
+
+from common import SRC_DIR, summarize
+
+# Modules each entry path imports before it can start pressing
+HEADLESS_IMPORTS = ['main', 'core.headless', 'utils.log_setup']
+GUI_IMPORTS = ['main', 'ttkbootstrap', 'gui.main_window', 'utils.log_setup']
+
+# Modules moved off the GUI's critical path and warmed up after first paint
+# (gui.main_window.WARM_UP_MODULES); importing them is the time-to-interactive
+# the deferral saves
+DEFERRED_IMPORTS = ['keyboard', 'pynput.keyboard', 'webbrowser']
+
+# Modules the headless path must never load
+GUI_TOOLKITS = ['tkinter', 'ttkbootstrap', 'PIL']
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {src!r})
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - started
+peak_kb = None
+try:
+    # Linux: the process's own high-water mark. ru_maxrss is not usable
+    # here, it keeps the parent's peak across fork/exec
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                peak_kb = int(line.split()[1])
+except OSError:
+    try:
+        import resource
+        # ru_maxrss is in bytes on macOS
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024
+    except ImportError:
+        try:
+            import psutil
+            peak_kb = psutil.Process().memory_info().peak_wset // 1024
+        except (ImportError, AttributeError):
+            peak_kb = None
+print(json.dumps({{
+    'import_seconds': elapsed,
+    'peak_rss_kb': peak_kb,
+    'toolkits_loaded': [m for m in {toolkits!r} if m in sys.modules],
+}}))
+"""
+
+
+def _probe(modules):
+    """Import modules in a fresh interpreter and report time and peak memory"""
+    code = PROBE.format(src=SRC_DIR, modules=modules, toolkits=GUI_TOOLKITS)
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return {'error': result.stderr.strip().splitlines()[-1] if result.stderr else 'failed'}
+    return json.loads(result.stdout)
+
+
+def bench_entry_path(modules, iterations=10):
+    """Import time and peak RSS of one entry path over several fresh processes"""
+    times = []
+    rss = []
+    toolkits = []
+    for _ in range(iterations):
+        sample = _probe(modules)
+        if 'error' in sample:
+            return sample
+        times.append(sample['import_seconds'])
+        if sample['peak_rss_kb'] is not None:
+            rss.append(sample['peak_rss_kb'])
+        toolkits = sample['toolkits_loaded']
+    return {
+        'import_ms': summarize(times),
+        'peak_rss_kb': max(rss) if rss else None,
+        'toolkits_loaded': toolkits,
+    }
+
+
+def run():
+    headless = bench_entry_path(HEADLESS_IMPORTS)
+    gui = bench_entry_path(GUI_IMPORTS)
+    deferred_modules = [
+        name for name in DEFERRED_IMPORTS
+        if 'error' not in _probe([name])
+    ]
+    results = {
+        'headless': headless,
+        'gui': gui,
+        'deferred': bench_entry_path(deferred_modules),
+        'deferred_modules': deferred_modules,
+    }
+    if 'error' not in headless and 'error' not in gui:
+        results['import_time_ratio'] = headless['import_ms']['p50'] / gui['import_ms']['p50']
+        if headless['peak_rss_kb'] and gui['peak_rss_kb']:
+            results['peak_rss_ratio'] = headless['peak_rss_kb'] / gui['peak_rss_kb']
+    return results
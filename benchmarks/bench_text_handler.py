@@ -0,0 +1,173 @@
+"""Benchmarks for the GUI TextHandler log pump under a burst of log records"""
+import logging
+import time
+
+from common import summarize
+
+from gui.log_buffer import LogRingBuffer
+from gui.text_handler import TextHandler, SimpleFormatter
+
+
+class FakeView:
+    """
+    Stand-in for the LogView widget that counts Tk calls.
+
+    Keeps the real LogRingBuffer so buffer costs are measured, and lets the
+    log pump be benchmarked on a headless box; each render would be a fixed
+    handful of Tcl round-trips (configure, delete, insert, configure and a
+    scrollbar update) on the real widget.
+    """
+
+    TK_CALLS_PER_RENDER = 5
+
+    def __init__(self):
+        self.buffer = LogRingBuffer(capacity=100000)
+        self.calls = 0
+        self.pending = []
+        self.bindings = {}
+        self.markers = []
+
+    def append(self, entries):
+        for level, text in entries:
+            self.buffer.append(text, level)
+            if text.startswith('... '):
+                self.markers.append(text)
+        self.calls += self.TK_CALLS_PER_RENDER
+
+    def after(self, ms, callback, *args):
+        self.calls += 1
+        self.pending.append((callback, args))
+        return f"after#{len(self.pending)}"
+
+    def after_idle(self, callback, *args):
+        return self.after(0, callback, *args)
+
+    def bind(self, sequence, func):
+        self.bindings[sequence] = func
+
+    def event_generate(self, sequence, **kwargs):
+        self.calls += 1
+        self.pending.append((self.bindings[sequence], (None,)))
+
+    def run_pending(self):
+        """Run the callbacks scheduled so far (one event loop pass)"""
+        pending, self.pending = self.pending, []
+        for callback, args in pending:
+            callback(*args)
+        return len(pending)
+
+
+def bench_burst(messages=20000):
+    """Push a burst of records through TextHandler and pump until drained"""
+    widget = FakeView()
+    handler = TextHandler(widget)
+    handler.setFormatter(SimpleFormatter())
+    widget.run_pending()
+    widget.calls = 0
+
+    logger = logging.getLogger('benchmark.text_handler')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    try:
+        started = time.perf_counter()
+        for i in range(messages):
+            logger.info("Pressed: L + T + F1 (%d)", i)
+        emitted = time.perf_counter()
+
+        # Run event loop passes until the pump has rendered every message
+        ticks = []
+        while handler.msg_queue:
+            tick_start = time.perf_counter()
+            if not widget.run_pending():
+                break
+            ticks.append(time.perf_counter() - tick_start)
+        drained = time.perf_counter()
+    finally:
+        logger.removeHandler(handler)
+
+    return {
+        'messages': messages,
+        'emit_per_second': messages / (emitted - started),
+        'messages_per_second': messages / (drained - started),
+        'dropped': widget_dropped(widget),
+        'tk_calls_per_message': widget.calls / messages,
+        'pump_tick_ms': summarize(ticks),
+    }
+
+
+def widget_dropped(widget):
+    """Count the messages reported as dropped by the pump's marker lines"""
+    return sum(int(line.split()[1]) for line in widget.markers)
+
+
+def bench_sustained(rate=10000, seconds=2.0):
+    """Log at a fixed rate while the event loop keeps pumping, like a live UI"""
+    widget = FakeView()
+    handler = TextHandler(widget)
+    handler.setFormatter(SimpleFormatter())
+
+    logger = logging.getLogger('benchmark.text_handler.sustained')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+
+    frame = 0.01  # 100 event loop passes per second
+    per_frame = int(rate * frame)
+    ticks = []
+    sent = 0
+    try:
+        started = time.perf_counter()
+        while time.perf_counter() - started < seconds:
+            frame_start = time.perf_counter()
+            for _ in range(per_frame):
+                logger.info("Pressed: L + T + F1 (%d)", sent)
+                sent += 1
+            tick_start = time.perf_counter()
+            widget.run_pending()
+            ticks.append(time.perf_counter() - tick_start)
+            remaining = frame - (time.perf_counter() - frame_start)
+            if remaining > 0:
+                time.sleep(remaining)
+        elapsed = time.perf_counter() - started
+    finally:
+        logger.removeHandler(handler)
+
+    return {
+        'target_rate': rate,
+        'achieved_rate': sent / elapsed,
+        'dropped': widget_dropped(widget),
+        'backlog': len(handler.msg_queue),
+        'pump_tick_ms': summarize(ticks),
+    }
+
+
+def bench_log_buffer(lines=1000000):
+    """Fill a million-line ring buffer, then search and filter across it"""
+    buffer = LogRingBuffer(capacity=lines)
+    started = time.perf_counter()
+    for i in range(lines):
+        buffer.append(f"2026-01-01 12:00:00 - Pressed: L + T + F1 ({i})",
+                      logging.ERROR if i % 10000 == 0 else logging.INFO)
+    filled = time.perf_counter()
+    buffer.search("(1)", len(buffer) - 1, backward=True)
+    searched = time.perf_counter()
+    errors = buffer.filter_seqs(logging.ERROR)
+    filtered = time.perf_counter()
+    return {
+        'lines': len(buffer),
+        'append_us_per_line': (filled - started) / lines * 1e6,
+        'full_search_ms': (searched - filled) * 1000,
+        'level_filter_ms': (filtered - searched) * 1000,
+        'error_lines': len(errors),
+        'arena_bytes': len(buffer._arena),
+    }
+
+
+def run():
+    """Run all TextHandler benchmarks"""
+    return {
+        'burst': bench_burst(),
+        'sustained_10k_per_second': bench_sustained(),
+        'log_buffer': bench_log_buffer(),
+    }
@@ -0,0 +1,56 @@
+"""Shared helpers for the Extended AFK benchmark suite"""
+import os
+import sys
+import time
+
+# Make the application packages importable (same layout as src/main.py)
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from core.input_backend import RecordingBackend
+
+
+def summarize(samples, scale=1000.0):
+    """
+    Summarize timing samples.
+
+    Args:
+        samples: Durations in seconds
+        scale: Multiplier applied to every statistic (1000 reports milliseconds)
+
+    Returns:
+        dict: count, mean, p50, p90, p99, min and max of the samples
+    """
+    if not samples:
+        return {'count': 0}
+
+    ordered = sorted(samples)
+    count = len(ordered)
+
+    def percentile(p):
+        return ordered[min(count - 1, int(round(p / 100.0 * (count - 1))))] * scale
+
+    return {
+        'count': count,
+        'mean': sum(ordered) / count * scale,
+        'p50': percentile(50),
+        'p90': percentile(90),
+        'p99': percentile(99),
+        'min': ordered[0] * scale,
+        'max': ordered[-1] * scale,
+    }
+
+
+class SlowBackend(RecordingBackend):
+    """Recording backend that takes a fixed time per batch, like a real injector"""
+
+    def __init__(self, delay, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+
+    def send(self, events):
+        end = time.perf_counter() + self.delay
+        while time.perf_counter() < end:
+            pass
+        super().send(events)
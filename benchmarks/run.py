@@ -0,0 +1,62 @@
+"""
+Benchmark Runner
+
+Runs the headless Extended AFK benchmarks and writes the results as JSON.
+Usage: python benchmarks/run.py [--output FILE] [--only NAME ...]
+Example: python benchmarks/run.py --output bench_output.txt
+"""
+
+import argparse
+import importlib
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import common  # noqa: F401  (adds src/ to the import path)
+
+BENCHMARKS = [
+    "key_presser",
+    "macro",
+    "text_handler",
+    "logging",
+    "startup",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Extended AFK benchmarks")
+    parser.add_argument("--output", help="write JSON results to this file (default: stdout)")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="run only these benchmarks")
+    args = parser.parse_args()
+
+    version_file = Path(__file__).parent.parent / "VERSION.TXT"
+    results = {
+        "version": version_file.read_text().strip() if version_file.exists() else None,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "benchmarks": {},
+    }
+
+    for name in args.only or BENCHMARKS:
+        module = importlib.import_module(f"bench_{name}")
+        print(f"Running {name}...", file=sys.stderr)
+        started = time.perf_counter()
+        results["benchmarks"][name] = module.run()
+        print(f"  done in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
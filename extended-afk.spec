@@ -1,6 +1,12 @@
 # -*- mode: python ; coding: utf-8 -*-
 # PyInstaller spec file for Extended AFK
 
+import runpy
+
+# Pre-scale the footer images into assets/scaled (bundled with 'assets')
+# so the application never resamples them or imports PIL at startup
+runpy.run_path('scripts\\build_assets.py')['build']()
+
 a = Analysis(
     ['src\\main.py'],
     pathex=['src'],
@@ -13,9 +19,6 @@ a = Analysis(
     hiddenimports=[
         'keyboard',
         'ttkbootstrap',
-        'PIL',
-        'PIL.Image',
-        'PIL.ImageTk',
     ],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,48 @@
+"""
+Asset Build Script
+
+Pre-scales the footer images into assets/scaled so the application loads
+them straight into tk.PhotoImage without resampling (or importing PIL).
+Run before packaging; extended-afk.spec runs it automatically.
+Usage: python scripts/build_assets.py [--height N] [--output DIR]
+Example: python scripts/build_assets.py --height 40
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from utils.assets import ASSETS_DIR, SCALED_DIR, FOOTER_IMAGE_HEIGHT, build_scaled_images
+
+
+def build(height=FOOTER_IMAGE_HEIGHT, output_dir=None):
+    """Scale the footer images and return the written paths."""
+    return build_scaled_images(
+        height=height,
+        source_dir=str(project_root / ASSETS_DIR),
+        output_dir=output_dir or str(project_root / SCALED_DIR),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-scale image assets for packaging")
+    parser.add_argument("--height", type=int, default=FOOTER_IMAGE_HEIGHT, help="Target height in pixels")
+    parser.add_argument("--output", help="Output directory (default: assets/scaled)")
+    args = parser.parse_args()
+
+    try:
+        written = build(args.height, args.output)
+    except (OSError, RuntimeError) as e:
+        print(f"Failed to build assets: {e}", file=sys.stderr)
+        return 1
+
+    for path in written:
+        print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
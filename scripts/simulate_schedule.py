@@ -0,0 +1,63 @@
+"""
+Schedule Simulation Script
+
+Replays a key pressing profile against virtual time and exports the press timeline.
+Usage: python scripts/simulate_schedule.py [--settings FILE] [--days N] [--seed N] [--output FILE]
+Example: python scripts/simulate_schedule.py --days 30 --output timeline.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from core.simulation import simulate
+
+
+def load_profile(settings_path):
+    """Load keys and intervals from a settings.json file (or use the app defaults)."""
+    settings = {}
+    if settings_path:
+        with open(settings_path, "r") as f:
+            settings = json.load(f)
+
+    keys_config = settings.get("keys_config")
+    if not keys_config:
+        press_twice = settings.get("press_twice", True)
+        keys_config = [{"key": k, "press_twice": press_twice} for k in settings.get("keys", ["l", "t", "f1"])]
+
+    return (
+        keys_config,
+        settings.get("min_interval_minutes", 10),
+        settings.get("max_interval_minutes", 14),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate an Extended AFK schedule in virtual time")
+    parser.add_argument("--settings", help="settings.json to read keys and intervals from")
+    parser.add_argument("--days", type=float, default=30, help="simulated session length in days (default: 30)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for intervals (default: 0)")
+    parser.add_argument("--output", help="write the compact event list as JSON to this file")
+    args = parser.parse_args()
+
+    keys_config, min_interval, max_interval = load_profile(args.settings)
+
+    started = time.perf_counter()
+    result = simulate(keys_config, min_interval, max_interval, days=args.days, seed=args.seed)
+    elapsed = time.perf_counter() - started
+
+    presses = result.presses()
+    print(f"Simulated {args.days:g} day(s): {len(presses)} key presses in {elapsed * 1000:.1f} ms")
+
+    if args.output:
+        result.export(args.output)
+        print(f"Timeline written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Clock abstraction so schedules can run against real or virtual time"""
+import time
+
+
+class SystemClock:
+    """Clock backed by the real monotonic and wall clocks"""
+
+    def monotonic(self):
+        """
+        Get the monotonic time used for scheduling deadlines.
+
+        Returns:
+            float: Seconds from time.monotonic()
+        """
+        return time.monotonic()
+
+    def time(self):
+        """
+        Get the wall-clock time.
+
+        Returns:
+            float: Seconds since the epoch
+        """
+        return time.time()
+
+
+class VirtualClock:
+    """Manually advanced clock for simulating long sessions instantly"""
+
+    def __init__(self, start=0.0, wall_start=None):
+        """
+        Initialize the virtual clock.
+
+        Args:
+            start: Initial monotonic value (in seconds)
+            wall_start: Wall-clock time matching start (defaults to now)
+        """
+        self._now = float(start)
+        self._start = float(start)
+        self._wall_start = time.time() if wall_start is None else float(wall_start)
+
+    def monotonic(self):
+        """
+        Get the current virtual monotonic time.
+
+        Returns:
+            float: Virtual seconds
+        """
+        return self._now
+
+    def time(self):
+        """
+        Get the virtual wall-clock time.
+
+        Returns:
+            float: Seconds since the epoch, advanced with the virtual clock
+        """
+        return self._wall_start + (self._now - self._start)
+
+    def advance_to(self, when):
+        """
+        Move the clock forward to an absolute monotonic value.
+
+        Args:
+            when: Target time (ignored if it lies in the past)
+        """
+        if when > self._now:
+            self._now = float(when)
+
+    def advance(self, seconds):
+        """
+        Move the clock forward by a number of seconds.
+
+        Args:
+            seconds: Seconds to advance
+        """
+        self.advance_to(self._now + seconds)
+
+
+# Shared clock for everything running in real time
+SYSTEM_CLOCK = SystemClock()
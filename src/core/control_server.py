@@ -0,0 +1,494 @@
+"""Local JSON-lines control API for a running key pressing session"""
+import asyncio
+import hmac
+import ipaddress
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+import logging
+
+from core.metrics import REGISTRY
+from utils.paths import get_app_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+DEFAULT_ADDRESS = f'127.0.0.1:{DEFAULT_PORT}'
+
+# Longest request line accepted (in bytes)
+MAX_LINE_BYTES = 64 * 1024
+
+# Pending connections queued by the OS (room for hundreds of pollers
+# connecting at once)
+BACKLOG = 1024
+
+# Seconds the server thread may take to bind or to shut down
+STARTUP_TIMEOUT = 5.0
+
+COMMANDS = ('status', 'metrics', 'start', 'stop', 'update')
+
+# Shared secret every request must carry, readable only by the user
+TOKEN_FILENAME = 'control.token'
+
+
+def get_token_path():
+    """
+    Get the default control token location.
+
+    Returns:
+        str: Path of control.token in the application directory
+    """
+    return os.path.join(get_app_dir(), TOKEN_FILENAME)
+
+
+def load_token(path=None, create=False):
+    """
+    Read the control token, creating it (with 0600 permissions) if asked.
+
+    Args:
+        path: Token file path (defaults to control.token in the application directory)
+        create: Whether to generate the token if the file does not exist
+
+    Returns:
+        str: Token
+
+    Raises:
+        OSError: If the token file cannot be read (or created)
+    """
+    path = path or get_token_path()
+    if create:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass
+        else:
+            with os.fdopen(fd, 'w') as f:
+                f.write(secrets.token_hex(32))
+    with open(path, 'r') as f:
+        token = f.read().strip()
+    if not token:
+        raise OSError(f"Control token file is empty: {path}")
+    return token
+
+
+class _ProtocolError(Exception):
+    """A request that is not part of the control protocol (closes the connection)"""
+
+
+def parse_address(address):
+    """
+    Parse a control server address.
+
+    Accepts "host:port" (IPv6 hosts in brackets) for TCP on a loopback
+    interface, or "unix:PATH" for a Unix domain socket.
+
+    Args:
+        address: Address string
+
+    Returns:
+        tuple: ('unix', path) or ('tcp', (host, port))
+
+    Raises:
+        ValueError: If the address is malformed or not a loopback address
+    """
+    if address.startswith('unix:'):
+        path = address[len('unix:'):]
+        if not path:
+            raise ValueError("Unix socket address needs a path")
+        return 'unix', path
+
+    host, separator, port = address.rpartition(':')
+    if not separator or not port.isdigit():
+        raise ValueError(f"Invalid control address '{address}' (expected host:port or unix:PATH)")
+    host = host.strip('[]') or '127.0.0.1'
+    if host != 'localhost':
+        try:
+            loopback = ipaddress.ip_address(host).is_loopback
+        except ValueError:
+            loopback = False
+        if not loopback:
+            raise ValueError(f"Control server must listen on a loopback address, not '{host}'")
+    return 'tcp', (host, int(port))
+
+
+def presser_status(presser, keys_config=None, min_interval_minutes=None, max_interval_minutes=None,
+                   macro=None):
+    """
+    Describe a key presser's state for the status command.
+
+    Args:
+        presser: KeyPresser, or None if no session exists yet
+        keys_config: Configuration reported when there is no presser
+        min_interval_minutes: Minimum interval reported when there is no presser
+        max_interval_minutes: Maximum interval reported when there is no presser
+        macro: Macro reported when there is no presser
+
+    Returns:
+        dict: running, keys_config, macro, intervals, the next deadline and the
+            session's deadline error (see KeyPresser.deadline_error)
+    """
+    status = {
+        'running': False,
+        'keys_config': keys_config or [],
+        'macro': macro or None,
+        'min_interval_minutes': min_interval_minutes,
+        'max_interval_minutes': max_interval_minutes,
+        'next_deadline_in': None,
+        'next_deadline': None,
+        'deadline_error': None,
+    }
+    if presser is None:
+        return status
+
+    status.update(
+        running=presser.is_running(),
+        keys_config=presser.keys_config,
+        macro=presser.macro,
+        min_interval_minutes=presser.min_interval / 60,
+        max_interval_minutes=presser.max_interval / 60,
+        deadline_error=presser.deadline_error(),
+    )
+    deadline = presser.scheduler.next_deadline(presser)
+    if deadline is not None:
+        remaining = max(0.0, deadline - presser.clock.monotonic())
+        status['next_deadline_in'] = remaining
+        status['next_deadline'] = time.time() + remaining
+    return status
+
+
+class PresserController:
+    """Control commands applied directly to a KeyPresser (safe from any thread)"""
+
+    def __init__(self, presser):
+        """
+        Initialize the controller.
+
+        Args:
+            presser: KeyPresser to control
+        """
+        self.presser = presser
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the session if it is not running"""
+        with self._lock:
+            if not self.presser.is_running():
+                self.presser.start()
+
+    def stop(self):
+        """Stop the session if it is running"""
+        with self._lock:
+            if self.presser.is_running():
+                self.presser.stop()
+
+    def update(self, keys_config, min_interval_minutes, max_interval_minutes, macro=None):
+        """Apply new keys, intervals and macro (see KeyPresser.update_config)"""
+        self.presser.update_config(keys_config, min_interval_minutes, max_interval_minutes, macro=macro)
+
+    def status(self):
+        """Get the session state (see presser_status)"""
+        return presser_status(self.presser)
+
+
+class ControlServer:
+    """
+    JSON-lines control server on its own asyncio event loop thread.
+
+    Each request is one JSON object per line, {"command": ..., "id": ...}
+    plus command parameters; each reply is one line,
+    {"id": ..., "ok": true, "result": ...} or {"id": ..., "ok": false,
+    "error": ...}. Clients may keep the connection open and poll.
+
+    Every request must carry the shared token from control.token. A line
+    that is not a JSON object, or has a wrong token, gets one error reply
+    and the connection is closed: a web page can make a browser send an
+    HTTP request to a loopback port, and its body must never be read as
+    a command.
+
+    The controller provides start(), stop(), update(keys_config,
+    min_interval_minutes, max_interval_minutes, macro) and status(). status and
+    metrics are answered on the event loop; start, stop and update run on
+    the loop's default executor so a stop waiting for an in-flight press
+    never stalls other clients.
+    """
+
+    def __init__(self, controller, address=DEFAULT_ADDRESS, metrics=REGISTRY, token=None):
+        """
+        Initialize the server (call start() to begin listening).
+
+        Args:
+            controller: Object implementing the control commands
+            address: Listening address (see parse_address)
+            metrics: MetricsRegistry reported by the metrics command
+            token: Shared token required in requests (defaults to the
+                token file, created on first use)
+
+        Raises:
+            ValueError: If the address is invalid
+            OSError: If the token file cannot be read or created
+        """
+        self.controller = controller
+        self.address = address
+        self.metrics = metrics
+        self._token = token or load_token(create=True)
+        self._family, self._target = parse_address(address)
+        self.bound_address = None
+
+        self._thread = None
+        self._loop = None
+        self._stopping = None
+        # Connection handler task -> its stream writer
+        self._clients = {}
+        self._ready = threading.Event()
+        self._error = None
+
+    def start(self):
+        """
+        Bind the address and start serving on a background thread.
+
+        Returns:
+            ControlServer: self
+
+        Raises:
+            OSError: If the address cannot be bound
+        """
+        self._thread = threading.Thread(target=self._run, name="extended-afk-control", daemon=True)
+        self._thread.start()
+        self._ready.wait(STARTUP_TIMEOUT)
+        if self._error is not None:
+            raise self._error
+        logger.info("Control server listening on %s", self.bound_address)
+        return self
+
+    def stop(self):
+        """Close all connections and stop the event loop thread"""
+        if self._loop is None or self._thread is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        except RuntimeError:
+            # The loop has already finished
+            pass
+        self._thread.join(STARTUP_TIMEOUT)
+        self._thread = None
+        logger.info("Control server stopped")
+
+    def _run(self):
+        try:
+            asyncio.run(self._serve())
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+
+        if self._family == 'unix':
+            if os.path.exists(self._target):
+                # Only replace a socket that nobody answers on
+                _remove_stale_socket(self._target)
+            server = await asyncio.start_unix_server(
+                self._handle_client, path=self._target, limit=MAX_LINE_BYTES, backlog=BACKLOG)
+            os.chmod(self._target, 0o600)
+            self.bound_address = f'unix:{self._target}'
+        else:
+            host, port = self._target
+            server = await asyncio.start_server(
+                self._handle_client, host, port, limit=MAX_LINE_BYTES, backlog=BACKLOG)
+            bound = server.sockets[0].getsockname()
+            self.bound_address = f'[{bound[0]}]:{bound[1]}' if ':' in bound[0] else f'{bound[0]}:{bound[1]}'
+        self._ready.set()
+
+        try:
+            await self._stopping.wait()
+        finally:
+            server.close()
+            # Closing a connection ends its handler's readline()
+            for writer in self._clients.values():
+                writer.close()
+            await asyncio.gather(*self._clients, return_exceptions=True)
+            await server.wait_closed()
+            if self._family == 'unix':
+                try:
+                    os.remove(self._target)
+                except OSError:
+                    pass
+
+    async def _handle_client(self, reader, writer):
+        self._clients[asyncio.current_task()] = writer
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Line longer than MAX_LINE_BYTES
+                    writer.write(_encode({'id': None, 'ok': False, 'error': "Request too long"}))
+                    break
+                if not line:
+                    break
+                reply, close = await self._dispatch(line)
+                writer.write(_encode(reply))
+                await writer.drain()
+                if close:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def _dispatch(self, line):
+        """
+        Answer one request line.
+
+        Returns:
+            tuple: (reply, close) where close is True if the line was not a
+                control request and the connection must be dropped
+        """
+        request_id = None
+        try:
+            request = self._parse_request(line)
+        except _ProtocolError as e:
+            logger.warning("Closing control connection: %s", e)
+            return {'id': None, 'ok': False, 'error': str(e)}, True
+
+        try:
+            request_id = request.get('id')
+            command = request.get('command')
+            if command not in COMMANDS:
+                raise ValueError(f"Unknown command '{command}' (expected one of: {', '.join(COMMANDS)})")
+
+            if command == 'status':
+                result = self.controller.status()
+            elif command == 'metrics':
+                result = self.metrics.snapshot()
+            else:
+                await self._loop.run_in_executor(None, self._run_command, command, request)
+                result = self.controller.status()
+        except Exception as e:
+            return {'id': request_id, 'ok': False, 'error': str(e)}, False
+        return {'id': request_id, 'ok': True, 'result': result}, False
+
+    def _parse_request(self, line):
+        """
+        Decode a request line and check its token.
+
+        Raises:
+            _ProtocolError: If the line is not a JSON object (e.g. an HTTP
+                request line or header) or the token is missing or wrong
+        """
+        try:
+            request = json.loads(line)
+        except ValueError:
+            raise _ProtocolError("Request is not JSON") from None
+        if not isinstance(request, dict):
+            raise _ProtocolError("Request must be a JSON object")
+        token = request.get('token')
+        if not isinstance(token, str) or not hmac.compare_digest(token, self._token):
+            raise _ProtocolError("Invalid or missing token")
+        return request
+
+    def _run_command(self, command, request):
+        if command == 'start':
+            self.controller.start()
+        elif command == 'stop':
+            self.controller.stop()
+        else:
+            # Parameters left out keep their current values
+            current = self.controller.status()
+            keys_config = request.get('keys_config')
+            if keys_config is None and 'keys' in request:
+                keys_config = [{'key': key, 'press_twice': False} for key in request['keys']]
+            self.controller.update(
+                keys_config if keys_config is not None else current['keys_config'],
+                request.get('min_interval_minutes', current['min_interval_minutes']),
+                request.get('max_interval_minutes', current['max_interval_minutes']),
+                macro=request.get('macro', current['macro'])
+            )
+
+
+class ControlClient:
+    """Blocking client for the control server (one connection, reused)"""
+
+    def __init__(self, address=DEFAULT_ADDRESS, timeout=5.0, token=None):
+        """
+        Connect to a control server.
+
+        Args:
+            address: Server address (see parse_address)
+            timeout: Socket timeout (in seconds)
+            token: Shared token (defaults to the token file written by the server)
+
+        Raises:
+            OSError: If the token cannot be read or the server cannot be reached
+        """
+        self._token = token or load_token()
+        family, target = parse_address(address)
+        if family == 'unix':
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            # Connect blocking: a timeout makes a Unix socket connect fail
+            # with EAGAIN instead of waiting while the backlog is full
+            self._socket.connect(target)
+            self._socket.settimeout(timeout)
+        else:
+            self._socket = socket.create_connection(target, timeout=timeout)
+        self._file = self._socket.makefile('rb')
+        self._next_id = 0
+
+    def close(self):
+        """Close the connection"""
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def request(self, command, **params):
+        """
+        Send a command and wait for its reply.
+
+        Args:
+            command: Command name from COMMANDS
+            **params: Command parameters (keys_config, keys, macro, min_interval_minutes,
+                max_interval_minutes)
+
+        Returns:
+            dict or list: The command result
+
+        Raises:
+            RuntimeError: If the server reports an error
+            ConnectionError: If the server closed the connection
+        """
+        self._next_id += 1
+        self._socket.sendall(_encode(dict(params, command=command, id=self._next_id, token=self._token)))
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Control server closed the connection")
+        reply = json.loads(line)
+        if not reply.get('ok'):
+            raise RuntimeError(reply.get('error', "Request failed"))
+        return reply['result']
+
+
+def _encode(message):
+    return json.dumps(message).encode('utf-8') + b'\n'
+
+
+def _remove_stale_socket(path):
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.remove(path)
+    else:
+        raise OSError(f"Another control server is listening on {path}")
+    finally:
+        probe.close()
@@ -0,0 +1,141 @@
+"""Headless key pressing session (no GUI toolkit imports)"""
+import signal
+import threading
+import logging
+
+from core.input_backend import get_backend
+from core.journal import SessionJournal
+from core.key_presser import KeyPresser
+from core.metrics import MetricsWriter
+from core.profiles import ProfileStore
+from core.scheduler import get_scheduler
+from core.settings import AppSettings
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the stop flag (keeps Ctrl+C responsive on Windows)
+WAIT_INTERVAL = 0.5
+
+
+def load_config(settings, profile_name=None):
+    """
+    Resolve the keys and intervals to run with.
+
+    Args:
+        settings: AppSettings holding the working configuration
+        profile_name: Optional profile to activate and use instead
+
+    Returns:
+        tuple: (keys_config, min_interval_minutes, max_interval_minutes, macro)
+
+    Raises:
+        KeyError: If the profile does not exist
+    """
+    if profile_name is None:
+        return (
+            settings.get_keys_config(),
+            settings.get('min_interval_minutes', 10),
+            settings.get('max_interval_minutes', 14),
+            settings.get('macro') or None
+        )
+
+    store = ProfileStore()
+    try:
+        profile = store.activate(profile_name)
+    finally:
+        store.close()
+    return (
+        profile.keys_config,
+        profile.min_interval_minutes,
+        profile.max_interval_minutes,
+        profile.macro or None
+    )
+
+
+def run(profile_name=None, backend_name=None, stop_event=None, control_address=None):
+    """
+    Press keys until SIGINT or SIGTERM is received.
+
+    With a control server the process keeps running while the session is
+    stopped, so it can be started again through the control API.
+
+    Args:
+        profile_name: Optional profile to run (defaults to the saved settings)
+        backend_name: Optional input backend (defaults to the input_backend setting)
+        stop_event: Optional threading.Event that ends the session when set
+        control_address: Optional control server address (defaults to the control_address setting)
+
+    Returns:
+        int: Process exit code
+    """
+    settings = AppSettings()
+    try:
+        keys_config, min_interval, max_interval, macro = load_config(settings, profile_name)
+    except KeyError:
+        logger.error("Unknown profile: %s", profile_name)
+        return 2
+
+    if not keys_config and not macro:
+        logger.error("No keys configured")
+        return 2
+
+    get_scheduler().timer.set_spin_budget(settings.get('timer_spin_ms') / 1000)
+
+    stop_event = stop_event or threading.Event()
+
+    def request_stop(signum, frame):
+        logger.info("Received signal %s, stopping", signum)
+        stop_event.set()
+
+    previous_handlers = {}
+    if threading.current_thread() is threading.main_thread():
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous_handlers[signum] = signal.signal(signum, request_stop)
+
+    metrics_writer = MetricsWriter().start()
+    journal = None
+    try:
+        journal = SessionJournal()
+    except Exception as e:
+        logger.error("Failed to open press journal: %s", e)
+
+    presser = None
+    control_server = None
+    control_address = control_address or settings.get('control_address')
+    try:
+        presser = KeyPresser(
+            keys_config=keys_config,
+            min_interval_minutes=min_interval,
+            max_interval_minutes=max_interval,
+            backend=get_backend(backend_name or settings.get('input_backend')),
+            journal=journal,
+            macro=macro
+        )
+        presser.start()
+
+        if control_address:
+            # Imported only when enabled (asyncio is a noticeable import)
+            from core.control_server import ControlServer, PresserController
+            control_server = ControlServer(PresserController(presser), control_address).start()
+
+        while not stop_event.wait(WAIT_INTERVAL):
+            if control_server is None and not presser.is_running():
+                logger.error("Key pressing ended unexpectedly")
+                return 1
+        return 0
+
+    except (ValueError, RuntimeError, OSError) as e:
+        logger.error("Failed to start key pressing: %s", e)
+        return 1
+
+    finally:
+        if control_server is not None:
+            control_server.stop()
+        if presser is not None and presser.is_running():
+            presser.stop()
+        if journal is not None:
+            journal.close()
+        metrics_writer.stop()
+        settings.flush()
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
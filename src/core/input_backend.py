@@ -0,0 +1,317 @@
+"""Pluggable input injection backends"""
+import os
+import struct
+import sys
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Default backend used when no setting is present
+DEFAULT_BACKEND = 'keyboard'
+
+
+class InputBackend:
+    """
+    Base class for input injection backends.
+
+    Backends resolve key names to backend-specific codes once, and inject
+    whole batches of key events per call so implementations that support it
+    can submit a chord or sequence with a single flush or write.
+    """
+
+    name = None
+
+    def resolve(self, key_name):
+        """
+        Resolve a key name to a backend key code.
+
+        Args:
+            key_name: Key name as stored in settings (e.g. 'f1', 'space', 'a')
+
+        Returns:
+            Opaque key code accepted by send()
+
+        Raises:
+            ValueError: If the key name is not known to the backend
+        """
+        raise NotImplementedError
+
+    def send(self, events):
+        """
+        Inject a batch of key events in order.
+
+        Args:
+            events: Sequence of (code, is_down) pairs
+        """
+        for code, is_down in events:
+            if is_down:
+                self._press(code)
+            else:
+                self._release(code)
+
+    def close(self):
+        """Release any OS resources held by the backend"""
+
+    def _press(self, code):
+        raise NotImplementedError
+
+    def _release(self, code):
+        raise NotImplementedError
+
+
+class KeyboardBackend(InputBackend):
+    """Backend using the `keyboard` library (Windows and Linux as root)"""
+
+    name = 'keyboard'
+
+    def __init__(self):
+        import keyboard
+        self._keyboard = keyboard
+
+    def resolve(self, key_name):
+        try:
+            steps = self._keyboard.parse_hotkey(key_name)
+        except Exception as e:
+            raise ValueError(f"Invalid key '{key_name}': {e}") from e
+        # A name like 'ctrl+a' (or 'a, b') parses to several keys; a key
+        # code presses exactly one, so reject it rather than pressing only
+        # the first part
+        if len(steps) != 1 or len(steps[0]) != 1:
+            raise ValueError(
+                f"Invalid key '{key_name}': key combinations are not single keys, "
+                f"press them with a macro instead (e.g. 'ctrl+a')")
+        # Of the scan codes a name maps to, use the one keyboard.press()
+        # itself sends: the first (the left key for 'shift', 'ctrl', 'alt')
+        return steps[0][0][0]
+
+    def _press(self, code):
+        self._keyboard.press(code)
+
+    def _release(self, code):
+        self._keyboard.release(code)
+
+
+class PynputBackend(InputBackend):
+    """Backend using the `pynput` keyboard controller"""
+
+    name = 'pynput'
+
+    def __init__(self):
+        from pynput import keyboard as pynput_keyboard
+        self._keys = pynput_keyboard
+        self._controller = pynput_keyboard.Controller()
+
+    def resolve(self, key_name):
+        special = getattr(self._keys.Key, key_name.lower(), None)
+        if special is not None:
+            return special
+        if len(key_name) == 1:
+            return self._keys.KeyCode.from_char(key_name)
+        raise ValueError(f"Invalid key '{key_name}': not a pynput key name")
+
+    def _press(self, code):
+        self._controller.press(code)
+
+    def _release(self, code):
+        self._controller.release(code)
+
+
+# Key names (as produced by the key selector) that differ from X keysym names
+_XKEYSYM_ALIASES = {
+    'esc': 'Escape',
+    'enter': 'Return',
+    'backspace': 'BackSpace',
+    'ctrl': 'Control_L',
+    'ctrl_l': 'Control_L',
+    'ctrl_r': 'Control_R',
+    'shift': 'Shift_L',
+    'shift_l': 'Shift_L',
+    'shift_r': 'Shift_R',
+    'alt': 'Alt_L',
+    'alt_l': 'Alt_L',
+    'alt_r': 'Alt_R',
+    'alt_gr': 'ISO_Level3_Shift',
+    'cmd': 'Super_L',
+    'cmd_l': 'Super_L',
+    'cmd_r': 'Super_R',
+    'caps_lock': 'Caps_Lock',
+    'page_up': 'Prior',
+    'page_down': 'Next',
+    'num_lock': 'Num_Lock',
+    'scroll_lock': 'Scroll_Lock',
+    'print_screen': 'Print',
+}
+
+
+class XTestBackend(InputBackend):
+    """Linux X11 backend using the XTest extension (python-xlib)"""
+
+    name = 'xtest'
+
+    def __init__(self):
+        from Xlib import X, XK, display
+        from Xlib.ext import xtest
+        self._X = X
+        self._XK = XK
+        self._xtest = xtest
+        self._display = display.Display()
+        if not self._display.has_extension('XTEST'):
+            raise RuntimeError("X server does not support the XTEST extension")
+
+    def resolve(self, key_name):
+        name = _XKEYSYM_ALIASES.get(key_name.lower(), key_name)
+        keysym = self._XK.string_to_keysym(name)
+        if not keysym and len(name) > 1:
+            keysym = self._XK.string_to_keysym(name.capitalize())
+        keycode = self._display.keysym_to_keycode(keysym) if keysym else 0
+        if not keycode:
+            raise ValueError(f"Invalid key '{key_name}': no X keycode")
+        return keycode
+
+    def send(self, events):
+        # Queue every event, then flush them to the server in one round-trip
+        for code, is_down in events:
+            event_type = self._X.KeyPress if is_down else self._X.KeyRelease
+            self._xtest.fake_input(self._display, event_type, code)
+        self._display.sync()
+
+    def close(self):
+        self._display.close()
+
+
+# Linux input_event layout: struct timeval, __u16 type, __u16 code, __s32 value
+_INPUT_EVENT = struct.Struct('llHHi')
+_EV_SYN = 0x00
+_EV_KEY = 0x01
+_SYN_REPORT = 0
+
+# Key names (as produced by the key selector) that differ from evdev KEY_* names
+_EVDEV_ALIASES = {
+    'esc': 'ESC',
+    'ctrl': 'LEFTCTRL',
+    'ctrl_l': 'LEFTCTRL',
+    'ctrl_r': 'RIGHTCTRL',
+    'shift': 'LEFTSHIFT',
+    'shift_l': 'LEFTSHIFT',
+    'shift_r': 'RIGHTSHIFT',
+    'alt': 'LEFTALT',
+    'alt_l': 'LEFTALT',
+    'alt_r': 'RIGHTALT',
+    'alt_gr': 'RIGHTALT',
+    'cmd': 'LEFTMETA',
+    'cmd_l': 'LEFTMETA',
+    'cmd_r': 'RIGHTMETA',
+    'caps_lock': 'CAPSLOCK',
+    'page_up': 'PAGEUP',
+    'page_down': 'PAGEDOWN',
+    'num_lock': 'NUMLOCK',
+    'scroll_lock': 'SCROLLLOCK',
+    'print_screen': 'SYSRQ',
+}
+
+
+class UinputBackend(InputBackend):
+    """Linux backend writing to a virtual uinput device (python-evdev)"""
+
+    name = 'uinput'
+
+    def __init__(self):
+        from evdev import UInput, ecodes
+        self._ecodes = ecodes
+        self._device = UInput(name='extended-afk')
+
+    def resolve(self, key_name):
+        name = _EVDEV_ALIASES.get(key_name.lower(), key_name.upper())
+        code = self._ecodes.ecodes.get('KEY_' + name)
+        if code is None:
+            raise ValueError(f"Invalid key '{key_name}': no evdev key code")
+        return code
+
+    def send(self, events):
+        # Pack the whole batch, with a sync report after each event, into one write
+        buffer = bytearray()
+        for code, is_down in events:
+            buffer += _INPUT_EVENT.pack(0, 0, _EV_KEY, code, 1 if is_down else 0)
+            buffer += _INPUT_EVENT.pack(0, 0, _EV_SYN, _SYN_REPORT, 0)
+        os.write(self._device.fd, buffer)
+
+    def close(self):
+        self._device.close()
+
+
+class RecordingBackend(InputBackend):
+    """In-memory backend that records events instead of injecting them"""
+
+    name = 'recording'
+
+    def __init__(self, valid_keys=None, clock=time.monotonic):
+        """
+        Initialize the recording backend.
+
+        Args:
+            valid_keys: Optional collection of accepted key names (all names
+                are accepted when None)
+            clock: Function returning the timestamp stored with each event
+        """
+        self.valid_keys = set(valid_keys) if valid_keys is not None else None
+        self.clock = clock
+        self.events = []
+        self.batch_count = 0
+        self._lock = threading.Lock()
+
+    def resolve(self, key_name):
+        if not key_name or (self.valid_keys is not None and key_name not in self.valid_keys):
+            raise ValueError(f"Invalid key '{key_name}'")
+        return key_name
+
+    def send(self, events):
+        timestamp = self.clock()
+        with self._lock:
+            self.batch_count += 1
+            self.events.extend((timestamp, code, is_down) for code, is_down in events)
+
+    def clear(self):
+        """Forget all recorded events"""
+        with self._lock:
+            self.events = []
+            self.batch_count = 0
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (KeyboardBackend, PynputBackend, XTestBackend, UinputBackend, RecordingBackend)
+}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_backend(name=DEFAULT_BACKEND):
+    """
+    Get the shared backend instance for a backend name.
+
+    Args:
+        name: One of the names in BACKENDS
+
+    Returns:
+        InputBackend: Backend instance (created on first use)
+
+    Raises:
+        ValueError: If the backend name is unknown
+        RuntimeError: If the backend cannot be initialized on this system
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown input backend '{name}' (choose from {', '.join(BACKENDS)})")
+
+    with _instances_lock:
+        backend = _instances.get(name)
+        if backend is None:
+            try:
+                backend = BACKENDS[name]()
+            except Exception as e:
+                raise RuntimeError(f"Input backend '{name}' is not available on {sys.platform}: {e}") from e
+            logger.info("Using input backend: %s", name)
+            _instances[name] = backend
+        return backend
@@ -0,0 +1,205 @@
+"""Process-wide keyboard hook shared by all consumers of key events"""
+import collections
+import threading
+import time
+import logging
+
+from utils.deferred_import import deferred
+
+# Imported on start (usually already warmed up in the background)
+pynput_keyboard = deferred('pynput.keyboard')
+
+logger = logging.getLogger(__name__)
+
+# Events kept per subscription before the oldest are dropped
+DEFAULT_QUEUE_SIZE = 256
+
+KeyEvent = collections.namedtuple('KeyEvent', ['kind', 'key', 'time'])
+KeyEvent.__doc__ = "A key event: kind is 'press' or 'release', key the key name, time from time.monotonic()"
+
+
+def key_name(key):
+    """
+    Convert a pynput key to the key name used in settings.
+
+    Args:
+        key: pynput Key or KeyCode
+
+    Returns:
+        str: Lower-case key name (e.g. 'a', 'f1', 'esc')
+    """
+    char = getattr(key, 'char', None)
+    if char:
+        # Regular character key
+        return char.lower()
+    name = getattr(key, 'name', None)
+    if name:
+        # Special key (f1, esc, ctrl, etc.)
+        return name.lower()
+    # Unknown key
+    return str(key).lower()
+
+
+class Subscription:
+    """
+    Stream of key events for one consumer.
+
+    The hook thread appends to a bounded deque and the consumer pops from
+    it; both are atomic, so neither side takes a lock. The optional notify
+    callback runs on the hook thread after each event and must be quick
+    (e.g. schedule a Tk callback with after()).
+    """
+
+    def __init__(self, service, maxlen=DEFAULT_QUEUE_SIZE, notify=None):
+        self._service = service
+        self.events = collections.deque(maxlen=maxlen)
+        self.notify = notify
+
+    def get(self):
+        """
+        Take the oldest pending event.
+
+        Returns:
+            KeyEvent or None: The event, or None if there is none
+        """
+        try:
+            return self.events.popleft()
+        except IndexError:
+            return None
+
+    def drain(self):
+        """
+        Take all pending events.
+
+        Returns:
+            list: KeyEvents, oldest first
+        """
+        events = []
+        while True:
+            try:
+                events.append(self.events.popleft())
+            except IndexError:
+                return events
+
+    def close(self):
+        """Stop receiving events"""
+        self._service.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class InputHookService:
+    """
+    One keyboard listener for the whole process.
+
+    The OS hook and its thread are created once by start() and shared by
+    every subscriber, so subscribing costs nothing and sees every event from
+    that moment on. Subscribers are kept in an immutable tuple that is
+    swapped on (un)subscribe, so the hook callback never takes a lock.
+    """
+
+    def __init__(self):
+        self._listener = None
+        self._subscribers = ()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        """Whether the keyboard listener is running"""
+        listener = self._listener
+        return listener is not None and listener.running
+
+    def start(self):
+        """
+        Start the keyboard listener if it is not running.
+
+        Raises:
+            RuntimeError: If pynput is not installed or the hook cannot be installed
+        """
+        with self._lock:
+            if self._listener is not None:
+                return
+            try:
+                listener = pynput_keyboard.Listener(on_press=self._on_press, on_release=self._on_release)
+                listener.start()
+            except ImportError as e:
+                raise RuntimeError("Key detection requires pynput (pip install pynput)") from e
+            except Exception as e:
+                raise RuntimeError(f"Failed to install the keyboard hook: {e}") from e
+            self._listener = listener
+        logger.debug("Keyboard hook started")
+
+    def stop(self):
+        """Stop the keyboard listener (subscriptions stay open but receive nothing)"""
+        with self._lock:
+            listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+            logger.debug("Keyboard hook stopped")
+
+    def subscribe(self, maxlen=DEFAULT_QUEUE_SIZE, notify=None):
+        """
+        Start receiving key events.
+
+        Args:
+            maxlen: Pending events kept before the oldest are dropped
+            notify: Optional callback run on the hook thread after each event
+
+        Returns:
+            Subscription: The new subscription
+        """
+        subscription = Subscription(self, maxlen, notify)
+        with self._lock:
+            self._subscribers = self._subscribers + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Stop delivering events to a subscription.
+
+        Args:
+            subscription: Subscription from subscribe()
+        """
+        with self._lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not subscription)
+
+    def _on_press(self, key):
+        self._publish('press', key)
+
+    def _on_release(self, key):
+        self._publish('release', key)
+
+    def _publish(self, kind, key):
+        subscribers = self._subscribers
+        if not subscribers:
+            return
+        event = KeyEvent(kind, key_name(key), time.monotonic())
+        for subscription in subscribers:
+            subscription.events.append(event)
+            if subscription.notify is not None:
+                try:
+                    subscription.notify()
+                except Exception as e:
+                    logger.debug("Key event notification failed: %s", e)
+
+
+_default_service = None
+_default_lock = threading.Lock()
+
+
+def get_input_hook():
+    """
+    Get the process-wide input hook service (created on first use, not started).
+
+    Returns:
+        InputHookService: The shared service
+    """
+    global _default_service
+    with _default_lock:
+        if _default_service is None:
+            _default_service = InputHookService()
+        return _default_service
@@ -0,0 +1,377 @@
+"""Append-only binary journal of key press events"""
+import bisect
+import mmap
+import os
+import struct
+import sys
+import threading
+import logging
+from collections import namedtuple
+
+from utils.paths import get_app_dir
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILENAME = 'journal.bin'
+
+# File header: magic, format version, record size, record count
+HEADER = struct.Struct('<8sHH4xQ8x')
+MAGIC = b'EAFKJRNL'
+VERSION = 1
+
+# One press: monotonic time, wall time, press duration, deadline slip,
+# key id, flags, result code (padded to 32 bytes)
+RECORD = struct.Struct('<ddffHBB4x')
+
+# NumPy dtype matching RECORD (for JournalReader.to_numpy)
+RECORD_DTYPE = [
+    ('monotonic', '<f8'),
+    ('wall_time', '<f8'),
+    ('duration', '<f4'),
+    ('slip', '<f4'),
+    ('key_id', '<u2'),
+    ('flags', 'u1'),
+    ('result', 'u1'),
+    ('pad', 'V4'),
+]
+
+# Flags
+FLAG_TOGGLE = 0x01
+
+# Result codes
+RESULT_OK = 0
+RESULT_FAILED = 1
+
+# Records added to the file each time it grows
+DEFAULT_CHUNK_RECORDS = 4096
+
+JournalRecord = namedtuple(
+    'JournalRecord', ['monotonic', 'wall_time', 'duration', 'slip', 'key_id', 'flags', 'result']
+)
+
+
+def get_journal_path():
+    """
+    Get the default journal location.
+
+    Returns:
+        str: Path of journal.bin in the application directory
+    """
+    return os.path.join(get_app_dir(), JOURNAL_FILENAME)
+
+
+def _keys_path(path):
+    """Path of the key name sidecar table of a journal"""
+    return path + '.keys'
+
+
+def _load_keys(path):
+    try:
+        with open(_keys_path(path), 'r', encoding='utf-8') as f:
+            return [line.rstrip('\n') for line in f]
+    except FileNotFoundError:
+        return []
+
+
+def _lock_file(f):
+    """
+    Take an exclusive lock on an open file without waiting.
+
+    On Windows the first byte is locked; memory-mapped access (how the
+    journal is written and read) is not affected by byte-range locks.
+
+    Raises:
+        OSError: If another process holds the lock
+    """
+    if sys.platform == 'win32':
+        import msvcrt
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def _unlock_file(f):
+    """Release a lock taken by _lock_file"""
+    if sys.platform == 'win32':
+        import msvcrt
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class SessionJournal:
+    """
+    Writer for the press journal.
+
+    Records have a fixed width and are written straight into a memory map
+    of the file, which is preallocated in chunks so most appends touch no
+    system call. The record count lives in the header and is updated after
+    each record, so readers never see a partial record. Key names are kept
+    in a sidecar table (one name per line, the line number being the id).
+    The file is locked while open, so only one process appends at a time.
+    """
+
+    def __init__(self, path=None, chunk_records=DEFAULT_CHUNK_RECORDS):
+        """
+        Open (or create) a journal for appending.
+
+        Args:
+            path: Journal file path (defaults to journal.bin in the application directory)
+            chunk_records: Number of records to preallocate each time the file grows
+
+        Raises:
+            ValueError: If the file exists but is not a compatible journal
+            RuntimeError: If another process has the journal open
+        """
+        self.path = path or get_journal_path()
+        self.chunk_size = chunk_records * RECORD.size
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Lock before reading or creating the header, so a second process
+        # never writes into the same records
+        self._file = os.fdopen(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644), 'r+b')
+        try:
+            _lock_file(self._file)
+        except OSError as e:
+            self._file.close()
+            raise RuntimeError(f"Press journal is in use by another process: {self.path}") from e
+
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0))
+            self._file.truncate(HEADER.size + self.chunk_size)
+            self._file.flush()
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+        magic, version, record_size, count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self._map.close()
+            self._file.close()
+            raise ValueError(f"Not a compatible press journal: {self.path}")
+        self._count = count
+
+        self._keys = _load_keys(self.path)
+        self._key_ids = {name: key_id for key_id, name in enumerate(self._keys)}
+
+    def __len__(self):
+        return self._count
+
+    def key_id(self, name):
+        """
+        Get the id of a key name, adding it to the key table if new.
+
+        Args:
+            name: Key name
+
+        Returns:
+            int: Key id
+        """
+        key_id = self._key_ids.get(name)
+        if key_id is None:
+            with self._lock:
+                # Another thread may have added the name since the lookup
+                key_id = self._key_ids.get(name)
+                if key_id is None:
+                    key_id = len(self._keys)
+                    with open(_keys_path(self.path), 'a', encoding='utf-8') as f:
+                        f.write(name + '\n')
+                    self._keys.append(name)
+                    self._key_ids[name] = key_id
+        return key_id
+
+    def append(self, monotonic, wall_time, key_id, flags=0, duration=0.0, slip=0.0, result=RESULT_OK):
+        """
+        Append one press record.
+
+        Args:
+            monotonic: Monotonic time of the press
+            wall_time: Wall-clock time of the press (seconds since the epoch)
+            key_id: Id from key_id()
+            flags: FLAG_* bits
+            duration: Time spent injecting the press (in seconds)
+            slip: Delay between the planned deadline and the press (in seconds)
+            result: RESULT_* code
+        """
+        with self._lock:
+            offset = HEADER.size + self._count * RECORD.size
+            if offset + RECORD.size > len(self._map):
+                self._grow()
+            RECORD.pack_into(self._map, offset, monotonic, wall_time, duration, slip, key_id, flags, result)
+            self._count += 1
+            HEADER.pack_into(self._map, 0, MAGIC, VERSION, RECORD.size, self._count)
+
+    def _grow(self):
+        """Extend the file (and its memory map) by one chunk"""
+        size = len(self._map) + self.chunk_size
+        self._map.close()
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def flush(self):
+        """Write modified pages back to disk"""
+        with self._lock:
+            self._map.flush()
+
+    def close(self):
+        """Flush and close the journal"""
+        with self._lock:
+            if self._map.closed:
+                return
+            self._map.flush()
+            self._map.close()
+            _unlock_file(self._file)
+            self._file.close()
+
+
+class JournalReader:
+    """
+    Read-only, zero-copy view of a press journal.
+
+    The file is memory-mapped and records are decoded only when accessed.
+    records is a memoryview over the raw records; iterate with iter_records()
+    or map the whole journal to a NumPy structured array with to_numpy().
+    """
+
+    def __init__(self, path=None):
+        """
+        Open a journal for reading.
+
+        Args:
+            path: Journal file path (defaults to journal.bin in the application directory)
+
+        Raises:
+            ValueError: If the file is not a compatible journal
+        """
+        self.path = path or get_journal_path()
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, record_size, count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self._map.close()
+            raise ValueError(f"Not a compatible press journal: {self.path}")
+        self._count = count
+        self.records = memoryview(self._map)[HEADER.size:HEADER.size + count * RECORD.size]
+        self.keys = _load_keys(self.path)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("journal record index out of range")
+        return JournalRecord._make(RECORD.unpack_from(self.records, index * RECORD.size))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def key_name(self, key_id):
+        """
+        Get the key name of a key id.
+
+        Args:
+            key_id: Key id of a record
+
+        Returns:
+            str: Key name (or '#<id>' if unknown)
+        """
+        if 0 <= key_id < len(self.keys):
+            return self.keys[key_id]
+        return f"#{key_id}"
+
+    def iter_records(self, start=0, stop=None):
+        """
+        Iterate over decoded records.
+
+        Args:
+            start: First record index
+            stop: Record index to stop before (None for the end)
+
+        Yields:
+            JournalRecord: Decoded records
+        """
+        stop = self._count if stop is None else min(stop, self._count)
+        view = self.records[start * RECORD.size:stop * RECORD.size]
+        for values in RECORD.iter_unpack(view):
+            yield JournalRecord._make(values)
+
+    def find_time(self, wall_time):
+        """
+        Find the first record at or after a wall-clock time (binary search).
+
+        Records are in press order, and the search assumes their wall times
+        rise with it. That holds unless the system clock was set back (an
+        NTP correction or a manual change; DST does not move epoch time),
+        in which case records around the step may be missed or included
+        out of range. Monotonic times cannot be used instead: they restart
+        on every boot, so they are not ordered across sessions either.
+
+        Args:
+            wall_time: Seconds since the epoch
+
+        Returns:
+            int: Record index (len(self) if every record is older)
+        """
+        return bisect.bisect_left(_WallTimes(self), wall_time)
+
+    def between(self, start_time, end_time):
+        """
+        Iterate over the records within a wall-clock time range (see
+        find_time for what happens if the clock was set back).
+
+        Args:
+            start_time: Range start (seconds since the epoch, inclusive)
+            end_time: Range end (seconds since the epoch, exclusive)
+
+        Yields:
+            JournalRecord: Decoded records
+        """
+        return self.iter_records(self.find_time(start_time), self.find_time(end_time))
+
+    def to_numpy(self):
+        """
+        Map the records to a NumPy structured array without copying.
+
+        Returns:
+            numpy.ndarray: Array with RECORD_DTYPE fields
+
+        Raises:
+            RuntimeError: If NumPy is not installed
+        """
+        try:
+            import numpy
+        except ImportError as e:
+            raise RuntimeError("NumPy is required for JournalReader.to_numpy()") from e
+        return numpy.frombuffer(self.records, dtype=numpy.dtype(RECORD_DTYPE), count=self._count)
+
+    def close(self):
+        """Release the memory map (views from to_numpy() must be dropped first)"""
+        self.records.release()
+        self._map.close()
+
+
+class _WallTimes:
+    """Sequence of record wall times for bisect"""
+
+    # Byte offset of wall_time within a record
+    OFFSET = struct.calcsize('<d')
+    FIELD = struct.Struct('<d')
+
+    def __init__(self, reader):
+        self.records = reader.records
+        self.count = len(reader)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        return self.FIELD.unpack_from(self.records, index * RECORD.size + self.OFFSET)[0]
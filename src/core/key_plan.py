@@ -0,0 +1,182 @@
+"""Precompiled key press plans"""
+from array import array
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Delay between the two presses of a toggle key, and between keys (in seconds)
+PRESS_GAP = 0.5
+
+
+class KeyAction:
+    """A single configured key with its backend key code resolved up front"""
+
+    __slots__ = ('key', 'label', 'code', 'toggle')
+
+    def __init__(self, key, label, code, toggle):
+        """
+        Initialize the action.
+
+        Args:
+            key: Key name as configured (e.g. 'f1')
+            label: Display label used in status messages (e.g. 'F1')
+            code: Key code resolved by the input backend
+            toggle: Whether the key is pressed twice (toggle behavior)
+        """
+        object.__setattr__(self, 'key', key)
+        object.__setattr__(self, 'label', label)
+        object.__setattr__(self, 'code', code)
+        object.__setattr__(self, 'toggle', toggle)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("KeyAction is immutable")
+
+    def __repr__(self):
+        return f"KeyAction({self.key!r}, code={self.code!r}, toggle={self.toggle})"
+
+
+class KeyPlan:
+    """
+    Immutable, replay-only program for one press cycle.
+
+    The program is a flat sequence of steps. Step i sends steps[i] (the
+    action indices involved and the batch of (code, is_down) events) in one
+    backend call; the next step follows gaps[i] seconds later, plus a random
+    share of jitters[i]. presses[i] counts the actions pressed down by step
+    i. Timing data lives in arrays so the interpreter in KeyPresser reads
+    plain floats.
+    """
+
+    __slots__ = ('actions', 'steps', 'gaps', 'jitters', 'presses', 'summary')
+
+    def __init__(self, actions, steps=None, gaps=None, jitters=None):
+        """
+        Initialize the plan.
+
+        Args:
+            actions: Sequence of KeyAction objects in first-press order
+            steps: Sequence of (indices, batch) steps (defaults to the toggle
+                timeline of the actions: each key tapped once or twice,
+                PRESS_GAP apart)
+            gaps: Seconds between each step and the next (one per step)
+            jitters: Random extra seconds (0 to jitter) added to each gap
+        """
+        actions = tuple(actions)
+        if steps is None:
+            steps, gaps = _build_timeline(actions)
+        steps = tuple(steps)
+        gaps = array('d', gaps)
+        jitters = array('d', jitters if jitters is not None else [0.0] * len(steps))
+        if not len(steps) == len(gaps) == len(jitters):
+            raise ValueError("A plan needs one gap and one jitter per step")
+
+        presses = array('H')
+        for indices, batch in steps:
+            down_codes = {code for code, is_down in batch if is_down}
+            presses.append(sum(1 for index in indices if actions[index].code in down_codes))
+
+        object.__setattr__(self, 'actions', actions)
+        object.__setattr__(self, 'steps', steps)
+        object.__setattr__(self, 'gaps', gaps)
+        object.__setattr__(self, 'jitters', jitters)
+        object.__setattr__(self, 'presses', presses)
+        object.__setattr__(self, 'summary', " + ".join(a.label for a in actions))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("KeyPlan is immutable")
+
+    def __len__(self):
+        return len(self.actions)
+
+    def duration(self):
+        """
+        Get the time from the first step of a cycle to its last.
+
+        Returns:
+            tuple: (shortest, longest) cycle duration in seconds (they differ
+                when waits have jitter)
+        """
+        shortest = sum(self.gaps[:-1])
+        return shortest, shortest + sum(self.jitters[:-1])
+
+
+def _build_timeline(actions):
+    """
+    Build the press timeline for a sequence of actions.
+
+    Args:
+        actions: Tuple of KeyAction objects
+
+    Returns:
+        tuple: (steps, gaps) - steps of (indices, batch) where indices are the
+            action indices involved and batch is the tuple of (code, is_down)
+            events sent to the backend, and the seconds from each step to the
+            next
+    """
+    offsets = []
+    steps = []
+    offset = 0.0
+    for index, action in enumerate(actions):
+        tap = ((index,), ((action.code, True), (action.code, False)))
+        offsets.append(offset)
+        steps.append(tap)
+        if action.toggle:
+            offset += PRESS_GAP  # Delay between presses
+            offsets.append(offset)
+            steps.append(tap)
+        offset += PRESS_GAP  # Delay between different keys
+    gaps = [following - current for current, following in zip(offsets, offsets[1:])]
+    if steps:
+        gaps.append(0.0)
+    return steps, gaps
+
+
+def check_keys_config(keys_config):
+    """
+    Check the structure of a keys configuration.
+
+    Args:
+        keys_config: Keys configuration to check
+
+    Raises:
+        ValueError: If it is not a list of dicts with a non-empty 'key' name
+            and an optional boolean 'press_twice'
+    """
+    if not isinstance(keys_config, list):
+        raise ValueError("keys_config must be a list")
+    for config in keys_config:
+        if not isinstance(config, dict) or not isinstance(config.get('key'), str) or not config['key']:
+            raise ValueError("Each keys_config entry must be an object with a 'key' name")
+        if not isinstance(config.get('press_twice', False), bool):
+            raise ValueError(f"press_twice for key '{config['key']}' must be a boolean")
+
+
+def compile_plan(keys_config, backend):
+    """
+    Compile a keys configuration into a KeyPlan.
+
+    Args:
+        keys_config: List of dicts with 'key' and 'press_twice' settings
+        backend: InputBackend used to resolve key names
+
+    Returns:
+        KeyPlan: Compiled plan
+
+    Raises:
+        ValueError: If the configuration is malformed or a key name is not
+            known to the backend
+    """
+    check_keys_config(keys_config)
+    actions = []
+    for config in keys_config:
+        key_name = config['key']
+        actions.append(KeyAction(
+            key=key_name,
+            label=key_name.upper(),
+            code=backend.resolve(key_name),
+            toggle=bool(config.get('press_twice', False))
+        ))
+
+    plan = KeyPlan(actions)
+    logger.debug("Compiled key plan: %s", plan.actions)
+    return plan
@@ -1,65 +1,245 @@
-"""Key pressing logic with threading support"""
-import keyboard
-import time
+"""Key pressing logic driven by the shared scheduler"""
 import random
 import threading
+import time
 import logging
 
+from core.metrics import REGISTRY
+from core.input_backend import get_backend
+from core.journal import FLAG_TOGGLE, RESULT_OK, RESULT_FAILED
+from core.key_plan import compile_plan
+from core.macro import compile_macro
+from core.precision_timer import DEADLINE_ERROR_BUCKETS
+from core.scheduler import get_scheduler
+
 logger = logging.getLogger(__name__)
 
+# Delay between starting a session and the first key press (in seconds)
+STARTUP_DELAY = 5
+
+# A deadline missed by more than this (in seconds), e.g. after the computer
+# slept, is not caught up: the next wait counts from the late wake-up instead
+MAX_CATCH_UP = 1.0
+
 
 class KeyPresser:
-    """Handles automatic key pressing in a background thread"""
+    """Handles automatic key pressing as a session on the shared scheduler"""
 
-    def __init__(self, keys_config, min_interval_minutes, max_interval_minutes, status_callback=None):
+    # Ask the scheduler for spin-precise wake-ups (see Scheduler)
+    precise = True
+
+    def __init__(self, keys_config, min_interval_minutes, max_interval_minutes, status_callback=None,
+                 scheduler=None, backend=None, rng=None, metrics=REGISTRY, journal=None, macro=None):
         """
         Initialize key presser.
 
         Args:
             keys_config: List of dicts with 'key' and 'press_twice' settings
-            min_interval_minutes: Minimum interval between presses (in minutes)
+            min_interval_minutes: Minimum interval between presses (in minutes, fractions
+                allowed down to a millisecond)
             max_interval_minutes: Maximum interval between presses (in minutes)
             status_callback: Optional callback function for status updates (receives message string)
+            scheduler: Optional Scheduler to run on (defaults to the shared scheduler)
+            backend: Optional InputBackend to inject keys with (defaults to the keyboard backend)
+            rng: Optional random.Random used to pick intervals (for reproducible schedules)
+            metrics: MetricsRegistry receiving press counters and timings
+            journal: Optional SessionJournal receiving a record for every key press
+            macro: Optional macro definition (see core.macro) pressed instead of keys_config
         """
         self.keys_config = keys_config
+        self.macro = macro or None
         self.min_interval = min_interval_minutes * 60  # Convert to seconds
         self.max_interval = max_interval_minutes * 60  # Convert to seconds
         self.status_callback = status_callback
+        self.scheduler = scheduler or get_scheduler()
+        self.backend = backend or get_backend()
+        self.clock = self.scheduler.clock
+        self.rng = rng or random.Random()
+        self.journal = journal
+
+        # Metrics updated on the hot path, only ever on the scheduler thread
+        # (lock-free); stops and status callbacks also happen on the threads
+        # calling start() and stop(), so those metrics are shared
+        self._presses = metrics.counter('presses', "Keys pressed successfully")
+        self._press_failures = metrics.counter('press_failures', "Key presses that raised an error")
+        self._stops = metrics.counter('stops', "Key pressing sessions stopped", shared=True)
+        self._press_duration = metrics.histogram(
+            'press_duration_seconds', "Time spent injecting one batch of key events")
+        self._deadline_slip = metrics.histogram(
+            'deadline_slip_seconds', "Delay between a planned press deadline and the actual wake-up",
+            buckets=DEADLINE_ERROR_BUCKETS)
+        self._callback_duration = metrics.histogram(
+            'status_callback_seconds', "Time spent in the status callback", shared=True)
 
-        # Threading control
-        self._thread = None
-        self._stop_event = threading.Event()
         self._running = False
+        self._deadline = None
+        self._slip = 0.0
+
+        # Deadline error of this session: wake-ups, total and worst (in seconds)
+        self._slip_count = 0
+        self._slip_total = 0.0
+        self._slip_max = 0.0
+
+        # Held while a step runs and while update_config() swaps the plan
+        self._lock = threading.Lock()
+
+        # Start and length of the current wait between cycles (in seconds)
+        self._interval_start = None
+        self._interval = None
+
+        # Compiled plan (built on start), journal key ids of its actions,
+        # a replacement waiting for the current cycle to end, and press
+        # cycle state
+        self._key_ids = []
+        self._plan = None
+        self._pending_plan = None
+        self._step_index = None
+        self._pressed = []
+        self._failed = []
+
+        # Key codes that may be down in the OS (sent down, or a failed batch
+        # that contained a down event, and not released since), in press order
+        self._held = {}
 
     def start(self):
-        """Start the key pressing thread"""
+        """
+        Start pressing keys on the scheduler.
+
+        Raises:
+            ValueError: If a configured key name is invalid
+        """
         if self._running:
             logger.warning("Key pressing already active")
             return
 
-        self._stop_event.clear()
+        self._plan, self._key_ids = self._compile(self.keys_config, self.macro)
+        self._pending_plan = None
+        self._interval_start = None
         self._running = True
-        self._thread = threading.Thread(target=self._run, daemon=True)
-        self._thread.start()
-        logger.info("Starting key presser...")
+        self._step_index = None
+        self._slip_count = 0
+        self._slip_total = 0.0
+        self._slip_max = 0.0
+        logger.info(
+            "Starting key presser (interval %g-%g minutes, cycle %.3f-%.3f seconds)...",
+            self.min_interval / 60, self.max_interval / 60, *self._plan.duration()
+        )
         self._send_status("Key pressing started")
+        self._send_status(f"Initializing... ({STARTUP_DELAY} second countdown)")
+        self._deadline = self.clock.monotonic() + STARTUP_DELAY
+        self.scheduler.register(self, self._deadline)
 
     def stop(self):
-        """Stop the key pressing thread"""
+        """Stop pressing keys and leave the scheduler"""
         if not self._running:
             logger.warning("Key pressing not active")
             return
 
-        self._stop_event.set()
         self._running = False
 
-        # Wait for thread to finish (with timeout)
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=2.0)
-
+        # Drop the pending deadline (waits briefly if a press is in progress)
+        self.scheduler.unregister(self, timeout=2.0)
+        with self._lock:
+            # Stopped mid-cycle (e.g. inside a macro hold): let go of the keys
+            self._release_held()
+            self._step_index = None
+        self._deadline = None
+        self._stops.inc()
+
+        if self._slip_count:
+            logger.info(
+                "Deadline error over %d wake-ups: mean %.3f ms, max %.3f ms",
+                self._slip_count, self._slip_total / self._slip_count * 1000, self._slip_max * 1000
+            )
         logger.info("Key pressing stopped")
         self._send_status("Key pressing stopped")
 
+    def update_config(self, keys_config, min_interval_minutes, max_interval_minutes, macro=None):
+        """
+        Swap in new keys (or macro) and intervals without restarting the session.
+
+        The new keys are used from the next press cycle (a cycle in progress
+        finishes with the old ones, and any key it left down is released
+        before the new plan starts). If the session is waiting for its next
+        cycle and the chosen interval falls outside the new range, a new
+        interval is drawn from the new range, counted from the end of the
+        last cycle.
+
+        Args:
+            keys_config: List of dicts with 'key' and 'press_twice' settings
+            min_interval_minutes: Minimum interval between presses (in minutes)
+            max_interval_minutes: Maximum interval between presses (in minutes)
+            macro: Optional macro definition pressed instead of keys_config
+
+        Raises:
+            ValueError: If the keys, a key name or the macro is invalid, or the
+                intervals are not positive numbers forming a range
+        """
+        for value in (min_interval_minutes, max_interval_minutes):
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+                raise ValueError("Intervals must be positive numbers of minutes")
+        if min_interval_minutes > max_interval_minutes:
+            raise ValueError("min_interval cannot be greater than max_interval")
+
+        # Compile outside the lock so a running step is never held up
+        macro = macro or None
+        plan, key_ids = self._compile(keys_config, macro)
+
+        with self._lock:
+            self.keys_config = keys_config
+            self.macro = macro
+            self.min_interval = min_interval_minutes * 60
+            self.max_interval = max_interval_minutes * 60
+
+            if self._step_index is None:
+                self._plan, self._key_ids = plan, key_ids
+            else:
+                self._pending_plan = (plan, key_ids)
+
+            if not self._running:
+                return
+
+            logger.info(
+                "Key presser reconfigured (interval %g-%g minutes, cycle %.3f-%.3f seconds)",
+                min_interval_minutes, max_interval_minutes, *plan.duration()
+            )
+            waiting = self._step_index is None and self._interval_start is not None
+            if waiting and not self.min_interval <= self._interval <= self.max_interval:
+                self._deadline = self._start_interval(self._interval_start)
+                self.scheduler.register(self, self._deadline)
+
+    def _compile(self, keys_config, macro=None):
+        """
+        Compile a key plan (from the macro if there is one) and look up the
+        journal ids of its keys.
+
+        Returns:
+            tuple: (KeyPlan, list of journal key ids)
+        """
+        if macro:
+            plan = compile_macro(macro, self.backend)
+        else:
+            plan = compile_plan(keys_config, self.backend)
+        key_ids = []
+        if self.journal is not None:
+            key_ids = [self.journal.key_id(action.key) for action in plan.actions]
+        return plan, key_ids
+
+    def deadline_error(self):
+        """
+        Get how late this session woke up for its deadlines.
+
+        Returns:
+            dict: count, mean, max and last deadline error (in seconds) since start
+        """
+        count = self._slip_count
+        return {
+            'count': count,
+            'mean': self._slip_total / count if count else 0.0,
+            'max': self._slip_max,
+            'last': self._slip,
+        }
+
     def is_running(self):
         """
         Check if key presser is currently running.
@@ -69,100 +249,268 @@ class KeyPresser:
         """
         return self._running
 
-    def _run(self):
-        """Main thread worker function"""
-        try:
-            # Initial delay
-            self._send_status("Initializing... (5 second countdown)")
+    def on_deadline(self, now):
+        """
+        Run the press program up to its next wait (called by the scheduler).
 
-            if self._wait_interruptible(5):
-                return
+        Each call sends the steps due now, each as one backend batch, and
+        returns the deadline of the following step, so waits between presses
+        never hold the scheduler thread. After the last step the next cycle
+        is scheduled after a random interval.
+
+        Args:
+            now: Current monotonic time of the scheduler's clock
+
+        Returns:
+            float or None: Next deadline, or None to leave the schedule
+        """
+        with self._lock:
+            try:
+                if self._deadline is not None:
+                    self._slip = max(0.0, now - self._deadline)
+                    self._deadline_slip.observe(self._slip)
+                    self._slip_count += 1
+                    self._slip_total += self._slip
+                    if self._slip > self._slip_max:
+                        self._slip_max = self._slip
+
+                if self._step_index is None:
+                    if not self._begin_cycle():
+                        return self._schedule_next_cycle()
+
+                plan = self._plan
+                steps = plan.steps
+                last = len(steps) - 1
+                index = self._step_index
+                while True:
+                    indices, batch = steps[index]
+                    self._run_step(indices, batch, plan.presses[index])
+                    if index == last:
+                        break
+                    gap = plan.gaps[index]
+                    jitter = plan.jitters[index]
+                    index += 1
+                    if jitter:
+                        gap += self.rng.random() * jitter
+                    if gap > 0:
+                        self._step_index = index
+                        self._deadline = self._anchor() + gap
+                        return self._deadline
+
+                self._finish_cycle()
+                return self._schedule_next_cycle()
 
-            # First key press
-            self._press_keys()
+            except Exception as e:
+                logger.error("Error in key presser session: %s", e, exc_info=True)
+                self._send_status(f"Error: {str(e)[:50]}")
+                self._release_held()
+                self._running = False
+                self._step_index = None
+                self._deadline = None
+                return None
+
+    def _schedule_next_cycle(self):
+        """
+        Pick the random interval until the next press cycle.
 
-            # Main loop
-            while not self._stop_event.is_set():
-                # Calculate random interval
-                interval = random.randint(int(self.min_interval), int(self.max_interval))
-                minutes = interval // 60
-                seconds = interval % 60
+        Returns:
+            float or None: Next deadline, or None if the session was stopped
+        """
+        if not self._running:
+            self._deadline = None
+            return None
 
-                if seconds > 0:
-                    self._send_status(f"Next press in {minutes}m {seconds}s")
-                else:
-                    self._send_status(f"Next press in {minutes} minutes")
+        self._deadline = self._start_interval(self._anchor())
+        return self._deadline
 
-                # Wait for interval (or stop event)
-                if self._wait_interruptible(interval):
-                    break
+    def _anchor(self):
+        """
+        Get the time the next wait counts from.
 
-                # Press keys
-                self._press_keys()
+        Waits count from the deadline that was just served rather than from
+        the end of the work done for it, so the time spent pressing keys and
+        in status callbacks does not add up as drift.
 
-        except Exception as e:
-            logger.error(f"Error in key presser thread: {e}", exc_info=True)
-            self._send_status(f"Error: {str(e)[:50]}")
-        finally:
-            self._running = False
+        Returns:
+            float: Monotonic time to add the next wait to
+        """
+        now = self.clock.monotonic()
+        deadline = self._deadline
+        if deadline is None or now - deadline > MAX_CATCH_UP:
+            return now
+        return deadline
 
-    def _wait_interruptible(self, seconds):
+    def _start_interval(self, started):
         """
-        Wait for specified seconds, but can be interrupted by stop event.
+        Draw a random interval and announce the resulting next press.
 
         Args:
-            seconds: Number of seconds to wait
+            started: Monotonic time the interval counts from
 
         Returns:
-            bool: True if interrupted, False if wait completed normally
+            float: Deadline of the next press cycle
         """
-        return self._stop_event.wait(seconds)
+        # Calculate random interval (whole milliseconds)
+        interval = self.rng.randint(round(self.min_interval * 1000), round(self.max_interval * 1000)) / 1000
+        self._interval_start = started
+        self._interval = interval
+
+        remaining = started + interval - self.clock.monotonic()
+        if remaining < 1:
+            self._send_status(f"Next press in {max(0, int(round(remaining * 1000)))} ms")
+        else:
+            remaining = int(round(remaining))
+            minutes = remaining // 60
+            seconds = remaining % 60
+
+            if seconds > 0:
+                self._send_status(f"Next press in {minutes}m {seconds}s")
+            else:
+                self._send_status(f"Next press in {minutes} minutes")
 
-    def _press_keys(self):
-        """Press the configured keys"""
-        try:
-            if not self.keys_config:
-                logger.warning("No keys configured")
-                return
+        return started + interval
 
-            logger.debug(f"Pressing {len(self.keys_config)} key(s): {self.keys_config}")
+    def _begin_cycle(self):
+        """
+        Start a new press cycle.
 
-            pressed_keys = []
-            for i, config in enumerate(self.keys_config):
-                key_name = config['key']
-                press_twice = config.get('press_twice', False)
+        Returns:
+            bool: True if there are keys to press, False otherwise
+        """
+        if self._pending_plan is not None:
+            self._release_held()
+            self._plan, self._key_ids = self._pending_plan
+            self._pending_plan = None
+
+        count = len(self._plan)
+        if not count:
+            logger.warning("No keys configured")
+            return False
+
+        self._step_index = 0
+        self._pressed = [False] * count
+        self._failed = [False] * count
+        return True
+
+    def _run_step(self, indices, batch, presses):
+        """
+        Send the key events of one program step as a single backend batch.
 
-                try:
-                    logger.debug(f"Pressing key {i+1}/{len(self.keys_config)}: {key_name} (press_twice={press_twice})")
+        Args:
+            indices: Indices of the actions involved in the step
+            batch: Tuple of (code, is_down) events for the backend
+            presses: Number of actions the step presses down
+        """
+        if not batch:
+            return
+        failed = self._failed
+        held = self._held
+        if any(failed[index] for index in indices):
+            # Drop events of keys that already failed this cycle, except
+            # releases of keys that may still be down (a chord that failed
+            # partway may have sent some of its down events)
+            actions = self._plan.actions
+            skip = {actions[index].code for index in indices if failed[index]}
+            batch = [
+                event for event in batch
+                if event[0] not in skip or (not event[1] and event[0] in held)
+            ]
+            indices = [index for index in indices if not failed[index]]
+            if not batch:
+                return
+            down_codes = {code for code, is_down in batch if is_down}
+            presses = sum(1 for index in indices if actions[index].code in down_codes)
 
-                    # Press and release using keyboard library
-                    keyboard.press_and_release(key_name)
-                    pressed_keys.append(key_name.upper())
-                    logger.debug(f"Successfully pressed: {key_name}")
+        # Count every key in the batch as down until a release goes through
+        for code, is_down in batch:
+            if is_down:
+                held[code] = None
 
-                    if press_twice:
-                        time.sleep(0.5)  # Delay between presses
-                        logger.debug(f"Pressing second time: {key_name}")
-                        keyboard.press_and_release(key_name)
-                        logger.debug(f"Successfully pressed second time: {key_name}")
+        started = time.perf_counter()
+        try:
+            self.backend.send(batch)
+            for code, is_down in batch:
+                if is_down:
+                    held[code] = None
+                else:
+                    held.pop(code, None)
+            duration = time.perf_counter() - started
+            self._press_duration.observe(duration)
+            for index in indices:
+                self._pressed[index] = True
+            self._presses.inc(presses)
+            if self.journal is not None:
+                self._journal_step(indices, batch, duration, RESULT_OK)
+        except Exception as e:
+            if self.journal is not None:
+                self._journal_step(indices, batch, time.perf_counter() - started, RESULT_FAILED)
+            self._press_failures.inc(presses)
+            for index in indices:
+                failed[index] = True
+            keys = ", ".join(self._plan.actions[index].key for index in indices)
+            logger.error("Error pressing key '%s': %s", keys, e)
+            self._send_status(f"Error pressing {keys}: {str(e)[:30]}")
+
+    def _release_held(self):
+        """Send release events for every key that may still be down"""
+        if not self._held:
+            return
+        codes = list(self._held)
+        self._held = {}
+        try:
+            self.backend.send([(code, False) for code in reversed(codes)])
+            logger.info("Released %d held key(s)", len(codes))
+        except Exception as e:
+            logger.error("Failed to release held keys: %s", e)
 
-                    # Delay between different keys
-                    time.sleep(0.5)
+    def _journal_step(self, indices, batch, duration, result):
+        """
+        Record the key presses (down events) of a step in the journal.
 
+        Args:
+            indices: Indices of the actions involved in the step
+            batch: Events sent for the step
+            duration: Time spent sending the batch (in seconds)
+            result: RESULT_* code of the step
+        """
+        down_codes = {code for code, is_down in batch if is_down}
+        if not down_codes:
+            return
+        monotonic = self.clock.monotonic()
+        wall_time = self.clock.time()
+        actions = self._plan.actions
+        for index in indices:
+            action = actions[index]
+            if action.code in down_codes:
+                try:
+                    self.journal.append(
+                        monotonic, wall_time, self._key_ids[index],
+                        flags=FLAG_TOGGLE if action.toggle else 0,
+                        duration=duration, slip=self._slip, result=result
+                    )
                 except Exception as e:
-                    logger.error(f"Error pressing key '{key_name}': {e}")
-                    self._send_status(f"Error pressing {key_name}: {str(e)[:30]}")
-
-            if pressed_keys:
-                keys_str = " + ".join(pressed_keys)
-                logger.info(f"Pressed: {keys_str}")
-                self._send_status(f"Pressed: {keys_str}")
-            else:
-                logger.warning("No keys were successfully pressed")
-
-        except Exception as e:
-            logger.error(f"Error in _press_keys: {e}", exc_info=True)
-            self._send_status(f"Error pressing keys")
+                    logger.error("Failed to write press journal: %s", e)
+
+    def _finish_cycle(self):
+        """Report the keys pressed during the cycle that just completed"""
+        self._step_index = None
+        # Only left over when a release failed
+        self._release_held()
+
+        if all(self._pressed):
+            keys_str = self._plan.summary
+        else:
+            keys_str = " + ".join(
+                action.label
+                for action, pressed in zip(self._plan.actions, self._pressed)
+                if pressed
+            )
+
+        if keys_str:
+            logger.info("Pressed: %s", keys_str)
+            self._send_status(f"Pressed: {keys_str}")
+        else:
+            logger.warning("No keys were successfully pressed")
 
     def _send_status(self, message):
         """
@@ -172,7 +520,9 @@ class KeyPresser:
             message: Status message string
         """
         if self.status_callback:
+            started = time.perf_counter()
             try:
                 self.status_callback(message)
+                self._callback_duration.observe(time.perf_counter() - started)
             except Exception as e:
-                logger.error(f"Error in status callback: {e}")
+                logger.error("Error in status callback: %s", e)
@@ -0,0 +1,372 @@
+"""Streaming statistics over the live and rotated application logs"""
+import gzip
+import heapq
+import os
+import re
+from collections import Counter
+from datetime import datetime
+
+from utils.log_setup import LOG_FILENAME
+from utils.paths import get_log_dir
+
+# One record in the LOG_FORMAT of utils.log_setup
+# (milliseconds were added to the timestamps along with sub-second intervals)
+RECORD_PATTERN = re.compile(
+    r'^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)(?:\.(\d{3}))? - (\S+) - ([A-Z]+) - (.*)$'
+)
+# Intervals and cycle lengths as logged by KeyPresser (%g may use exponents;
+# older logs have no cycle length)
+_NUMBER = r'(\d+(?:\.\d*)?(?:e[-+]?\d+)?)'
+_CONFIG = rf'\(interval {_NUMBER}-{_NUMBER} minutes(?:, cycle {_NUMBER}-{_NUMBER} seconds)?\)'
+START_PATTERN = re.compile(rf'^Starting key presser(?: {_CONFIG})?')
+RECONFIGURED_PATTERN = re.compile(rf'^Key presser reconfigured {_CONFIG}')
+PRESSED_PREFIX = 'Pressed: '
+PRESS_ERROR_PATTERN = re.compile(r"^Error pressing key '(.*?)'")
+STOP_MESSAGES = ('Key pressing stopped', 'Extended AFK started')
+
+# Allowance when comparing intervals to the configured range (plus the
+# cycle length): a share of the shortest interval, for wake-up delays and
+# logging, kept between MIN_INTERVAL_TOLERANCE and INTERVAL_TOLERANCE seconds,
+# plus the timestamp resolution of the records
+INTERVAL_TOLERANCE_RATIO = 0.1
+MIN_INTERVAL_TOLERANCE = 0.05
+
+# Largest allowance (in seconds); also the whole allowance for logs that
+# do not record the cycle length, whose timestamps are in whole seconds
+INTERVAL_TOLERANCE = 10
+
+# Number of longest gaps listed in the report
+TOP_GAPS = 5
+
+
+def iter_log_files(log_dir=None, filename=LOG_FILENAME):
+    """
+    List the log files of a directory, oldest first.
+
+    Includes gzipped segments (extended-afk.log.N.gz), uncompressed segments
+    left by older versions (extended-afk.log.N) and the live log.
+
+    Args:
+        log_dir: Log directory (defaults to the application log directory)
+        filename: Live log file name
+
+    Returns:
+        list: File paths ordered from oldest to newest
+    """
+    log_dir = log_dir or get_log_dir()
+    segment_pattern = re.compile(re.escape(filename) + r'\.(\d+)(\.gz)?$')
+    segments = []
+    try:
+        names = os.listdir(log_dir)
+    except FileNotFoundError:
+        return []
+    for name in names:
+        match = segment_pattern.match(name)
+        if match:
+            segments.append((int(match.group(1)), os.path.join(log_dir, name)))
+
+    # Higher segment numbers are older
+    paths = [path for number, path in sorted(segments, reverse=True)]
+    live_log = os.path.join(log_dir, filename)
+    if os.path.exists(live_log):
+        paths.append(live_log)
+    return paths
+
+
+def iter_log_lines(paths):
+    """
+    Stream the lines of several log files in order.
+
+    Args:
+        paths: Plain or .gz log file paths
+
+    Yields:
+        str: Log lines without the trailing newline
+    """
+    for path in paths:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                yield line.rstrip('\n')
+
+
+class LogStats:
+    """
+    Accumulates press and error statistics from log lines in constant memory.
+
+    Sessions are delimited by the key presser's start and stop records;
+    intervals are measured between consecutive "Pressed:" records of the
+    same session and compared with the interval range logged at start.
+    """
+
+    def __init__(self):
+        self.records = 0
+        self.first_time = None
+        self.last_time = None
+        self.levels = Counter()
+        self.sessions = 0
+        self.presses_per_key = Counter()
+        self.press_cycles = 0
+        self.press_errors = 0
+        # Interval length (whole seconds) -> occurrences
+        self.intervals = Counter()
+        self.below_min = 0
+        self.within_range = 0
+        self.above_max = 0
+        self.configs = Counter()
+        self.gaps = []  # Min-heap of the longest (seconds, start_time) gaps
+        self.gap_count = 0
+
+        self._in_session = False
+        self._config = None
+        self._cycle = None  # (shortest, longest) cycle length in seconds, if logged
+        self._last_press = None
+
+    def feed(self, line):
+        """
+        Process one log line (lines that are not records are ignored).
+
+        Args:
+            line: Log line
+        """
+        match = RECORD_PATTERN.match(line)
+        if not match:
+            return
+        timestamp, millis, name, level, message = match.groups()
+        when = datetime.fromisoformat(timestamp).timestamp()
+        if millis is not None:
+            when += int(millis) / 1000
+
+        self.records += 1
+        self.levels[level] += 1
+        if self.first_time is None:
+            self.first_time = when
+        self.last_time = when
+
+        if message.startswith(PRESSED_PREFIX):
+            self._on_pressed(when, message[len(PRESSED_PREFIX):], 1.0 if millis is None else 0.001)
+        elif message.startswith('Starting key presser'):
+            start = START_PATTERN.match(message)
+            self.sessions += 1
+            self._in_session = True
+            self._last_press = None
+            self._config = None
+            self._cycle = None
+            if start.group(1) is not None:
+                self._set_config(start)
+        elif message.startswith('Key presser reconfigured'):
+            reconfigured = RECONFIGURED_PATTERN.match(message)
+            if reconfigured:
+                self._set_config(reconfigured)
+        elif message in STOP_MESSAGES:
+            self._in_session = False
+            self._last_press = None
+        elif level == 'ERROR':
+            error = PRESS_ERROR_PATTERN.match(message)
+            if error:
+                self.press_errors += len(error.group(1).split(', '))
+
+    def _set_config(self, match):
+        """Take the interval range (and cycle length, if logged) from a start or reconfigure record"""
+        self._config = (float(match.group(1)), float(match.group(2)))
+        self.configs[self._config] += 1
+        if match.group(3) is not None:
+            self._cycle = (float(match.group(3)), float(match.group(4)))
+        else:
+            self._cycle = None
+
+    def _on_pressed(self, when, keys, resolution):
+        self.press_cycles += 1
+        for key in keys.split(' + '):
+            self.presses_per_key[key] += 1
+
+        if self._in_session and self._last_press is not None:
+            interval = when - self._last_press
+            self.intervals[int(interval)] += 1
+            if self._config is not None:
+                low = self._config[0] * 60
+                high = self._config[1] * 60
+                if self._cycle is None:
+                    tolerance = INTERVAL_TOLERANCE
+                else:
+                    # "Pressed" is logged at the end of each cycle, so
+                    # consecutive records are an interval plus a cycle apart
+                    tolerance = min(INTERVAL_TOLERANCE,
+                                    max(MIN_INTERVAL_TOLERANCE, INTERVAL_TOLERANCE_RATIO * low)) + resolution
+                    low += self._cycle[0]
+                    high += self._cycle[1]
+                if interval < low - tolerance:
+                    self.below_min += 1
+                elif interval > high + tolerance:
+                    self.above_max += 1
+                    self._add_gap(interval - high, self._last_press)
+                else:
+                    self.within_range += 1
+        self._last_press = when
+
+    def _add_gap(self, seconds, start_time):
+        self.gap_count += 1
+        entry = (seconds, start_time)
+        if len(self.gaps) < TOP_GAPS:
+            heapq.heappush(self.gaps, entry)
+        elif entry > self.gaps[0]:
+            heapq.heapreplace(self.gaps, entry)
+
+    def interval_percentile(self, q):
+        """
+        Get a percentile of the measured intervals.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            int or None: Interval (in seconds), or None without intervals
+        """
+        total = sum(self.intervals.values())
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for seconds in sorted(self.intervals):
+            seen += self.intervals[seconds]
+            if seen >= rank:
+                return seconds
+        return max(self.intervals)
+
+    def to_dict(self):
+        """
+        Get the statistics as plain data.
+
+        Returns:
+            dict: JSON-serializable statistics
+        """
+        interval_count = sum(self.intervals.values())
+        presses = sum(self.presses_per_key.values())
+        attempts = presses + self.press_errors
+        return {
+            'records': self.records,
+            'first_record': _format_time(self.first_time),
+            'last_record': _format_time(self.last_time),
+            'levels': dict(self.levels),
+            'error_rate': self.levels['ERROR'] / self.records if self.records else 0.0,
+            'sessions': self.sessions,
+            'press_cycles': self.press_cycles,
+            'presses_per_key': dict(self.presses_per_key.most_common()),
+            'press_errors': self.press_errors,
+            'press_error_rate': self.press_errors / attempts if attempts else 0.0,
+            'configured_intervals_minutes': [
+                {'min': low, 'max': high, 'sessions': count}
+                for (low, high), count in self.configs.most_common()
+            ],
+            'intervals_seconds': {
+                'count': interval_count,
+                'min': min(self.intervals) if interval_count else None,
+                'p50': self.interval_percentile(0.5),
+                'p90': self.interval_percentile(0.9),
+                'p99': self.interval_percentile(0.99),
+                'max': max(self.intervals) if interval_count else None,
+                'mean': (sum(s * n for s, n in self.intervals.items()) / interval_count
+                         if interval_count else None),
+                'below_min': self.below_min,
+                'within_range': self.within_range,
+                'above_max': self.above_max,
+                'per_minute': {
+                    minute: count for minute, count in sorted(self._per_minute().items())
+                },
+            },
+            'gaps': {
+                'count': self.gap_count,
+                'longest': [
+                    {'start': _format_time(start), 'overrun_seconds': round(seconds)}
+                    for seconds, start in sorted(self.gaps, reverse=True)
+                ],
+            },
+        }
+
+    def _per_minute(self):
+        minutes = Counter()
+        for seconds, count in self.intervals.items():
+            minutes[seconds // 60] += count
+        return minutes
+
+    def format(self):
+        """
+        Render the statistics as a human-readable report.
+
+        Returns:
+            str: Report text
+        """
+        data = self.to_dict()
+        intervals = data['intervals_seconds']
+        lines = [
+            f"Records: {data['records']} ({data['first_record']} to {data['last_record']})",
+            f"Sessions: {data['sessions']}, press cycles: {data['press_cycles']}",
+            "",
+            "Presses per key:",
+        ]
+        for key, count in data['presses_per_key'].items():
+            lines.append(f"  {key:<12} {count}")
+
+        lines.append("")
+        lines.append("Configured intervals:")
+        for config in data['configured_intervals_minutes']:
+            lines.append(f"  {config['min']:g}-{config['max']:g} minutes ({config['sessions']} session(s))")
+
+        lines.append("")
+        if intervals['count']:
+            lines.append(
+                f"Measured intervals: {intervals['count']} "
+                f"(min {_format_seconds(intervals['min'])}, p50 {_format_seconds(intervals['p50'])}, "
+                f"p90 {_format_seconds(intervals['p90'])}, max {_format_seconds(intervals['max'])})"
+            )
+            lines.append(
+                f"  below min: {intervals['below_min']}, within range: {intervals['within_range']}, "
+                f"above max: {intervals['above_max']}"
+            )
+            peak = max(intervals['per_minute'].values())
+            for minute, count in intervals['per_minute'].items():
+                bar = '#' * max(1, round(count / peak * 40))
+                lines.append(f"  {minute:>4}m {count:>7} {bar}")
+        else:
+            lines.append("Measured intervals: none")
+
+        lines.append("")
+        lines.append(
+            f"Errors: {data['levels'].get('ERROR', 0)} of {data['records']} records "
+            f"({data['error_rate']:.2%}); press errors: {data['press_errors']} "
+            f"({data['press_error_rate']:.2%} of key presses)"
+        )
+        lines.append(f"Gaps (intervals past the configured max): {data['gaps']['count']}")
+        for gap in data['gaps']['longest']:
+            lines.append(f"  {gap['start']}  +{_format_seconds(gap['overrun_seconds'])}")
+        return "\n".join(lines)
+
+
+def analyze(log_dir=None):
+    """
+    Compute statistics over the live and rotated logs.
+
+    Args:
+        log_dir: Log directory (defaults to the application log directory)
+
+    Returns:
+        LogStats: Accumulated statistics
+    """
+    stats = LogStats()
+    for line in iter_log_lines(iter_log_files(log_dir)):
+        stats.feed(line)
+    return stats
+
+
+def _format_time(timestamp):
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _format_seconds(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes}m {seconds}s"
+    return f"{minutes}m {seconds}s"
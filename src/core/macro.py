@@ -0,0 +1,212 @@
+"""Macro definitions compiled into key press plans"""
+import re
+import logging
+
+from core.key_plan import KeyAction, KeyPlan
+
+logger = logging.getLogger(__name__)
+
+# Longest single wait or hold (in seconds)
+MAX_WAIT_SECONDS = 60.0
+
+# Most steps (backend calls) one macro may compile to
+MAX_STEPS = 1000
+
+DURATION_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)(?:-(\d+(?:\.\d+)?))?(ms|s)$')
+
+MACRO_HELP = (
+    "Statements are separated by ';' or new lines:\n"
+    "  KEY or tap KEY     press and release (chords: ctrl+shift+x)\n"
+    "  hold KEY 800ms     press, wait, release\n"
+    "  down KEY / up KEY  press or release only\n"
+    "  wait 500ms         pause (ranges like 200-400ms add jitter; units ms or s)\n"
+    "Text after '#' is a comment."
+)
+
+
+def parse_duration(text):
+    """
+    Parse a duration such as "800ms", "1.5s" or "200-400ms".
+
+    Args:
+        text: Duration text
+
+    Returns:
+        tuple: (minimum_seconds, jitter_seconds)
+
+    Raises:
+        ValueError: If the duration is malformed, reversed or too long
+    """
+    match = DURATION_PATTERN.match(text.strip().lower())
+    if not match:
+        raise ValueError(f"invalid duration '{text}' (expected e.g. 500ms, 1.5s or 200-400ms)")
+    scale = 0.001 if match.group(3) == 'ms' else 1.0
+    low = float(match.group(1)) * scale
+    high = float(match.group(2)) * scale if match.group(2) is not None else low
+    if high < low:
+        raise ValueError(f"invalid duration '{text}': range is reversed")
+    if high > MAX_WAIT_SECONDS:
+        raise ValueError(f"invalid duration '{text}': longer than {MAX_WAIT_SECONDS:g} seconds")
+    return low, high - low
+
+
+def _parse_chord(text):
+    keys = [key.strip().lower() for key in text.split('+')]
+    if not all(keys):
+        raise ValueError(f"invalid key combination '{text}'")
+    if len(set(keys)) != len(keys):
+        raise ValueError(f"key repeated in '{text}'")
+    return keys
+
+
+def _press(keys):
+    return [(key, True) for key in keys]
+
+
+def _release(keys):
+    return [(key, False) for key in reversed(keys)]
+
+
+def parse_macro(text):
+    """
+    Parse a macro definition into instructions (see MACRO_HELP).
+
+    Args:
+        text: Macro definition
+
+    Returns:
+        list: ('keys', [(key_name, is_down), ...]) and ('wait', minimum, jitter)
+            instructions in order
+
+    Raises:
+        ValueError: If the macro is empty or a statement is invalid
+    """
+    instructions = []
+    held = []
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        for statement in line.split('#', 1)[0].split(';'):
+            words = statement.split()
+            if not words:
+                continue
+            try:
+                instructions.extend(_parse_statement(words, held))
+            except ValueError as e:
+                raise ValueError(f"Line {line_number}: {e}") from None
+
+    if not instructions:
+        raise ValueError("Macro is empty")
+    if held:
+        raise ValueError(f"Keys still held at the end of the macro: {', '.join(held)}")
+    return instructions
+
+
+def _parse_statement(words, held):
+    command = words[0].lower()
+    if command == 'wait':
+        if len(words) != 2:
+            raise ValueError("usage: wait DURATION")
+        return [('wait',) + parse_duration(words[1])]
+
+    if command == 'hold':
+        if len(words) != 3:
+            raise ValueError("usage: hold KEY DURATION")
+        keys = _parse_chord(words[1])
+        _check_released(keys, held)
+        return [('keys', _press(keys)), ('wait',) + parse_duration(words[2]), ('keys', _release(keys))]
+
+    if command == 'down':
+        if len(words) != 2:
+            raise ValueError("usage: down KEY")
+        keys = _parse_chord(words[1])
+        _check_released(keys, held)
+        held.extend(keys)
+        return [('keys', _press(keys))]
+
+    if command == 'up':
+        if len(words) != 2:
+            raise ValueError("usage: up KEY")
+        keys = _parse_chord(words[1])
+        for key in keys:
+            if key not in held:
+                raise ValueError(f"'{key}' is released but not held")
+            held.remove(key)
+        return [('keys', _release(keys))]
+
+    if command == 'tap':
+        words = words[1:]
+    if len(words) != 1:
+        raise ValueError(f"unknown statement '{' '.join(words)}'")
+    keys = _parse_chord(words[0])
+    _check_released(keys, held)
+    return [('keys', _press(keys) + _release(keys))]
+
+
+def _check_released(keys, held):
+    for key in keys:
+        if key in held:
+            raise ValueError(f"'{key}' is pressed while already held")
+
+
+def compile_macro(text, backend):
+    """
+    Compile a macro definition into a KeyPlan.
+
+    Events with no wait between them are merged into one step, which the
+    backend sends as a single batch. Waits become the gaps between steps; a
+    wait at the start delays the first events and a wait at the end is
+    dropped (the interval to the next cycle starts after the last event).
+
+    Args:
+        text: Macro definition (see MACRO_HELP)
+        backend: InputBackend used to resolve key names
+
+    Returns:
+        KeyPlan: Compiled plan
+
+    Raises:
+        ValueError: If the macro is invalid or a key name is not known to the backend
+    """
+    actions = []
+    action_index = {}
+    steps = []
+    gaps = []
+    jitters = []
+    events = []
+    pending_wait = None
+
+    for instruction in parse_macro(text):
+        if instruction[0] == 'wait':
+            if pending_wait is None:
+                pending_wait = [0.0, 0.0]
+            pending_wait[0] += instruction[1]
+            pending_wait[1] += instruction[2]
+            continue
+
+        if pending_wait is not None:
+            steps.append(events)
+            gaps.append(pending_wait[0])
+            jitters.append(pending_wait[1])
+            events = []
+            pending_wait = None
+
+        for key, is_down in instruction[1]:
+            if key not in action_index:
+                action_index[key] = len(actions)
+                actions.append(KeyAction(key=key, label=key.upper(), code=backend.resolve(key), toggle=False))
+            events.append((key, is_down))
+
+    steps.append(events)
+    gaps.append(0.0)
+    jitters.append(0.0)
+    if len(steps) > MAX_STEPS:
+        raise ValueError(f"Macro is too long ({len(steps)} steps, at most {MAX_STEPS})")
+
+    program = []
+    for step_events in steps:
+        indices = tuple(dict.fromkeys(action_index[key] for key, is_down in step_events))
+        batch = tuple((actions[action_index[key]].code, is_down) for key, is_down in step_events)
+        program.append((indices, batch))
+
+    plan = KeyPlan(actions, program, gaps, jitters)
+    logger.debug("Compiled macro: %d steps, %d keys", len(program), len(actions))
+    return plan
@@ -0,0 +1,337 @@
+"""Low-overhead runtime metrics: counters, histograms and periodic snapshots"""
+import bisect
+import json
+import os
+import threading
+import time
+import logging
+
+from core.scheduler import get_io_scheduler
+from utils.paths import get_app_dir
+
+logger = logging.getLogger(__name__)
+
+# Prefix applied to every metric name in exported snapshots
+METRIC_PREFIX = 'extended_afk_'
+
+# Default histogram bucket upper bounds (in seconds)
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+# Seconds between snapshot files written by MetricsWriter
+DEFAULT_WRITE_INTERVAL = 60
+
+
+class Counter:
+    """
+    Monotonically increasing counter with a single writer.
+
+    Updates take no lock: press metrics are only written on the scheduler
+    thread that presses keys, so an increment never races another one.
+    Readers on other threads tolerate a value that is one update stale.
+    Counters updated from several threads use SharedCounter.
+    """
+
+    __slots__ = ('name', 'help', 'value')
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount=1):
+        """
+        Increase the counter.
+
+        Args:
+            amount: Amount to add (default 1)
+        """
+        self.value += amount
+
+
+class SharedCounter(Counter):
+    """Counter updated from several threads (each update takes a lock)"""
+
+    __slots__ = ('_lock',)
+
+    def __init__(self, name, help_text):
+        super().__init__(name, help_text)
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations with a single writer (see Counter)"""
+
+    __slots__ = ('name', 'help', 'bounds', 'counts', 'sum', 'count', 'max')
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.bounds = tuple(buckets)
+        # One slot per bound plus the +Inf overflow bucket
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        """
+        Record one observation.
+
+        Args:
+            value: Observed value (in seconds)
+        """
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def copy_state(self):
+        """
+        Read the histogram for reporting.
+
+        The bucket counts are copied in one step and the total count is
+        derived from them, so the two always agree; sum and max may be one
+        observation ahead of the counts while the writer is running.
+
+        Returns:
+            tuple: (counts list, count, sum, max)
+        """
+        counts = list(self.counts)
+        return counts, sum(counts), self.sum, self.max
+
+    def quantile(self, q):
+        """
+        Estimate a quantile from the bucket counts.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            float or None: Upper bound of the bucket holding the quantile
+                (the observed maximum for the overflow bucket), or None if empty
+        """
+        counts, count, total, maximum = self.copy_state()
+        if not count:
+            return None
+        rank = q * count
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return self.bounds[index] if index < len(self.bounds) else maximum
+        return maximum
+
+    def mean(self):
+        """
+        Get the mean observation.
+
+        Returns:
+            float or None: Mean value, or None if empty
+        """
+        counts, count, total, maximum = self.copy_state()
+        return total / count if count else None
+
+
+class SharedHistogram(Histogram):
+    """Histogram observed from several threads (updates and reads take a lock)"""
+
+    __slots__ = ('_lock',)
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, buckets)
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            super().observe(value)
+
+    def copy_state(self):
+        with self._lock:
+            return list(self.counts), self.count, self.sum, self.max
+
+
+class MetricsRegistry:
+    """Collection of named metrics with JSON and OpenMetrics snapshots"""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def counter(self, name, help_text, shared=False):
+        """
+        Get or create a counter.
+
+        Args:
+            name: Metric name without the _total suffix (e.g. 'presses')
+            help_text: One-line description
+            shared: Whether the counter is updated from more than one thread
+
+        Returns:
+            Counter: Registered counter (a SharedCounter if shared)
+        """
+        return self._register(name, SharedCounter if shared else Counter, help_text)
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS, shared=False):
+        """
+        Get or create a histogram.
+
+        Args:
+            name: Metric name (e.g. 'press_duration_seconds')
+            help_text: One-line description
+            buckets: Bucket upper bounds
+            shared: Whether the histogram is observed from more than one thread
+
+        Returns:
+            Histogram: Registered histogram (a SharedHistogram if shared)
+        """
+        return self._register(name, SharedHistogram if shared else Histogram, help_text, buckets)
+
+    def get(self, name):
+        """
+        Look up a registered metric.
+
+        Args:
+            name: Metric name
+
+        Returns:
+            Counter, Histogram or None
+        """
+        return self._metrics.get(name)
+
+    def _register(self, name, kind, *args):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = kind(name, *args)
+            self._metrics[name] = metric
+        elif type(metric) is not kind:
+            raise ValueError(f"Metric '{name}' is already registered as {type(metric).__name__}")
+        return metric
+
+    def snapshot(self):
+        """
+        Take a point-in-time copy of all metrics.
+
+        Returns:
+            dict: Counters and histograms keyed by metric name
+        """
+        counters = {}
+        histograms = {}
+        for name, metric in list(self._metrics.items()):
+            if isinstance(metric, Counter):
+                counters[name] = metric.value
+            else:
+                counts, count, total, maximum = metric.copy_state()
+                histograms[name] = {
+                    'buckets': list(metric.bounds),
+                    'counts': counts,
+                    'count': count,
+                    'sum': total,
+                    'max': maximum,
+                    'p50': metric.quantile(0.5),
+                    'p99': metric.quantile(0.99),
+                }
+        return {'timestamp': time.time(), 'counters': counters, 'histograms': histograms}
+
+    def to_json(self):
+        """
+        Render a snapshot as JSON.
+
+        Returns:
+            str: JSON document
+        """
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_openmetrics(self):
+        """
+        Render a snapshot in the OpenMetrics text exposition format.
+
+        Returns:
+            str: OpenMetrics text, terminated by '# EOF'
+        """
+        lines = []
+        for name, metric in list(self._metrics.items()):
+            full_name = METRIC_PREFIX + name
+            if isinstance(metric, Counter):
+                lines.append(f"# TYPE {full_name} counter")
+                lines.append(f"# HELP {full_name} {metric.help}")
+                lines.append(f"{full_name}_total {metric.value}")
+            else:
+                lines.append(f"# TYPE {full_name} histogram")
+                lines.append(f"# HELP {full_name} {metric.help}")
+                counts, count, total, maximum = metric.copy_state()
+                cumulative = 0
+                for bound, bucket_count in zip(metric.bounds, counts):
+                    cumulative += bucket_count
+                    lines.append(f'{full_name}_bucket{{le="{bound:g}"}} {cumulative}')
+                lines.append(f'{full_name}_bucket{{le="+Inf"}} {sum(counts)}')
+                lines.append(f"{full_name}_sum {total:.9g}")
+                lines.append(f"{full_name}_count {count}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry used by the core
+REGISTRY = MetricsRegistry()
+
+
+class MetricsWriter:
+    """
+    Periodically writes registry snapshots to disk as a session on the I/O
+    scheduler (off the thread that presses keys).
+
+    Writes metrics.json and metrics.prom (OpenMetrics text) into the
+    application directory, replacing the files atomically each time.
+    """
+
+    def __init__(self, registry=REGISTRY, directory=None, interval=DEFAULT_WRITE_INTERVAL, scheduler=None):
+        """
+        Initialize the writer.
+
+        Args:
+            registry: MetricsRegistry to snapshot
+            directory: Output directory (defaults to the application directory)
+            interval: Seconds between writes
+            scheduler: Optional Scheduler to run on (defaults to the I/O scheduler)
+        """
+        self.registry = registry
+        self.directory = directory or get_app_dir()
+        self.interval = interval
+        self.scheduler = scheduler or get_io_scheduler()
+
+    def start(self):
+        """Start writing snapshots periodically"""
+        self.scheduler.register(self, self.scheduler.clock.monotonic() + self.interval)
+        return self
+
+    def stop(self):
+        """Stop the periodic writes and write one final snapshot"""
+        self.scheduler.unregister(self)
+        self.write()
+
+    def on_deadline(self, now):
+        """Write a snapshot (called by the scheduler)"""
+        self.write()
+        return now + self.interval
+
+    def write(self):
+        """Write the current snapshot files"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._write_atomic('metrics.json', self.registry.to_json())
+            self._write_atomic('metrics.prom', self.registry.to_openmetrics())
+        except Exception as e:
+            logger.error("Failed to write metrics: %s", e)
+
+    def _write_atomic(self, filename, content):
+        path = os.path.join(self.directory, filename)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as f:
+            f.write(content)
+        os.replace(temp_path, path)
@@ -0,0 +1,154 @@
+"""High-resolution waits against absolute monotonic deadlines"""
+import sys
+import threading
+import logging
+
+from core.clock import SYSTEM_CLOCK
+
+logger = logging.getLogger(__name__)
+
+# Final stretch before a deadline that is spun instead of slept (in seconds).
+# OS sleeps overshoot by up to about a millisecond on Linux and macOS (more on
+# Windows without a raised timer resolution), so waking this early and
+# spinning lands within microseconds of the deadline.
+DEFAULT_SPIN_SECONDS = 0.001
+
+# Largest spin budget accepted (in seconds); spinning burns a CPU core
+MAX_SPIN_SECONDS = 0.05
+
+# Histogram bucket upper bounds for deadline errors (in seconds), down to
+# the microseconds a spinning wait achieves
+DEADLINE_ERROR_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0
+)
+
+
+class PrecisionTimer:
+    """
+    Hybrid sleep-then-spin wait for absolute deadlines.
+
+    A wait sleeps until spin_seconds before the deadline, then polls the
+    clock for the rest. Deadlines are absolute monotonic times, so time
+    spent between waits (pressing keys, status callbacks) never
+    accumulates as drift. A spin budget of 0 only sleeps.
+    """
+
+    def __init__(self, clock=SYSTEM_CLOCK, spin_seconds=DEFAULT_SPIN_SECONDS):
+        """
+        Initialize the timer.
+
+        Args:
+            clock: Clock providing monotonic() for deadlines
+            spin_seconds: Spin budget before each deadline (in seconds)
+
+        Raises:
+            ValueError: If the spin budget is negative or above MAX_SPIN_SECONDS
+        """
+        self.clock = clock
+        self.spin_seconds = 0.0
+        self.set_spin_budget(spin_seconds)
+
+    def set_spin_budget(self, spin_seconds):
+        """
+        Change the spin budget (takes effect from the next wait step).
+
+        Args:
+            spin_seconds: Spin budget before each deadline (in seconds)
+
+        Raises:
+            ValueError: If the spin budget is negative or above MAX_SPIN_SECONDS
+        """
+        if not 0 <= spin_seconds <= MAX_SPIN_SECONDS:
+            raise ValueError(f"Spin budget must be between 0 and {MAX_SPIN_SECONDS * 1000:g} ms")
+        self.spin_seconds = float(spin_seconds)
+
+    def wait_step(self, cond, deadline, spin=True):
+        """
+        Take one step of waiting on a held condition for a deadline.
+
+        Far from the deadline this sleeps on the condition until the spin
+        window opens (or until notified); inside the window it releases the
+        lock just long enough to let other threads in. Callers loop and
+        re-check their own state between steps, so a notify that changes
+        the deadline is never missed.
+
+        Args:
+            cond: threading.Condition held by the caller
+            deadline: Monotonic deadline
+            spin: Whether to spin the final stretch (False sleeps all the
+                way, for deadlines that do not need precision)
+
+        Returns:
+            bool: True if the deadline has passed
+        """
+        remaining = deadline - self.clock.monotonic()
+        if remaining <= 0:
+            return True
+        if not spin:
+            cond.wait(remaining)
+        elif remaining > self.spin_seconds:
+            cond.wait(remaining - self.spin_seconds)
+        else:
+            # Spin: let other threads take the lock between clock reads. No
+            # sleep(0) here, it costs the OS timer slack (50 us on Linux);
+            # the interpreter still hands the GIL over every switch interval
+            cond.release()
+            cond.acquire()
+        return self.clock.monotonic() >= deadline
+
+    def wait_until(self, deadline, cancel=None):
+        """
+        Block the calling thread until a deadline.
+
+        Args:
+            deadline: Monotonic deadline
+            cancel: Optional threading.Event that ends the wait early
+
+        Returns:
+            float or None: Deadline error (actual wake-up minus deadline, in
+                seconds), or None if cancelled
+        """
+        cond = threading.Condition()
+        with cond:
+            while not self.wait_step(cond, deadline):
+                if cancel is not None and cancel.is_set():
+                    return None
+        return self.clock.monotonic() - deadline
+
+
+class TimerResolution:
+    """
+    Switch for a 1 ms OS timer resolution.
+
+    Windows sleeps in 15.6 ms ticks by default, far more than any sensible
+    spin budget, and a raised resolution costs power system-wide, so it is
+    only raised while something needs precise wake-ups. Other platforms
+    already sleep with sub-millisecond resolution and are left unchanged.
+    """
+
+    def __init__(self):
+        self.raised = False
+        self._winmm = None
+
+    def set_high(self, high):
+        """
+        Raise or restore the timer resolution (repeated calls are free).
+
+        Args:
+            high: True to raise the resolution to 1 ms, False to restore it
+        """
+        if high == self.raised or sys.platform != 'win32':
+            return
+        try:
+            if self._winmm is None:
+                import ctypes
+                self._winmm = ctypes.WinDLL('winmm')
+            if high:
+                self._winmm.timeBeginPeriod(1)
+            else:
+                self._winmm.timeEndPeriod(1)
+        except (ImportError, OSError, AttributeError) as e:
+            logger.debug("Could not change the timer resolution: %s", e)
+            return
+        self.raised = high
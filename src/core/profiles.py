@@ -0,0 +1,353 @@
+"""Named key pressing profiles stored in SQLite"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+
+from utils.paths import get_app_dir
+
+logger = logging.getLogger(__name__)
+
+PROFILES_FILENAME = 'profiles.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    name TEXT PRIMARY KEY,
+    keys_config TEXT NOT NULL,
+    min_interval_minutes REAL NOT NULL,
+    max_interval_minutes REAL NOT NULL,
+    macro TEXT NOT NULL DEFAULT '',
+    created REAL NOT NULL,
+    last_used REAL
+);
+CREATE INDEX IF NOT EXISTS profiles_by_last_used ON profiles (last_used DESC, name);
+CREATE TABLE IF NOT EXISTS profile_tags (
+    tag TEXT NOT NULL,
+    name TEXT NOT NULL REFERENCES profiles (name) ON DELETE CASCADE ON UPDATE CASCADE,
+    PRIMARY KEY (tag, name)
+);
+CREATE INDEX IF NOT EXISTS profile_tags_by_name ON profile_tags (name);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# meta key holding the name of the active profile
+ACTIVE_KEY = 'active_profile'
+
+
+def get_profiles_path():
+    """
+    Get the default profile store location.
+
+    Returns:
+        str: Path of profiles.db in the application directory
+    """
+    return os.path.join(get_app_dir(), PROFILES_FILENAME)
+
+
+class Profile:
+    """A named key pressing configuration"""
+
+    def __init__(self, name, keys_config, min_interval_minutes, max_interval_minutes,
+                 tags=(), last_used=None, macro=''):
+        """
+        Initialize a profile.
+
+        Args:
+            name: Unique profile name
+            keys_config: List of dicts with 'key' and 'press_twice' settings
+            min_interval_minutes: Minimum interval between presses (in minutes)
+            max_interval_minutes: Maximum interval between presses (in minutes)
+            tags: Tag names
+            last_used: Time the profile was last activated (seconds since the epoch)
+            macro: Macro definition pressed instead of the keys (empty for none)
+
+        Raises:
+            ValueError: If the name is empty or the interval range is invalid
+        """
+        if not name or not name.strip():
+            raise ValueError("Profile name cannot be empty")
+        if min_interval_minutes <= 0 or max_interval_minutes <= 0:
+            raise ValueError("Intervals must be positive numbers")
+        if min_interval_minutes > max_interval_minutes:
+            raise ValueError("min_interval cannot be greater than max_interval")
+
+        self.name = name.strip()
+        self.keys_config = keys_config
+        self.min_interval_minutes = min_interval_minutes
+        self.max_interval_minutes = max_interval_minutes
+        self.tags = sorted(set(tags))
+        self.last_used = last_used
+        self.macro = macro or ''
+
+    def __repr__(self):
+        return f"Profile({self.name!r}, keys={len(self.keys_config)}, tags={self.tags})"
+
+    def to_dict(self):
+        """
+        Get the profile as plain data.
+
+        Returns:
+            dict: Profile fields
+        """
+        return {
+            'name': self.name,
+            'keys_config': self.keys_config,
+            'min_interval_minutes': self.min_interval_minutes,
+            'max_interval_minutes': self.max_interval_minutes,
+            'macro': self.macro,
+            'tags': self.tags,
+            'last_used': self.last_used,
+        }
+
+
+class ProfileStore:
+    """
+    SQLite-backed collection of profiles.
+
+    Profiles are looked up by their primary key and listed through an index
+    on last use, so opening the store and reading the active profile costs
+    the same whether it holds ten profiles or ten thousand. All methods are
+    thread-safe.
+    """
+
+    def __init__(self, path=None):
+        """
+        Open (or create) a profile store.
+
+        Args:
+            path: Database file path (defaults to profiles.db in the application directory)
+        """
+        self.path = path or get_profiles_path()
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Add columns missing from stores created by older versions"""
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(profiles)")}
+        if 'macro' not in columns:
+            with self._db:
+                self._db.execute("ALTER TABLE profiles ADD COLUMN macro TEXT NOT NULL DEFAULT ''")
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._db.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def get(self, name):
+        """
+        Look up a profile by name.
+
+        Args:
+            name: Profile name
+
+        Returns:
+            Profile or None: The profile, or None if there is none by that name
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT name, keys_config, min_interval_minutes, max_interval_minutes, last_used, macro "
+                "FROM profiles WHERE name = ?",
+                (name,)
+            ).fetchone()
+            if row is None:
+                return None
+            tags = [tag for (tag,) in self._db.execute(
+                "SELECT tag FROM profile_tags WHERE name = ?", (name,))]
+        return Profile(row[0], json.loads(row[1]), row[2], row[3], tags=tags, last_used=row[4], macro=row[5])
+
+    def save(self, profile):
+        """
+        Create or replace a profile (its last use time is kept).
+
+        Args:
+            profile: Profile to store
+        """
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO profiles (name, keys_config, min_interval_minutes, max_interval_minutes, "
+                "macro, created, last_used) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET keys_config = excluded.keys_config, "
+                "min_interval_minutes = excluded.min_interval_minutes, "
+                "max_interval_minutes = excluded.max_interval_minutes, "
+                "macro = excluded.macro",
+                (profile.name, json.dumps(profile.keys_config), profile.min_interval_minutes,
+                 profile.max_interval_minutes, profile.macro, time.time(), profile.last_used)
+            )
+            self._db.execute("DELETE FROM profile_tags WHERE name = ?", (profile.name,))
+            self._db.executemany(
+                "INSERT INTO profile_tags (tag, name) VALUES (?, ?)",
+                [(tag, profile.name) for tag in profile.tags]
+            )
+        logger.info("Profile saved: %s", profile.name)
+
+    def delete(self, name):
+        """
+        Delete a profile.
+
+        Args:
+            name: Profile name
+
+        Returns:
+            bool: True if a profile was deleted
+        """
+        with self._lock, self._db:
+            deleted = self._db.execute("DELETE FROM profiles WHERE name = ?", (name,)).rowcount
+            self._db.execute("DELETE FROM meta WHERE key = ? AND value = ?", (ACTIVE_KEY, name))
+        if deleted:
+            logger.info("Profile deleted: %s", name)
+        return bool(deleted)
+
+    def rename(self, name, new_name):
+        """
+        Rename a profile (tags and the active selection follow it).
+
+        Args:
+            name: Current profile name
+            new_name: New profile name
+
+        Raises:
+            KeyError: If there is no profile by that name
+            ValueError: If a profile named new_name already exists
+        """
+        new_name = new_name.strip()
+        if not new_name:
+            raise ValueError("Profile name cannot be empty")
+        with self._lock, self._db:
+            try:
+                renamed = self._db.execute(
+                    "UPDATE profiles SET name = ? WHERE name = ?", (new_name, name)).rowcount
+            except sqlite3.IntegrityError as e:
+                raise ValueError(f"A profile named '{new_name}' already exists") from e
+            if not renamed:
+                raise KeyError(name)
+            self._db.execute(
+                "UPDATE meta SET value = ? WHERE key = ? AND value = ?", (new_name, ACTIVE_KEY, name))
+
+    def names(self, tag=None, prefix=None, limit=None, offset=0):
+        """
+        List profile names, most recently used first.
+
+        Args:
+            tag: Only profiles with this tag
+            prefix: Only names starting with this text
+            limit: Maximum number of names (None for all)
+            offset: Number of names to skip (for paging)
+
+        Returns:
+            list: Profile names
+        """
+        query = "SELECT p.name FROM profiles p"
+        args = []
+        if tag is not None:
+            query += " JOIN profile_tags t ON t.name = p.name AND t.tag = ?"
+            args.append(tag)
+        if prefix:
+            query += " WHERE p.name LIKE ? ESCAPE '\\'"
+            escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            args.append(escaped + '%')
+        query += " ORDER BY p.last_used IS NULL, p.last_used DESC, p.name LIMIT ? OFFSET ?"
+        args.extend([-1 if limit is None else limit, offset])
+        with self._lock:
+            return [name for (name,) in self._db.execute(query, args)]
+
+    def tags(self):
+        """
+        List all tags in use.
+
+        Returns:
+            list: Sorted tag names
+        """
+        with self._lock:
+            return [tag for (tag,) in self._db.execute(
+                "SELECT DISTINCT tag FROM profile_tags ORDER BY tag")]
+
+    def active_name(self):
+        """
+        Get the name of the active profile.
+
+        Returns:
+            str or None: Active profile name, or None if no profile is active
+        """
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (ACTIVE_KEY,)).fetchone()
+        return row[0] if row else None
+
+    def active(self):
+        """
+        Load the active profile (and nothing else).
+
+        Returns:
+            Profile or None: Active profile, or None if no profile is active
+        """
+        name = self.active_name()
+        return self.get(name) if name is not None else None
+
+    def activate(self, name):
+        """
+        Make a profile the active one and record its use.
+
+        Args:
+            name: Profile name
+
+        Returns:
+            Profile: The activated profile
+
+        Raises:
+            KeyError: If there is no profile by that name
+        """
+        with self._lock, self._db:
+            updated = self._db.execute(
+                "UPDATE profiles SET last_used = ? WHERE name = ?", (time.time(), name)).rowcount
+            if not updated:
+                raise KeyError(name)
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (ACTIVE_KEY, name))
+        logger.info("Profile activated: %s", name)
+        return self.get(name)
+
+    def import_settings_file(self, path, name=None, tags=()):
+        """
+        Create a profile from a settings.json file.
+
+        Args:
+            path: Settings file path
+            name: Profile name (defaults to the file name without extension)
+            tags: Tag names
+
+        Returns:
+            Profile: The stored profile
+        """
+        with open(path, 'r') as f:
+            settings = json.load(f)
+
+        keys_config = settings.get('keys_config')
+        if not keys_config:
+            press_twice = settings.get('press_twice', False)
+            keys_config = [{'key': k, 'press_twice': press_twice} for k in settings.get('keys', [])]
+
+        profile = Profile(
+            name or os.path.splitext(os.path.basename(path))[0],
+            keys_config,
+            settings.get('min_interval_minutes', 10),
+            settings.get('max_interval_minutes', 14),
+            tags=tags,
+            macro=settings.get('macro', '')
+        )
+        self.save(profile)
+        return profile
@@ -0,0 +1,322 @@
+"""Shared deadline scheduler that drives many key presser sessions from one thread"""
+import heapq
+import itertools
+import threading
+import time
+import logging
+
+from core.clock import SYSTEM_CLOCK
+from core.precision_timer import PrecisionTimer, TimerResolution
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    """
+    Min-heap of session deadlines serviced by a single background thread.
+
+    A session is any object with an ``on_deadline(now)`` method. The scheduler
+    calls it on its worker thread once the session's deadline has passed; the
+    method returns the next deadline (in the clock's monotonic seconds) or None
+    to drop out of the schedule. Registering, rescheduling and unregistering
+    cost O(log N) regardless of how many sessions are active.
+
+    The worker waits with a PrecisionTimer. Sessions with a true ``precise``
+    attribute (key pressing sessions) are woken by sleeping until just
+    before their deadline and spinning for the rest, and the OS timer
+    resolution is raised only while such a session is scheduled; other
+    sessions (settings polling, metrics) are simply slept for.
+
+    With ``threaded=False`` no worker thread is started and the schedule is
+    advanced explicitly with run_until(), which is how simulations replay
+    long sessions against a VirtualClock.
+    """
+
+    def __init__(self, name="extended-afk-scheduler", clock=SYSTEM_CLOCK, threaded=True, timer=None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            name: Name given to the worker thread
+            clock: Clock providing monotonic() for deadlines
+            threaded: Whether to run sessions on a background worker thread
+            timer: Optional PrecisionTimer for the worker's waits (defaults to
+                one on the same clock with the default spin budget)
+        """
+        self.name = name
+        self.clock = clock
+        self.threaded = threaded
+        self.timer = timer or PrecisionTimer(clock)
+
+        # Heap entries are [deadline, sequence, session, active]. Cancelled
+        # entries are flagged inactive and discarded lazily when popped.
+        self._heap = []
+        self._entries = {}
+        # Scheduled sessions that ask for precise wake-ups
+        self._precise_count = 0
+        self._resolution = TimerResolution()
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+
+        # Session currently inside on_deadline (None when idle) and the
+        # thread it runs on
+        self._firing = None
+        self._firing_ident = None
+        self._firing_cancelled = False
+
+    def register(self, session, deadline):
+        """
+        Add a session to the schedule, or move it if already registered.
+
+        Args:
+            session: Object implementing on_deadline(now)
+            deadline: Monotonic time at which to fire the session
+        """
+        with self._cond:
+            if self._firing is session:
+                self._firing_cancelled = False
+            self._push(session, deadline)
+            self._ensure_thread()
+            self._cond.notify()
+
+    def reschedule(self, session, deadline):
+        """
+        Move a registered session to a new deadline.
+
+        Args:
+            session: Registered session
+            deadline: New monotonic deadline
+        """
+        self.register(session, deadline)
+
+    def unregister(self, session, timeout=2.0):
+        """
+        Remove a session from the schedule.
+
+        If the session is being fired on the worker thread right now, this
+        waits (up to timeout seconds) for that call to return so the caller
+        knows no further work will happen on the session's behalf. Calling
+        this from inside on_deadline never waits.
+
+        Args:
+            session: Session to remove
+            timeout: Maximum seconds to wait for an in-flight call
+
+        Returns:
+            bool: True if the session was scheduled or firing, False otherwise
+        """
+        with self._cond:
+            entry = self._forget(session)
+            if entry is not None:
+                entry[3] = False
+
+            firing = self._firing is session
+            if firing:
+                self._firing_cancelled = True
+                if threading.get_ident() != self._firing_ident:
+                    end = time.monotonic() + timeout
+                    while self._firing is session:
+                        remaining = end - time.monotonic()
+                        if remaining <= 0:
+                            logger.warning("Timed out waiting for session to finish")
+                            break
+                        self._cond.wait(remaining)
+
+            self._cond.notify()
+            return entry is not None or firing
+
+    def is_registered(self, session):
+        """
+        Check if a session is scheduled or currently firing.
+
+        Args:
+            session: Session to look up
+
+        Returns:
+            bool: True if the session is active in this scheduler
+        """
+        with self._cond:
+            return session in self._entries or (
+                self._firing is session and not self._firing_cancelled
+            )
+
+    def next_deadline(self, session):
+        """
+        Get the pending deadline of a session.
+
+        Args:
+            session: Session to look up
+
+        Returns:
+            float or None: Monotonic deadline, or None if not scheduled
+        """
+        with self._cond:
+            entry = self._entries.get(session)
+            return entry[0] if entry is not None else None
+
+    def session_count(self):
+        """
+        Get the number of scheduled sessions.
+
+        Returns:
+            int: Number of sessions with a pending deadline
+        """
+        with self._cond:
+            return len(self._entries)
+
+    def _push(self, session, deadline):
+        """Push a heap entry for session, invalidating any previous one"""
+        old = self._entries.get(session)
+        if old is not None:
+            old[3] = False
+        elif getattr(session, 'precise', False):
+            self._precise_count += 1
+        entry = [deadline, next(self._sequence), session, True]
+        self._entries[session] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _forget(self, session):
+        """Remove a session's entry from the index (the heap entry stays)"""
+        entry = self._entries.pop(session, None)
+        if entry is not None and getattr(session, 'precise', False):
+            self._precise_count -= 1
+        return entry
+
+    def run_until(self, end):
+        """
+        Fire every session due up to a point in time on the calling thread.
+
+        Only meaningful for unthreaded schedulers driven by a VirtualClock:
+        the clock is advanced to each deadline before its session fires, and
+        finally to end.
+
+        Args:
+            end: Monotonic time to run the schedule up to
+
+        Returns:
+            int: Number of session calls made
+        """
+        calls = 0
+        while True:
+            with self._cond:
+                while self._heap and not self._heap[0][3]:
+                    heapq.heappop(self._heap)
+                if not self._heap or self._heap[0][0] > end:
+                    break
+                entry = heapq.heappop(self._heap)
+                session = entry[2]
+                self._forget(session)
+                self._firing = session
+                self._firing_ident = threading.get_ident()
+                self._firing_cancelled = False
+
+            self.clock.advance_to(entry[0])
+            self._fire(session)
+            calls += 1
+
+        self.clock.advance_to(end)
+        return calls
+
+    def _ensure_thread(self):
+        """Start the worker thread if it is not running"""
+        if not self.threaded:
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """Worker loop: wait for the earliest deadline, then fire it"""
+        while True:
+            with self._cond:
+                session = self._next_due()
+                if session is None:
+                    # Nothing left to schedule; let the thread exit
+                    self._resolution.set_high(False)
+                    self._thread = None
+                    return
+                self._firing = session
+                self._firing_ident = threading.get_ident()
+                self._firing_cancelled = False
+
+            self._fire(session)
+
+    def _fire(self, session):
+        """Call a popped session and push its next deadline"""
+        try:
+            next_deadline = session.on_deadline(self.clock.monotonic())
+        except Exception as e:
+            logger.error("Error in scheduled session: %s", e, exc_info=True)
+            next_deadline = None
+
+        with self._cond:
+            if (next_deadline is not None and not self._firing_cancelled
+                    and session not in self._entries):
+                self._push(session, next_deadline)
+            self._firing = None
+            self._firing_ident = None
+            self._cond.notify_all()
+
+    def _next_due(self):
+        """
+        Block until a session is due and pop it. Must hold the condition.
+
+        Returns:
+            Session to fire, or None if the schedule is empty
+        """
+        while True:
+            while self._heap and not self._heap[0][3]:
+                heapq.heappop(self._heap)
+
+            if not self._heap:
+                return None
+
+            deadline, _, session, _ = self._heap[0]
+            if self.clock.monotonic() >= deadline:
+                heapq.heappop(self._heap)
+                self._forget(session)
+                return session
+
+            # One sleep or spin step; the heap may change in between
+            self._resolution.set_high(self._precise_count > 0)
+            self.timer.wait_step(self._cond, deadline, spin=getattr(session, 'precise', False))
+
+
+_default_scheduler = None
+_default_lock = threading.Lock()
+
+
+def get_scheduler():
+    """
+    Get the process-wide scheduler shared by all sessions.
+
+    Returns:
+        Scheduler: Shared scheduler instance
+    """
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = Scheduler()
+        return _default_scheduler
+
+
+_default_io_scheduler = None
+
+
+def get_io_scheduler():
+    """
+    Get the process-wide scheduler for background file work.
+
+    Settings writes and polling and metrics snapshots run here, on their
+    own thread, so a slow or locked disk never delays a key press on the
+    shared scheduler.
+
+    Returns:
+        Scheduler: Shared I/O scheduler instance
+    """
+    global _default_io_scheduler
+    with _default_lock:
+        if _default_io_scheduler is None:
+            _default_io_scheduler = Scheduler(name="extended-afk-io")
+        return _default_io_scheduler
@@ -1,18 +1,54 @@
 """Settings persistence manager"""
 import json
 import os
+import threading
 import logging
+from contextlib import contextmanager
+
+from core.input_backend import BACKENDS, DEFAULT_BACKEND
+from core.key_plan import check_keys_config
+from core.precision_timer import DEFAULT_SPIN_SECONDS, MAX_SPIN_SECONDS
+from core.scheduler import get_io_scheduler
+from utils.paths import get_app_dir
 
 logger = logging.getLogger(__name__)
 
+# Default number of activity log lines kept in memory
+DEFAULT_LOG_HISTORY_LINES = 1_000_000
+
+# Delay between the last change and the background write (in seconds)
+FLUSH_DELAY = 1.0
+
+# Settings file polling interval bounds (in seconds): polling starts fast
+# and backs off while the file stays unchanged
+WATCH_MIN_INTERVAL = 1.0
+WATCH_MAX_INTERVAL = 16.0
+
+# Units the interval fields can be shown in (settings always store minutes)
+INTERVAL_UNITS = ('minutes', 'seconds')
+
 
 class AppSettings:
-    """Manages application settings with JSON persistence"""
+    """
+    Manages application settings with JSON persistence.
 
-    def __init__(self):
-        """Initialize settings manager"""
-        # Use APPDATA for settings directory
-        self.settings_dir = os.path.join(os.getenv('APPDATA'), 'extended-afk')
+    Changes are written in the background: set() marks the settings dirty
+    and schedules a write FLUSH_DELAY seconds later on the I/O scheduler
+    (never the thread that presses keys), restarting the delay on every
+    change. The settings are copied under the lock and written outside it,
+    so set() never waits for the disk. Files are replaced atomically.
+    Call flush() before exiting to write any pending changes.
+    """
+
+    def __init__(self, scheduler=None):
+        """
+        Initialize settings manager.
+
+        Args:
+            scheduler: Optional Scheduler for background writes (defaults to the I/O scheduler)
+        """
+        # Use APPDATA (or the XDG state directory) for settings
+        self.settings_dir = get_app_dir()
         self.settings_file = os.path.join(self.settings_dir, 'settings.json')
 
         # Default settings
@@ -21,9 +57,29 @@ class AppSettings:
             'keys': ['l', 't', 'f1'],
             'min_interval_minutes': 10,
             'max_interval_minutes': 14,
-            'press_twice': True
+            'press_twice': True,
+            # Unit of the interval fields in the main window
+            'interval_unit': 'minutes',
+            # Spin budget of the precision timer before each deadline (in milliseconds)
+            'timer_spin_ms': DEFAULT_SPIN_SECONDS * 1000,
+            'input_backend': DEFAULT_BACKEND,
+            'log_history_lines': DEFAULT_LOG_HISTORY_LINES,
+            # Macro definition pressed instead of the keys (see core.macro; empty disables it)
+            'macro': '',
+            # Local control API address ("host:port" or "unix:PATH"; None disables it)
+            'control_address': None
         }
 
+        self.scheduler = scheduler or get_io_scheduler()
+        self._lock = threading.RLock()
+        # Serializes file writes (taken without _lock, so set() never waits on the disk)
+        self._write_lock = threading.Lock()
+        # Keys changed since the last write
+        self._dirty_keys = set()
+        self._batch_depth = 0
+        # (mtime, size) of the settings file as last read or written
+        self._file_signature = None
+
         # Load settings from file or use defaults
         self.settings = self.load()
 
@@ -36,34 +92,154 @@ class AppSettings:
         """
         if os.path.exists(self.settings_file):
             try:
-                with open(self.settings_file, 'r') as f:
-                    loaded = json.load(f)
-                    # Merge with defaults to ensure all keys exist
-                    settings = {**self.defaults, **loaded}
-                    self._validate(settings)
-                    logger.info(f"Settings loaded from {self.settings_file}")
-                    return settings
+                settings = self._read_file()
+                logger.info("Settings loaded from %s", self.settings_file)
+                return settings
             except Exception as e:
-                logger.error(f"Failed to load settings: {e}")
+                logger.error("Failed to load settings: %s", e)
                 logger.info("Using default settings")
                 return self.defaults.copy()
         else:
             logger.info("Settings file not found, using defaults")
             return self.defaults.copy()
 
+    def _read_file(self):
+        """
+        Read and validate the settings file.
+
+        Returns:
+            dict: Settings merged with the defaults
+
+        Raises:
+            OSError, ValueError: If the file cannot be read or is invalid
+        """
+        self._file_signature = self._stat_file()
+        with open(self.settings_file, 'r') as f:
+            loaded = json.load(f)
+        # Merge with defaults to ensure all keys exist
+        settings = {**self.defaults, **loaded}
+        self._validate(settings)
+        return settings
+
+    def _stat_file(self):
+        """Get the (mtime, size) signature of the settings file, or None"""
+        try:
+            stat = os.stat(self.settings_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload_if_changed(self):
+        """
+        Reload the settings file if it was changed by another program.
+
+        Changes made here and not yet written are kept on top of the
+        reloaded file (and written with the next flush), unless the result
+        would be invalid, in which case they are dropped with a warning.
+        Invalid files are reported and ignored.
+
+        Returns:
+            bool: True if new settings were loaded
+        """
+        with self._lock:
+            signature = self._stat_file()
+            if signature is None or signature == self._file_signature:
+                return False
+            try:
+                settings = self._read_file()
+            except Exception as e:
+                logger.warning("Ignoring invalid settings file change: %s", e)
+                return False
+            pending = {key: self.settings[key] for key in self._dirty_keys if key in self.settings}
+            if pending:
+                merged = {**settings, **pending}
+                try:
+                    self._validate(merged)
+                except ValueError as e:
+                    logger.warning(
+                        "Discarding unsaved settings changes (%s) that conflict with the reloaded file: %s",
+                        ", ".join(sorted(pending)), e)
+                    self._dirty_keys = set()
+                else:
+                    logger.info("Keeping unsaved settings changes on top of the reloaded file: %s",
+                                ", ".join(sorted(pending)))
+                    settings = merged
+            changed = settings != self.settings
+            self.settings = settings
+        if changed:
+            logger.info("Settings reloaded from %s", self.settings_file)
+        return changed
+
     def save(self):
         """Save current settings to JSON file"""
-        try:
-            # Create directory if it doesn't exist
-            os.makedirs(self.settings_dir, exist_ok=True)
+        # Snapshot under the lock, write outside it
+        with self._lock:
+            content = json.dumps(self.settings, indent=2)
+            written_keys, self._dirty_keys = self._dirty_keys, set()
 
-            # Write settings to file
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+        with self._write_lock:
+            try:
+                # Create directory if it doesn't exist
+                os.makedirs(self.settings_dir, exist_ok=True)
+
+                # Write to a temporary file and swap it in, so a crash
+                # mid-write never leaves a truncated settings file
+                temp_file = self.settings_file + '.tmp'
+                with open(temp_file, 'w') as f:
+                    f.write(content)
+                    # On disk before the swap, or a power loss can leave
+                    # an empty settings.json behind the rename
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_file, self.settings_file)
+                signature = self._stat_file()
+                with self._lock:
+                    self._file_signature = signature
+
+                logger.info("Settings saved to %s", self.settings_file)
+            except Exception as e:
+                with self._lock:
+                    self._dirty_keys |= written_keys
+                logger.error("Failed to save settings: %s", e)
+
+    def flush(self):
+        """Write pending changes now (call before exiting)"""
+        self.scheduler.unregister(self)
+        if self._dirty_keys:
+            self.save()
 
-            logger.info(f"Settings saved to {self.settings_file}")
-        except Exception as e:
-            logger.error(f"Failed to save settings: {e}")
+    def on_deadline(self, now):
+        """Write pending changes (called by the scheduler)"""
+        with self._lock:
+            pending = bool(self._dirty_keys) and not self._batch_depth
+        if pending:
+            self.save()
+        return None
+
+    @contextmanager
+    def batch(self):
+        """
+        Group several set() calls into a single write.
+
+        Example:
+            with settings.batch():
+                settings.set('min_interval_minutes', 5)
+                settings.set('max_interval_minutes', 8)
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                schedule = bool(self._dirty_keys) and not self._batch_depth
+            if schedule:
+                self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Schedule (or push back) the background write"""
+        self.scheduler.register(self, self.scheduler.clock.monotonic() + FLUSH_DELAY)
 
     def _validate(self, settings):
         """
@@ -79,23 +255,54 @@ class AppSettings:
         if not isinstance(settings.get('keys'), list):
             raise ValueError("Keys must be a list")
 
+        # Validate keys configuration (key names are checked when compiled)
+        if 'keys_config' in settings:
+            check_keys_config(settings['keys_config'])
+
         # Validate intervals
         min_int = settings.get('min_interval_minutes')
         max_int = settings.get('max_interval_minutes')
 
-        if not isinstance(min_int, (int, float)) or min_int <= 0:
+        if not isinstance(min_int, (int, float)) or isinstance(min_int, bool) or min_int <= 0:
             raise ValueError("min_interval_minutes must be a positive number")
 
-        if not isinstance(max_int, (int, float)) or max_int <= 0:
+        if not isinstance(max_int, (int, float)) or isinstance(max_int, bool) or max_int <= 0:
             raise ValueError("max_interval_minutes must be a positive number")
 
         if min_int > max_int:
             raise ValueError("min_interval cannot be greater than max_interval")
 
+        if settings.get('interval_unit', 'minutes') not in INTERVAL_UNITS:
+            raise ValueError(f"interval_unit must be one of: {', '.join(INTERVAL_UNITS)}")
+
+        # Validate timer spin budget
+        spin = settings.get('timer_spin_ms', DEFAULT_SPIN_SECONDS * 1000)
+        if (not isinstance(spin, (int, float)) or isinstance(spin, bool)
+                or not 0 <= spin <= MAX_SPIN_SECONDS * 1000):
+            raise ValueError(f"timer_spin_ms must be a number from 0 to {MAX_SPIN_SECONDS * 1000:g}")
+
         # Validate press_twice
         if not isinstance(settings.get('press_twice'), bool):
             raise ValueError("press_twice must be a boolean")
 
+        # Validate input backend
+        if settings.get('input_backend') not in BACKENDS:
+            raise ValueError(f"input_backend must be one of: {', '.join(BACKENDS)}")
+
+        # Validate log history size
+        history = settings.get('log_history_lines')
+        if not isinstance(history, int) or isinstance(history, bool) or history <= 0:
+            raise ValueError("log_history_lines must be a positive integer")
+
+        # Validate macro (compiled in full when pressing starts)
+        if not isinstance(settings.get('macro', ''), str):
+            raise ValueError("macro must be a string")
+
+        # Validate control server address (checked in full when the server starts)
+        control_address = settings.get('control_address')
+        if control_address is not None and not isinstance(control_address, str):
+            raise ValueError("control_address must be a string or null")
+
     def get(self, key, default=None):
         """
         Get a setting value.
@@ -111,14 +318,51 @@ class AppSettings:
 
     def set(self, key, value):
         """
-        Set a setting value and save.
+        Set a setting value and schedule a save.
 
         Args:
             key: Setting key
             value: New value
         """
-        self.settings[key] = value
-        self.save()
+        with self._lock:
+            if key in self.settings and self.settings[key] == value:
+                return
+            self.settings[key] = value
+            self._dirty_keys.add(key)
+            if self._batch_depth:
+                return
+        self._schedule_flush()
+
+    def validate_changes(self, changes):
+        """
+        Check changes against the current settings without applying them.
+
+        Args:
+            changes: Dictionary of settings to change
+
+        Raises:
+            ValueError: If the settings would be invalid after the changes
+        """
+        with self._lock:
+            merged = {**self.settings, **changes}
+        self._validate(merged)
+
+    def get_keys_config(self):
+        """
+        Get the keys configuration, converting the old 'keys' format.
+
+        Returns:
+            list: Dicts with 'key' and 'press_twice' settings
+        """
+        keys_config = self.settings.get('keys_config', [])
+
+        # Handle backward compatibility with old 'keys' format
+        if not keys_config:
+            old_keys = self.settings.get('keys', [])
+            old_press_twice = self.settings.get('press_twice', False)
+            keys_config = [{'key': k, 'press_twice': old_press_twice} for k in old_keys]
+
+        return keys_config
 
     def get_all(self):
         """
@@ -128,3 +372,49 @@ class AppSettings:
             dict: All settings
         """
         return self.settings.copy()
+
+
+class SettingsWatcher:
+    """
+    Watches the settings file for external edits as a scheduler session.
+
+    Polls the file's modification time and size, starting every
+    WATCH_MIN_INTERVAL seconds and doubling the interval up to
+    WATCH_MAX_INTERVAL while nothing changes.
+    """
+
+    def __init__(self, settings, callback, scheduler=None):
+        """
+        Initialize the watcher.
+
+        Args:
+            settings: AppSettings to reload
+            callback: Called without arguments (on the scheduler thread) after a reload
+            scheduler: Optional Scheduler to poll on (defaults to the settings' scheduler)
+        """
+        self.settings = settings
+        self.callback = callback
+        self.scheduler = scheduler or settings.scheduler
+        self.interval = WATCH_MIN_INTERVAL
+
+    def start(self):
+        """Start polling"""
+        self.interval = WATCH_MIN_INTERVAL
+        self.scheduler.register(self, self.scheduler.clock.monotonic() + self.interval)
+        return self
+
+    def stop(self):
+        """Stop polling"""
+        self.scheduler.unregister(self)
+
+    def on_deadline(self, now):
+        """Check the settings file (called by the scheduler)"""
+        if self.settings.reload_if_changed():
+            self.interval = WATCH_MIN_INTERVAL
+            try:
+                self.callback()
+            except Exception as e:
+                logger.error("Error in settings watcher callback: %s", e)
+        else:
+            self.interval = min(self.interval * 2, WATCH_MAX_INTERVAL)
+        return now + self.interval
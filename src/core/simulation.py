@@ -0,0 +1,138 @@
+"""Virtual-time simulation of key presser schedules"""
+import json
+import random
+import logging
+
+from core.clock import VirtualClock
+from core.input_backend import RecordingBackend
+from core.key_presser import KeyPresser
+from core.metrics import MetricsRegistry
+from core.scheduler import Scheduler
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Version of the exported event list format
+EXPORT_VERSION = 1
+
+
+class SimulationResult:
+    """Press timeline produced by a simulation run"""
+
+    def __init__(self, config, duration, events, statuses):
+        """
+        Initialize the result.
+
+        Args:
+            config: Dict describing the simulated profile and seed
+            duration: Simulated duration (in seconds)
+            events: List of (offset_seconds, key_name, is_down) tuples
+            statuses: List of (offset_seconds, message) status updates
+        """
+        self.config = config
+        self.duration = duration
+        self.events = events
+        self.statuses = statuses
+
+    def presses(self):
+        """
+        Get the key presses (down events) of the timeline.
+
+        Returns:
+            list: (offset_seconds, key_name) tuples in order
+        """
+        return [(offset, key) for offset, key, is_down in self.events if is_down]
+
+    def to_list(self):
+        """
+        Get the timeline as a compact event list.
+
+        Returns:
+            list: [offset_ms, key_name, 1 for down / 0 for up] entries
+        """
+        return [
+            [int(round(offset * 1000)), key, 1 if is_down else 0]
+            for offset, key, is_down in self.events
+        ]
+
+    def to_json(self):
+        """
+        Serialize the result for regression checks.
+
+        Returns:
+            str: JSON document with the config and compact event list
+        """
+        return json.dumps({
+            'version': EXPORT_VERSION,
+            'config': self.config,
+            'duration_seconds': self.duration,
+            'events': self.to_list()
+        }, separators=(',', ':'))
+
+    def export(self, path):
+        """
+        Write the result to a JSON file.
+
+        Args:
+            path: Destination file path
+        """
+        with open(path, 'w') as f:
+            f.write(self.to_json())
+
+
+def simulate(keys_config, min_interval_minutes, max_interval_minutes, days=30, seed=0):
+    """
+    Replay a KeyPresser schedule against virtual time.
+
+    The real KeyPresser session runs on an unthreaded Scheduler with a
+    VirtualClock and a RecordingBackend, so weeks of presses are produced
+    without waiting on any timers.
+
+    Args:
+        keys_config: List of dicts with 'key' and 'press_twice' settings
+        min_interval_minutes: Minimum interval between presses (in minutes)
+        max_interval_minutes: Maximum interval between presses (in minutes)
+        days: Simulated session length (in days)
+        seed: Seed for the interval random generator
+
+    Returns:
+        SimulationResult: Recorded press timeline
+    """
+    clock = VirtualClock()
+    scheduler = Scheduler(name="extended-afk-simulation", clock=clock, threaded=False)
+    backend = RecordingBackend(clock=clock.monotonic)
+    statuses = []
+
+    presser = KeyPresser(
+        keys_config=keys_config,
+        min_interval_minutes=min_interval_minutes,
+        max_interval_minutes=max_interval_minutes,
+        status_callback=lambda message: statuses.append((clock.monotonic(), message)),
+        scheduler=scheduler,
+        backend=backend,
+        rng=random.Random(seed),
+        metrics=MetricsRegistry()
+    )
+
+    duration = days * SECONDS_PER_DAY
+
+    # Keep per-press log records out of the way while replaying
+    presser_logger = logging.getLogger(KeyPresser.__module__)
+    previous_disabled = presser_logger.disabled
+    presser_logger.disabled = True
+    try:
+        presser.start()
+        scheduler.run_until(duration)
+        presser.stop()
+    finally:
+        presser_logger.disabled = previous_disabled
+
+    config = {
+        'keys_config': keys_config,
+        'min_interval_minutes': min_interval_minutes,
+        'max_interval_minutes': max_interval_minutes,
+        'days': days,
+        'seed': seed
+    }
+    return SimulationResult(config, duration, backend.events, statuses)
@@ -1,12 +1,15 @@
-"""Key detection dialog using pynput"""
+"""Key detection dialog fed by the shared keyboard hook"""
 import tkinter as tk
 from tkinter import ttk
-import threading
-from pynput import keyboard as pynput_keyboard
 import logging
 
+from core.input_hook import get_input_hook
+
 logger = logging.getLogger(__name__)
 
+# Milliseconds before the dialog gives up waiting for a key
+DETECTION_TIMEOUT_MS = 10000
+
 
 class KeySelectorDialog(tk.Toplevel):
     """Modal dialog for detecting keyboard key presses"""
@@ -19,6 +22,18 @@ class KeySelectorDialog(tk.Toplevel):
             parent: Parent tkinter window
         """
         super().__init__(parent)
+
+        # Subscribe first so a key pressed while the dialog is being built
+        # is not missed (the hook is normally running since startup, which
+        # makes start() a no-op)
+        self.subscription = get_input_hook().subscribe(notify=self._on_key_event)
+        self.hook_error = None
+        try:
+            get_input_hook().start()
+        except RuntimeError as e:
+            logger.error("Failed to start key listener: %s", e)
+            self.hook_error = e
+
         self.title("Select Key")
         self.geometry("350x200")
         self.resizable(False, False)
@@ -35,14 +50,16 @@ class KeySelectorDialog(tk.Toplevel):
 
         # Result
         self.selected_key = None
-        self.listener = None
         self.timeout_timer = None
 
         # Build UI
         self._build_ui()
 
-        # Start listening
-        self.after(100, self._start_listening)
+        if self.hook_error is not None:
+            self.status_label.config(text=f"Error: {self.hook_error}")
+        else:
+            self.timeout_timer = self.after(DETECTION_TIMEOUT_MS, self._on_timeout)
+            logger.debug("Key detection subscribed")
 
         # Handle window close
         self.protocol("WM_DELETE_WINDOW", self._on_cancel)
@@ -80,57 +97,28 @@ class KeySelectorDialog(tk.Toplevel):
         )
         self.cancel_button.pack()
 
-    def _start_listening(self):
-        """Start the pynput keyboard listener"""
-        try:
-            self.listener = pynput_keyboard.Listener(on_press=self._on_key_press)
-            self.listener.start()
-
-            # Set timeout (10 seconds)
-            self.timeout_timer = self.after(10000, self._on_timeout)
+    def _on_key_event(self):
+        """Wake the Tk thread for a new key event (called on the hook thread)"""
+        self.after(0, self._process_key_events)
 
-            logger.debug("Key detection listener started")
-        except Exception as e:
-            logger.error(f"Failed to start key listener: {e}")
-            self.status_label.config(text=f"Error: {e}")
-
-    def _on_key_press(self, key):
-        """
-        Handle key press event from pynput.
-
-        Args:
-            key: pynput key object
-        """
-        try:
-            # Convert pynput key to string
-            if hasattr(key, 'char') and key.char:
-                # Regular character key
-                key_name = key.char.lower()
-            elif hasattr(key, 'name'):
-                # Special key (f1, esc, ctrl, etc.)
-                key_name = key.name.lower()
-            else:
-                # Unknown key
-                key_name = str(key).lower()
+    def _process_key_events(self):
+        """Take the first key press from the subscription"""
+        if self.subscription is None:
+            return
+        for event in self.subscription.drain():
+            if event.kind != 'press':
+                continue
 
             # Check for ESC (cancel)
-            if key_name == 'esc':
-                self.after(0, self._on_cancel)
-                return False
-
-            # Set selected key
-            self.selected_key = key_name
-            logger.info(f"Key detected: {key_name}")
-
-            # Close dialog
-            self.after(0, self._on_accept)
+            if event.key == 'esc':
+                self._on_cancel()
+                return
 
-            # Stop listener
-            return False
-
-        except Exception as e:
-            logger.error(f"Error processing key press: {e}")
-            return False
+            # Set selected key and close dialog
+            self.selected_key = event.key
+            logger.info("Key detected: %s", event.key)
+            self._on_accept()
+            return
 
     def _on_accept(self):
         """Accept the selected key and close dialog"""
@@ -159,13 +147,10 @@ class KeySelectorDialog(tk.Toplevel):
                 pass
             self.timeout_timer = None
 
-        # Stop listener
-        if self.listener:
-            try:
-                self.listener.stop()
-            except:
-                pass
-            self.listener = None
+        # Stop receiving key events (the shared hook keeps running)
+        if self.subscription:
+            self.subscription.close()
+            self.subscription = None
 
     def get_selected_key(self):
         """
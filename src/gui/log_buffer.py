@@ -0,0 +1,226 @@
+"""Compact in-memory ring buffer of log lines"""
+from array import array
+
+# Default number of lines kept in memory
+DEFAULT_CAPACITY = 1_000_000
+
+# Default maximum size of the text arena (in bytes)
+DEFAULT_ARENA_SIZE = 64 * 1024 * 1024
+
+
+class LogRingBuffer:
+    """
+    Fixed-capacity history of log lines stored in a single bytes arena.
+
+    Each line is kept as UTF-8 bytes in a circular arena, indexed by parallel
+    arrays of offsets, lengths and levels, so a million lines cost a few
+    small arrays plus the text itself rather than a million Python strings.
+    When either the line capacity or the arena is full, the oldest lines are
+    evicted. Lines are addressed by index, 0 being the oldest retained line.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, arena_size=DEFAULT_ARENA_SIZE):
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity: Maximum number of lines retained
+            arena_size: Maximum bytes of text retained (the arena grows on
+                demand up to this size, then wraps around)
+        """
+        self.capacity = capacity
+        # Offsets are 32-bit, so the arena must stay below 4 GiB
+        self.arena_size = min(arena_size, 2 ** 32 - 1)
+        self._arena = bytearray()
+        self._offsets = array('I', bytes(array('I').itemsize * capacity))
+        self._lengths = array('I', bytes(array('I').itemsize * capacity))
+        self._levels = array('B', bytes(capacity))
+        self._head = 0   # Sequence number of the oldest retained line
+        self._tail = 0   # Sequence number of the next line to append
+        self._write_pos = 0
+
+    def __len__(self):
+        return self._tail - self._head
+
+    @property
+    def first_seq(self):
+        """Sequence number of the oldest retained line"""
+        return self._head
+
+    def append(self, text, level=0):
+        """
+        Append a line.
+
+        Args:
+            text: Line text (without trailing newline)
+            level: Logging level number of the line
+
+        Returns:
+            int: Sequence number of the appended line
+        """
+        data = text.encode('utf-8', 'replace')[:self.arena_size]
+        size = len(data)
+
+        # Wrap to the start of the arena when the line does not fit at the end
+        pos = self._write_pos
+        if pos + size > self.arena_size:
+            pos = 0
+
+        # Evict lines for capacity, and lines whose bytes will be overwritten
+        end = pos + size
+        while self._head < self._tail:
+            slot = self._head % self.capacity
+            if self._tail - self._head < self.capacity:
+                start = self._offsets[slot]
+                if size == 0 or start >= end or start + self._lengths[slot] <= pos:
+                    break
+            self._head += 1
+
+        if end > len(self._arena):
+            self._arena.extend(bytes(end - len(self._arena)))
+        self._arena[pos:end] = data
+
+        seq = self._tail
+        slot = seq % self.capacity
+        self._offsets[slot] = pos
+        self._lengths[slot] = size
+        self._levels[slot] = min(level, 255)
+        self._tail += 1
+        self._write_pos = end
+        return seq
+
+    def extend(self, entries):
+        """
+        Append several lines.
+
+        Args:
+            entries: Iterable of (level, text) pairs
+        """
+        for level, text in entries:
+            self.append(text, level)
+
+    def get(self, index):
+        """
+        Get a line by index.
+
+        Args:
+            index: 0 for the oldest retained line, len-1 for the newest
+
+        Returns:
+            str: Line text
+        """
+        return self._bytes(self._seq(index)).decode('utf-8', 'replace')
+
+    def level(self, index):
+        """
+        Get the level of a line by index.
+
+        Args:
+            index: Line index
+
+        Returns:
+            int: Logging level number
+        """
+        return self._levels[self._seq(index) % self.capacity]
+
+    def lines(self, start, stop):
+        """
+        Get a range of lines.
+
+        Args:
+            start: First index (inclusive)
+            stop: Last index (exclusive)
+
+        Returns:
+            list: Line texts
+        """
+        stop = min(stop, len(self))
+        return [self.get(index) for index in range(max(0, start), stop)]
+
+    def search(self, query, start, backward=True, min_level=0, limit=None):
+        """
+        Find the nearest line containing a substring (case-insensitive).
+
+        ASCII queries are matched on the stored bytes; other queries decode
+        each examined line, so case folding also works beyond ASCII.
+
+        Args:
+            query: Text to look for
+            start: Index to start from (inclusive); past the newest line
+                (forward) or before the oldest (backward) finds nothing
+            backward: Search towards older lines when True, newer when False
+            min_level: Ignore lines below this logging level
+            limit: Maximum number of lines to examine (None for no limit),
+                so long searches can be split across event loop ticks
+
+        Returns:
+            tuple: (match_index, resume_index) where match_index is the index
+                of the matching line or None, and resume_index is where to
+                continue an unfinished search or None once the search is done
+        """
+        needle = query.lower()
+        count = len(self)
+        if not needle or not count:
+            return None, None
+        # Nothing lies beyond either end (e.g. "next" from a match on the newest line)
+        if (backward and start < 0) or (not backward and start >= count):
+            return None, None
+        ascii_only = needle.isascii()
+        if ascii_only:
+            needle = needle.encode('ascii')
+
+        arena = self._arena
+        offsets = self._offsets
+        lengths = self._lengths
+        levels = self._levels
+        capacity = self.capacity
+        head = self._head
+        step = -1 if backward else 1
+        index = min(max(start, 0), count - 1)
+        remaining = count if limit is None else limit
+
+        while 0 <= index < count:
+            if remaining <= 0:
+                return None, index
+            slot = (head + index) % capacity
+            if levels[slot] >= min_level:
+                offset = offsets[slot]
+                line = arena[offset:offset + lengths[slot]]
+                if not ascii_only:
+                    line = line.decode('utf-8', 'replace')
+                if needle in line.lower():
+                    return index, None
+            index += step
+            remaining -= 1
+        return None, None
+
+    def filter_seqs(self, min_level):
+        """
+        Get the sequence numbers of retained lines at or above a level.
+
+        Sequence numbers stay valid as lines are appended (unlike indices,
+        which shift when old lines are evicted); convert them back with
+        seq - first_seq.
+
+        Args:
+            min_level: Minimum logging level
+
+        Returns:
+            array: Matching sequence numbers, oldest first
+        """
+        capacity = self.capacity
+        levels = self._levels
+        return array('Q', (
+            seq for seq in range(self._head, self._tail)
+            if levels[seq % capacity] >= min_level
+        ))
+
+    def _seq(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError("log line index out of range")
+        return self._head + index
+
+    def _bytes(self, seq):
+        slot = seq % self.capacity
+        offset = self._offsets[slot]
+        return bytes(self._arena[offset:offset + self._lengths[slot]])
@@ -0,0 +1,305 @@
+"""Virtualized activity log view backed by a ring buffer"""
+import bisect
+import logging
+import tkinter as tk
+from tkinter import ttk
+import tkinter.font as tkfont
+
+from gui.log_buffer import LogRingBuffer, DEFAULT_CAPACITY
+
+logger = logging.getLogger(__name__)
+
+# Level filter choices shown in the log toolbar
+LEVEL_FILTERS = [
+    ("All", 0),
+    ("Info", logging.INFO),
+    ("Warnings", logging.WARNING),
+    ("Errors", logging.ERROR),
+]
+
+# Lines examined per event loop tick while searching
+SEARCH_CHUNK_LINES = 50000
+
+
+class LogView(ttk.Frame):
+    """
+    Activity log that keeps its history in a LogRingBuffer.
+
+    The Text widget only ever holds the lines currently visible; scrolling
+    re-renders that window from the buffer, so history can reach a million
+    lines without slowing Tk down. Includes incremental search and a level
+    filter over the whole buffer.
+    """
+
+    def __init__(self, parent, capacity=DEFAULT_CAPACITY, height=10):
+        """
+        Initialize the log view.
+
+        Args:
+            parent: Parent widget
+            capacity: Number of lines kept in history
+            height: Initial number of visible lines
+        """
+        super().__init__(parent)
+        self.buffer = LogRingBuffer(capacity)
+        self.rows = height
+
+        # View position: follow the newest line, or stay on the line with
+        # sequence number _top_seq
+        self.follow = True
+        self._top_seq = 0
+
+        # Level filter: sorted sequence numbers of matching lines (None = all)
+        self.min_level = 0
+        self._filtered = None
+
+        # Search state
+        self._match_seq = None
+        self._search_job = None
+
+        self._build_ui(height)
+
+    def _build_ui(self, height):
+        """Build the toolbar, text and scrollbar widgets"""
+        toolbar = ttk.Frame(self)
+        toolbar.pack(fill=tk.X, padx=5, pady=(5, 0))
+
+        ttk.Label(toolbar, text="Find:").pack(side=tk.LEFT, padx=(0, 5))
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(toolbar, textvariable=self.search_var, width=24)
+        search_entry.pack(side=tk.LEFT)
+        search_entry.bind("<Return>", lambda e: self.find_next(backward=True))
+        search_entry.bind("<Shift-Return>", lambda e: self.find_next(backward=False))
+        self.search_var.trace_add('write', lambda *args: self._on_search_changed())
+
+        self.level_var = tk.StringVar(value=LEVEL_FILTERS[0][0])
+        level_box = ttk.Combobox(
+            toolbar,
+            textvariable=self.level_var,
+            values=[name for name, level in LEVEL_FILTERS],
+            state='readonly',
+            width=9
+        )
+        level_box.pack(side=tk.RIGHT)
+        level_box.bind("<<ComboboxSelected>>", lambda e: self._on_level_changed())
+
+        self.search_status = ttk.Label(toolbar, text="", font=("Segoe UI", 8))
+        self.search_status.pack(side=tk.LEFT, padx=5)
+
+        # Text widget with scrollbar
+        text_container = ttk.Frame(self)
+        text_container.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        self.scrollbar = ttk.Scrollbar(text_container, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.text = tk.Text(
+            text_container,
+            height=height,
+            width=60,
+            font=("Consolas", 9),
+            state='disabled',
+            wrap=tk.NONE
+        )
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.text.tag_configure('match', background="#c9a961", foreground="#000000")
+
+        self.text.bind("<Configure>", self._on_resize)
+        self.text.bind("<MouseWheel>", self._on_mousewheel)
+        self.text.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.text.bind("<Button-5>", lambda e: self._scroll_by(3))
+
+    def append(self, entries):
+        """
+        Append log lines and refresh the view.
+
+        Args:
+            entries: List of (level, text) pairs
+        """
+        buffer = self.buffer
+        filtered = self._filtered
+        min_level = self.min_level
+        for level, text in entries:
+            seq = buffer.append(text, level)
+            if filtered is not None and level >= min_level:
+                filtered.append(seq)
+        if filtered is not None:
+            # Forget lines the buffer has evicted, as the buffer does
+            stale = self._filtered_start()
+            if stale:
+                del filtered[:stale]
+        self._render()
+
+    def _count(self):
+        """Number of lines in the current (possibly filtered) view"""
+        if self._filtered is None:
+            return len(self.buffer)
+        return len(self._filtered) - self._filtered_start()
+
+    def _filtered_start(self):
+        """Position of the first filtered line that is still in the buffer"""
+        return bisect.bisect_left(self._filtered, self.buffer.first_seq)
+
+    def _seq_at(self, position):
+        """Sequence number of the line at a view position"""
+        if self._filtered is None:
+            return self.buffer.first_seq + position
+        return self._filtered[self._filtered_start() + position]
+
+    def _position_of(self, seq):
+        """View position of the line with a sequence number (or the next one)"""
+        if self._filtered is None:
+            return max(0, seq - self.buffer.first_seq)
+        return bisect.bisect_left(self._filtered, seq) - self._filtered_start()
+
+    def _top(self):
+        """View position of the first visible line"""
+        count = self._count()
+        last_top = max(0, count - self.rows)
+        if self.follow:
+            return last_top
+        return min(self._position_of(self._top_seq), last_top)
+
+    def _render(self):
+        """Show the visible window of lines in the Text widget"""
+        count = self._count()
+        top = self._top()
+        bottom = min(count, top + self.rows)
+
+        buffer = self.buffer
+        first_seq = buffer.first_seq
+        seqs = [self._seq_at(position) for position in range(top, bottom)]
+        lines = [buffer.get(seq - first_seq) for seq in seqs]
+
+        self.text.configure(state='normal')
+        self.text.delete('1.0', tk.END)
+        self.text.insert('1.0', '\n'.join(lines))
+        if self._match_seq in seqs:
+            row = seqs.index(self._match_seq) + 1
+            self.text.tag_add('match', f'{row}.0', f'{row}.end')
+        self.text.configure(state='disabled')
+
+        if count:
+            self.scrollbar.set(top / count, bottom / count)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _scroll_to(self, top):
+        """Move the view so that a view position is the first visible line"""
+        count = self._count()
+        top = max(0, min(top, count - self.rows))
+        self.follow = top >= count - self.rows
+        if count:
+            self._top_seq = self._seq_at(top)
+        self._render()
+
+    def _scroll_by(self, lines):
+        """Scroll the view by a number of lines"""
+        self._scroll_to(self._top() + lines)
+        return "break"
+
+    def yview(self, *args):
+        """Scrollbar command handler ('moveto' and 'scroll' requests)"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self._scroll_to(int(float(args[1]) * self._count()))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= self.rows
+            self._scroll_by(amount)
+
+    def _on_mousewheel(self, event):
+        """Scroll on Windows/macOS mouse wheel events"""
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_resize(self, event):
+        """Recompute the number of visible rows after a resize"""
+        linespace = tkfont.Font(font=self.text['font']).metrics('linespace')
+        rows = max(1, event.height // max(1, linespace))
+        if rows != self.rows:
+            self.rows = rows
+            self._render()
+
+    def _on_level_changed(self):
+        """Apply the level filter selected in the toolbar"""
+        levels = dict(LEVEL_FILTERS)
+        self.min_level = levels.get(self.level_var.get(), 0)
+        self._filtered = self.buffer.filter_seqs(self.min_level) if self.min_level else None
+        self.follow = True
+        self._render()
+
+    def _on_search_changed(self):
+        """Restart the search from the newest line as the query is typed"""
+        self._match_seq = None
+        self._start_search(len(self.buffer) - 1, backward=True)
+
+    def find_next(self, backward=True):
+        """
+        Continue the search from the current match.
+
+        Args:
+            backward: Search towards older lines when True, newer when False
+
+        Returns:
+            str: "break" to stop the default key binding
+        """
+        if self._match_seq is None:
+            start = len(self.buffer) - 1 if backward else 0
+        else:
+            start = self._match_seq - self.buffer.first_seq + (-1 if backward else 1)
+        self._start_search(start, backward)
+        return "break"
+
+    def _start_search(self, start, backward):
+        """Cancel any running search and start a new one"""
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+            self._search_job = None
+
+        if not self.search_var.get():
+            self.search_status.config(text="")
+            self._render()
+            return
+
+        self.search_status.config(text="Searching...")
+        self._search_step(self.buffer.first_seq + start, backward)
+
+    def _search_step(self, start_seq, backward):
+        """Search one chunk of lines, rescheduling itself until done"""
+        self._search_job = None
+        start = start_seq - self.buffer.first_seq
+        if start < 0:
+            if backward:
+                self._search_done(None)
+                return
+            start = 0
+
+        found, resume = self.buffer.search(
+            self.search_var.get(),
+            start,
+            backward=backward,
+            min_level=self.min_level,
+            limit=SEARCH_CHUNK_LINES
+        )
+
+        if found is not None:
+            self._search_done(self.buffer.first_seq + found)
+        elif resume is not None:
+            resume_seq = self.buffer.first_seq + resume
+            self._search_job = self.after(1, self._search_step, resume_seq, backward)
+        else:
+            self._search_done(None)
+
+    def _search_done(self, seq):
+        """Show the result of a finished search"""
+        if seq is None:
+            self.search_status.config(text="No matches")
+            self._render()
+            return
+
+        self.search_status.config(text="")
+        self._match_seq = seq
+        # Centre the match in the view
+        self._scroll_to(self._position_of(seq) - self.rows // 2)
@@ -3,19 +3,45 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import ttkbootstrap as ttk_bootstrap
 from ttkbootstrap.constants import *
-import webbrowser
 import logging
-from PIL import Image, ImageTk
 import os
 
-from core.settings import AppSettings
+from core.settings import AppSettings, SettingsWatcher, DEFAULT_LOG_HISTORY_LINES, INTERVAL_UNITS
 from core.key_presser import KeyPresser
+from core.input_backend import get_backend, DEFAULT_BACKEND
+from core.metrics import REGISTRY, MetricsWriter
+from core.journal import SessionJournal
+from core.profiles import ProfileStore, Profile
+from core.input_hook import get_input_hook
+from core.scheduler import get_scheduler
+from core.macro import parse_macro, MACRO_HELP
 from utils.resource_path import get_resource_path
+from utils.assets import get_scaled_image, FOOTER_IMAGE_HEIGHT
+from utils.log_setup import add_handler, remove_handler
+from utils.startup_profiler import PROFILER
+from utils.deferred_import import deferred
 from gui.key_selector import select_key
 from gui.text_handler import TextHandler, SimpleFormatter
+from gui.log_view import LogView
 
 logger = logging.getLogger(__name__)
 
+# Imported after the window is shown (see WARM_UP_MODULES)
+webbrowser = deferred('webbrowser')
+
+# Modules warmed up in the background once the window is interactive,
+# in the order they are likely to be needed: Start (keyboard backend),
+# the key dialog (pynput) and the footer links
+WARM_UP_MODULES = ['keyboard', 'pynput.keyboard', 'webbrowser']
+
+# Interval field arrow range and step per unit: (from, to, increment).
+# Both cover the same span (a millisecond up to 60 hours); typed values
+# below the arrow range are still accepted
+INTERVAL_FIELD_RANGES = {
+    'minutes': (0.1, 3600, 1),
+    'seconds': (0.001, 216000, 0.5),
+}
+
 # Colors matching sc-profile-editor
 BG_COLOR = "#f0f0f0"
 FRAME_BG = "#ffffff"
@@ -24,6 +50,9 @@ TEXT_COLOR = "#333333"
 BUTTON_START_COLOR = "#4CAF50"
 BUTTON_STOP_COLOR = "#f44336"
 
+# Milliseconds between refreshes of the statistics panel while pressing
+STATS_REFRESH_MS = 1000
+
 
 class MainWindow:
     """Main application window"""
@@ -37,7 +66,7 @@ class MainWindow:
         """
         self.root = root
         self.root.title("Extended AFK - Auto Key Presser")
-        self.root.geometry("550x720")
+        self.root.geometry("550x850")
         self.root.resizable(False, False)
 
         # Set window icon (for taskbar and title bar)
@@ -48,23 +77,41 @@ class MainWindow:
         except Exception as e:
             logger.warning(f"Failed to set window icon: {e}")
 
-        # Settings manager
-        self.settings = AppSettings()
+        # Settings manager and profile store
+        with PROFILER.phase("load settings"):
+            self.settings = AppSettings()
+            self.profiles = ProfileStore()
 
         # Key presser (will be initialized when started)
         self.key_presser = None
+        self._stats_job = None
 
         # Key list widgets (for dynamic key management)
         self.key_frames = []
 
         # Build UI
-        self._build_ui()
+        with PROFILER.phase("build UI"):
+            self._build_ui()
 
         # Set up logging handler for GUI
         self._setup_logging()
 
-        # Load initial settings
-        self._load_settings()
+        # Load initial settings and watch for external edits
+        with PROFILER.phase("apply settings"):
+            self._load_settings()
+        self.settings_watcher = SettingsWatcher(
+            self.settings,
+            lambda: self.root.after(0, self._on_settings_reloaded)
+        ).start()
+
+        # Periodic metrics snapshots and the statistics panel
+        with PROFILER.phase("start metrics and journal"):
+            self.metrics_writer = MetricsWriter().start()
+            self.journal = self._open_journal()
+            self._refresh_stats()
+
+        # Optional local control API
+        self.control_server = self._start_control_server()
 
         # Handle window close
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
@@ -81,11 +128,15 @@ class MainWindow:
         # Start/Stop button
         self._build_control_button(main_container)
 
+        # Runtime statistics
+        self._build_stats_section(main_container)
+
         # Activity log section
         self._build_log_section(main_container)
 
         # Footer with branding
-        self._build_footer(main_container)
+        with PROFILER.phase("build footer"):
+            self._build_footer(main_container)
 
     def _build_configuration_section(self, parent):
         """Build the configuration section"""
@@ -97,6 +148,38 @@ class MainWindow:
         )
         config_frame.pack(fill=tk.BOTH, padx=5, pady=5)
 
+        # Profile selector (names are loaded when the list is opened)
+        profile_frame = ttk.Frame(config_frame)
+        profile_frame.pack(fill=tk.X, pady=(0, 10))
+
+        ttk.Label(
+            profile_frame,
+            text="Profile:",
+            font=("Segoe UI", 10, "bold")
+        ).pack(side=tk.LEFT, padx=(0, 5))
+
+        self.profile_var = tk.StringVar()
+        self.profile_box = ttk.Combobox(
+            profile_frame,
+            textvariable=self.profile_var,
+            postcommand=self._load_profile_names,
+            width=24
+        )
+        self.profile_box.pack(side=tk.LEFT, padx=(0, 10))
+        self.profile_box.bind("<<ComboboxSelected>>", lambda e: self._switch_profile(self.profile_var.get()))
+
+        ttk.Button(
+            profile_frame,
+            text="Delete",
+            command=self._delete_profile
+        ).pack(side=tk.RIGHT)
+
+        ttk.Button(
+            profile_frame,
+            text="Save",
+            command=self._save_profile
+        ).pack(side=tk.RIGHT, padx=(0, 5))
+
         # Keys section
         keys_label = ttk.Label(
             config_frame,
@@ -120,10 +203,24 @@ class MainWindow:
         )
         self.add_key_button.pack(side=tk.RIGHT)
 
-        # Interval section
+        # Macro section (replaces the keys when set)
+        macro_label = ttk.Label(
+            config_frame,
+            text="Macro (optional, replaces the keys):",
+            font=("Segoe UI", 10, "bold")
+        )
+        macro_label.pack(anchor=tk.W, pady=(0, 5))
+
+        self.macro_var = tk.StringVar()
+        macro_entry = ttk.Entry(config_frame, textvariable=self.macro_var)
+        macro_entry.pack(fill=tk.X, pady=(0, 15))
+        macro_entry.bind("<Return>", lambda e: self._on_macro_changed())
+        macro_entry.bind("<FocusOut>", lambda e: self._on_macro_changed())
+
+        # Interval section (fractions allowed, down to a millisecond)
         interval_label = ttk.Label(
             config_frame,
-            text="Interval (minutes):",
+            text="Interval:",
             font=("Segoe UI", 10, "bold")
         )
         interval_label.pack(anchor=tk.W, pady=(0, 5))
@@ -133,29 +230,43 @@ class MainWindow:
 
         # Min interval
         ttk.Label(interval_frame, text="Min:").pack(side=tk.LEFT, padx=(0, 5))
-        self.min_interval_var = tk.IntVar(value=10)
-        min_spinbox = ttk.Spinbox(
+        self.min_interval_var = tk.DoubleVar(value=10)
+        self.min_spinbox = ttk.Spinbox(
             interval_frame,
-            from_=1,
-            to=60,
             textvariable=self.min_interval_var,
-            width=5,
+            width=7,
             command=self._on_settings_changed
         )
-        min_spinbox.pack(side=tk.LEFT, padx=(0, 20))
+        self.min_spinbox.pack(side=tk.LEFT, padx=(0, 20))
 
         # Max interval
         ttk.Label(interval_frame, text="Max:").pack(side=tk.LEFT, padx=(0, 5))
-        self.max_interval_var = tk.IntVar(value=14)
-        max_spinbox = ttk.Spinbox(
+        self.max_interval_var = tk.DoubleVar(value=14)
+        self.max_spinbox = ttk.Spinbox(
             interval_frame,
-            from_=1,
-            to=60,
             textvariable=self.max_interval_var,
-            width=5,
+            width=7,
             command=self._on_settings_changed
         )
-        max_spinbox.pack(side=tk.LEFT)
+        self.max_spinbox.pack(side=tk.LEFT, padx=(0, 20))
+
+        # Typed values are applied when leaving the field
+        for spinbox in (self.min_spinbox, self.max_spinbox):
+            spinbox.bind("<Return>", lambda e: self._on_settings_changed())
+            spinbox.bind("<FocusOut>", lambda e: self._on_settings_changed())
+
+        # Unit of both fields
+        self.interval_unit_var = tk.StringVar(value='minutes')
+        unit_box = ttk.Combobox(
+            interval_frame,
+            textvariable=self.interval_unit_var,
+            values=INTERVAL_UNITS,
+            state='readonly',
+            width=8
+        )
+        unit_box.pack(side=tk.LEFT)
+        unit_box.bind("<<ComboboxSelected>>", lambda e: self._on_interval_unit_changed())
+        self._apply_interval_unit_range()
 
     def _build_control_button(self, parent):
         """Build the start/stop control buttons"""
@@ -193,6 +304,67 @@ class MainWindow:
         )
         self.stop_button.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(5, 0))
 
+    def _build_stats_section(self, parent):
+        """Build the runtime statistics panel"""
+        stats_frame = ttk.LabelFrame(
+            parent,
+            text=" Statistics ",
+            padding=5
+        )
+        stats_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        # One caption/value pair per column
+        self.stats_vars = {}
+        columns = [
+            ('presses', "Presses"),
+            ('press_failures', "Failures"),
+            ('press_duration', "Press time"),
+            ('deadline_slip', "Slip (p99)"),
+        ]
+        for column, (name, caption) in enumerate(columns):
+            stats_frame.columnconfigure(column, weight=1)
+            ttk.Label(stats_frame, text=caption, font=("Segoe UI", 8)).grid(row=0, column=column)
+            var = tk.StringVar(value="-")
+            ttk.Label(stats_frame, textvariable=var, font=("Segoe UI", 10, "bold")).grid(row=1, column=column)
+            self.stats_vars[name] = var
+
+    def _refresh_stats(self):
+        """Update the statistics panel, and keep updating it while a session runs"""
+        def format_ms(seconds):
+            if seconds is None:
+                return "-"
+            if seconds < 0.001:
+                return f"{seconds * 1e6:.0f} \u00b5s"
+            return f"{seconds * 1000:.1f} ms"
+
+        try:
+            presses = REGISTRY.get('presses')
+            failures = REGISTRY.get('press_failures')
+            press_duration = REGISTRY.get('press_duration_seconds')
+            deadline_slip = REGISTRY.get('deadline_slip_seconds')
+
+            # Metrics are registered by the first KeyPresser created
+            if presses is not None:
+                self.stats_vars['presses'].set(str(presses.value))
+                self.stats_vars['press_failures'].set(str(failures.value))
+                self.stats_vars['press_duration'].set(format_ms(press_duration.mean()))
+                self.stats_vars['deadline_slip'].set(format_ms(deadline_slip.quantile(0.99)))
+        except Exception as e:
+            logger.error(f"Failed to refresh statistics: {e}")
+
+        # Metrics only change while pressing, so the panel polls only then
+        # (an idle window has no periodic wake-ups)
+        if self._stats_job is not None:
+            self.root.after_cancel(self._stats_job)
+            self._stats_job = None
+        if self.key_presser and self.key_presser.is_running():
+            self._stats_job = self.root.after(STATS_REFRESH_MS, self._on_stats_timer)
+
+    def _on_stats_timer(self):
+        """Scheduled statistics refresh"""
+        self._stats_job = None
+        self._refresh_stats()
+
     def _build_log_section(self, parent):
         """Build the activity log section"""
         # Log frame
@@ -203,24 +375,13 @@ class MainWindow:
         )
         log_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        # Text widget with scrollbar
-        text_container = ttk.Frame(log_frame)
-        text_container.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-
-        scrollbar = ttk.Scrollbar(text_container)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        self.log_text = tk.Text(
-            text_container,
-            height=10,
-            width=60,
-            yscrollcommand=scrollbar.set,
-            font=("Consolas", 9),
-            state='disabled',
-            wrap=tk.WORD
+        # Virtualized log view (history kept in a ring buffer)
+        self.log_view = LogView(
+            log_frame,
+            capacity=self.settings.get('log_history_lines', DEFAULT_LOG_HISTORY_LINES),
+            height=10
         )
-        self.log_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.log_text.yview)
+        self.log_view.pack(fill=tk.BOTH, expand=True)
 
     def _build_footer(self, parent):
         """Build the footer with branding and donation links"""
@@ -229,7 +390,9 @@ class MainWindow:
         footer_frame.pack(fill=tk.X, padx=5, pady=(10, 0))
 
         # Osiris DevWorks button (left)
-        self._create_osiris_button(footer_frame)
+        self._create_image_button(
+            footer_frame, "osiris-devworks.png", "Osiris DevWorks", "#1a1f2e", ACCENT_COLOR, self._open_discord
+        )
 
         # Spacer
         ttk.Frame(footer_frame, width=10).pack(side=tk.LEFT)
@@ -243,121 +406,43 @@ class MainWindow:
         support_label.pack(side=tk.LEFT, padx=(10, 5))
 
         # PayPal button
-        self._create_paypal_button(footer_frame)
+        self._create_image_button(footer_frame, "paypal.png", "PayPal", "#0070ba", "white", self._open_paypal)
 
         # Spacer
         ttk.Frame(footer_frame, width=5).pack(side=tk.LEFT)
 
         # Venmo button
-        self._create_venmo_button(footer_frame)
+        self._create_image_button(footer_frame, "venmo.png", "Venmo", "#008CFF", "white", self._open_venmo)
 
-    def _create_osiris_button(self, parent):
-        """Create Osiris DevWorks button"""
-        try:
-            # Try to load image
-            image_path = get_resource_path(os.path.join("assets", "osiris-devworks.png"))
-            if os.path.exists(image_path):
-                img = Image.open(image_path)
-                # Scale to height 40
-                ratio = 40 / img.height
-                new_width = int(img.width * ratio)
-                img = img.resize((new_width, 40), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
+    def _create_image_button(self, parent, image_name, text, bg, fg, command):
+        """
+        Create a clickable image from a pre-scaled asset.
 
-                label = tk.Label(parent, image=photo, cursor="hand2")
-                label.image = photo  # Keep reference
-                label.pack(side=tk.LEFT)
-                label.bind("<Button-1>", lambda e: self._open_discord())
-            else:
-                # Fallback to text
-                self._create_text_button(
-                    parent,
-                    "Osiris DevWorks",
-                    "#1a1f2e",
-                    ACCENT_COLOR,
-                    self._open_discord
-                )
-        except Exception as e:
-            logger.error(f"Failed to load Osiris image: {e}")
-            self._create_text_button(
-                parent,
-                "Osiris DevWorks",
-                "#1a1f2e",
-                ACCENT_COLOR,
-                self._open_discord
-            )
+        Falls back to a text button if the image is unavailable.
 
-    def _create_paypal_button(self, parent):
-        """Create PayPal donation button"""
+        Args:
+            parent: Parent widget
+            image_name: Image file name in the assets directory
+            text: Fallback button text
+            bg: Fallback background color
+            fg: Fallback text color
+            command: Callback run on click
+        """
         try:
-            # Try to load image
-            image_path = get_resource_path(os.path.join("assets", "paypal.png"))
-            if os.path.exists(image_path):
-                img = Image.open(image_path)
-                # Scale to height 40
-                ratio = 40 / img.height
-                new_width = int(img.width * ratio)
-                img = img.resize((new_width, 40), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
+            image_path = get_scaled_image(image_name, FOOTER_IMAGE_HEIGHT)
+            if image_path:
+                photo = tk.PhotoImage(master=parent, file=image_path)
 
                 label = tk.Label(parent, image=photo, cursor="hand2")
                 label.image = photo  # Keep reference
                 label.pack(side=tk.LEFT)
-                label.bind("<Button-1>", lambda e: self._open_paypal())
-            else:
-                # Fallback to text
-                self._create_text_button(
-                    parent,
-                    "PayPal",
-                    "#0070ba",
-                    "white",
-                    self._open_paypal
-                )
+                label.bind("<Button-1>", lambda e: command())
+                return
         except Exception as e:
-            logger.error(f"Failed to load PayPal image: {e}")
-            self._create_text_button(
-                parent,
-                "PayPal",
-                "#0070ba",
-                "white",
-                self._open_paypal
-            )
+            logger.error("Failed to load %s: %s", image_name, e)
 
-    def _create_venmo_button(self, parent):
-        """Create Venmo donation button"""
-        try:
-            # Try to load image
-            image_path = get_resource_path(os.path.join("assets", "venmo.png"))
-            if os.path.exists(image_path):
-                img = Image.open(image_path)
-                # Scale to height 40
-                ratio = 40 / img.height
-                new_width = int(img.width * ratio)
-                img = img.resize((new_width, 40), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
-
-                label = tk.Label(parent, image=photo, cursor="hand2")
-                label.image = photo  # Keep reference
-                label.pack(side=tk.LEFT)
-                label.bind("<Button-1>", lambda e: self._open_venmo())
-            else:
-                # Fallback to text
-                self._create_text_button(
-                    parent,
-                    "Venmo",
-                    "#008CFF",
-                    "white",
-                    self._open_venmo
-                )
-        except Exception as e:
-            logger.error(f"Failed to load Venmo image: {e}")
-            self._create_text_button(
-                parent,
-                "Venmo",
-                "#008CFF",
-                "white",
-                self._open_venmo
-            )
+        # Fallback to text
+        self._create_text_button(parent, text, bg, fg, command)
 
     def _create_text_button(self, parent, text, bg, fg, command):
         """Create a styled text button"""
@@ -379,23 +464,51 @@ class MainWindow:
     def _setup_logging(self):
         """Set up logging to the GUI text widget"""
         # Create handler
-        handler = TextHandler(self.log_text)
-        handler.setLevel(logging.INFO)
-        handler.setFormatter(SimpleFormatter())
+        self.log_handler = TextHandler(self.log_view)
+        self.log_handler.setLevel(logging.INFO)
+        self.log_handler.setFormatter(SimpleFormatter())
 
-        # Add to root logger
-        logging.getLogger().addHandler(handler)
+        # Add behind the logging queue
+        add_handler(self.log_handler)
+
+    def _open_journal(self):
+        """
+        Open the press journal.
+
+        Returns:
+            SessionJournal or None: Journal, or None if it could not be opened
+        """
+        try:
+            return SessionJournal()
+        except Exception as e:
+            logger.error("Failed to open press journal: %s", e)
+            return None
+
+    def start_input_hook(self):
+        """Install the shared keyboard hook used by the key selector (called off the Tk thread)"""
+        try:
+            get_input_hook().start()
+        except RuntimeError as e:
+            logger.warning("Key detection unavailable: %s", e)
+
+    def _start_control_server(self):
+        """Start the control server if a control_address is configured"""
+        address = self.settings.get('control_address')
+        if not address:
+            return None
+        try:
+            # Imported only when enabled (asyncio is a noticeable import)
+            from core.control_server import ControlServer
+            from gui.window_controller import WindowController
+            return ControlServer(WindowController(self), address).start()
+        except (ValueError, OSError) as e:
+            logger.error("Failed to start control server on %s: %s", address, e)
+            return None
 
     def _load_settings(self):
         """Load settings and update UI"""
         # Load keys configuration (maximum of 3)
-        keys_config = self.settings.get('keys_config', [])
-
-        # Handle backward compatibility with old 'keys' format
-        if not keys_config:
-            old_keys = self.settings.get('keys', [])
-            old_press_twice = self.settings.get('press_twice', False)
-            keys_config = [{'key': k, 'press_twice': old_press_twice} for k in old_keys]
+        keys_config = self.settings.get_keys_config()
 
         # Limit to first 3 keys
         keys_config = keys_config[:3]
@@ -409,9 +522,131 @@ class MainWindow:
         if len(self.key_frames) >= 3:
             self.add_key_button.config(state='disabled')
 
-        # Load intervals
-        self.min_interval_var.set(self.settings.get('min_interval_minutes', 10))
-        self.max_interval_var.set(self.settings.get('max_interval_minutes', 14))
+        # Load macro and intervals
+        self.macro_var.set(self.settings.get('macro', ''))
+        self.interval_unit_var.set(self.settings.get('interval_unit', 'minutes'))
+        self._show_intervals(
+            self.settings.get('min_interval_minutes', 10),
+            self.settings.get('max_interval_minutes', 14)
+        )
+        get_scheduler().timer.set_spin_budget(self.settings.get('timer_spin_ms') / 1000)
+
+        # Show the active profile (only its name is read from the store)
+        self.profile_var.set(self.profiles.active_name() or "")
+
+    def _get_intervals(self):
+        """
+        Read the interval fields.
+
+        Returns:
+            tuple or None: (min, max) interval in minutes, or None if a field
+                does not hold a positive number
+        """
+        scale = 1 / 60 if self.interval_unit_var.get() == 'seconds' else 1
+        try:
+            min_int = self.min_interval_var.get() * scale
+            max_int = self.max_interval_var.get() * scale
+        except tk.TclError:
+            return None
+        if min_int <= 0 or max_int <= 0:
+            return None
+        return min_int, max_int
+
+    def _apply_interval_unit_range(self):
+        """Set the interval fields' arrow range and step for the selected unit"""
+        from_, to, increment = INTERVAL_FIELD_RANGES.get(
+            self.interval_unit_var.get(), INTERVAL_FIELD_RANGES['minutes'])
+        for spinbox in (self.min_spinbox, self.max_spinbox):
+            spinbox.config(from_=from_, to=to, increment=increment)
+
+    def _show_intervals(self, min_interval_minutes, max_interval_minutes):
+        """
+        Show intervals in the interval fields, in the selected unit.
+
+        Args:
+            min_interval_minutes: Minimum interval (in minutes)
+            max_interval_minutes: Maximum interval (in minutes)
+        """
+        self._apply_interval_unit_range()
+        scale = 60 if self.interval_unit_var.get() == 'seconds' else 1
+        # Rounded to about a millisecond so converted values show without float noise
+        digits = 3 if scale == 60 else 5
+        self.min_interval_var.set(f"{round(min_interval_minutes * scale, digits):g}")
+        self.max_interval_var.set(f"{round(max_interval_minutes * scale, digits):g}")
+
+    def _on_interval_unit_changed(self):
+        """Show the intervals in the newly selected unit"""
+        self.settings.set('interval_unit', self.interval_unit_var.get())
+        self._show_intervals(
+            self.settings.get('min_interval_minutes', 10),
+            self.settings.get('max_interval_minutes', 14)
+        )
+
+    def _load_profile_names(self):
+        """Fill the profile list, most recently used first"""
+        self.profile_box.config(values=self.profiles.names())
+
+    def _switch_profile(self, name):
+        """
+        Make a profile active and apply it (also to a running session).
+
+        Args:
+            name: Profile name
+
+        Returns:
+            bool: True if the profile was applied
+        """
+        try:
+            profile = self.profiles.activate(name)
+        except KeyError:
+            messagebox.showwarning("Unknown Profile", f"There is no profile named '{name}'.")
+            return False
+
+        with self.settings.batch():
+            self.settings.set('keys_config', profile.keys_config)
+            self.settings.set('macro', profile.macro)
+            self.settings.set('min_interval_minutes', profile.min_interval_minutes)
+            self.settings.set('max_interval_minutes', profile.max_interval_minutes)
+
+        self._on_settings_reloaded()
+        logger.info("Switched to profile: %s", profile.name)
+        return True
+
+    def _save_profile(self):
+        """Save the current configuration as the profile named in the selector"""
+        keys_config = [
+            {'key': k, 'press_twice': v.get()}
+            for f, k, v in self.key_frames
+        ]
+        intervals = self._get_intervals()
+        if intervals is None:
+            messagebox.showwarning("Invalid Interval", "Intervals must be positive numbers.")
+            return
+        try:
+            existing = self.profiles.get(self.profile_var.get().strip())
+            profile = Profile(
+                self.profile_var.get(),
+                keys_config,
+                *intervals,
+                tags=existing.tags if existing else (),
+                macro=self.settings.get('macro', '')
+            )
+        except ValueError as e:
+            messagebox.showwarning("Invalid Profile", str(e))
+            return
+
+        self.profiles.save(profile)
+        self.profiles.activate(profile.name)
+        self.profile_var.set(profile.name)
+
+    def _delete_profile(self):
+        """Delete the profile named in the selector"""
+        name = self.profile_var.get().strip()
+        if not name or self.profiles.get(name) is None:
+            return
+        if messagebox.askyesno("Delete Profile", f"Delete the profile '{name}'?"):
+            self.profiles.delete(name)
+            self.profile_var.set("")
 
     def _add_key(self):
         """Add a new key via detection dialog"""
@@ -547,21 +782,101 @@ class MainWindow:
             for f, k, v in self.key_frames
         ]
 
-        # Update settings
-        self.settings.set('keys_config', keys_config)
-        self.settings.set('min_interval_minutes', self.min_interval_var.get())
-        self.settings.set('max_interval_minutes', self.max_interval_var.get())
+        # Update settings (written once, in the background); invalid
+        # intervals are kept out until corrected
+        intervals = self._get_intervals()
+        with self.settings.batch():
+            self.settings.set('keys_config', keys_config)
+            if intervals is not None:
+                self.settings.set('min_interval_minutes', intervals[0])
+                self.settings.set('max_interval_minutes', intervals[1])
+
+        self._update_running_config(keys_config)
+
+    def _on_macro_changed(self):
+        """Validate and apply the macro entered in the macro field"""
+        macro = self.macro_var.get().strip()
+        if macro == self.settings.get('macro', ''):
+            return
+        if macro:
+            try:
+                parse_macro(macro)
+            except ValueError as e:
+                messagebox.showwarning("Invalid Macro", f"{e}\n\n{MACRO_HELP}")
+                return
+
+        self.settings.set('macro', macro)
+        self._update_running_config([
+            {'key': k, 'press_twice': v.get()}
+            for f, k, v in self.key_frames
+        ])
+
+    def _on_settings_reloaded(self):
+        """Show the current settings (after an external edit or a profile switch) and apply them"""
+        for key_frame, key_name, press_twice_var in self.key_frames:
+            key_frame.destroy()
+        self.key_frames = []
+        self.add_key_button.config(state='normal')
+
+        self._load_settings()
+        self._update_running_config([
+            {'key': k, 'press_twice': v.get()}
+            for f, k, v in self.key_frames
+        ])
+
+    def apply_config(self, keys_config, min_interval_minutes, max_interval_minutes, macro=None):
+        """
+        Show and apply a configuration from outside the window (the control API).
+
+        Args:
+            keys_config: List of dicts with 'key' and 'press_twice' settings
+            min_interval_minutes: Minimum interval between presses (in minutes)
+            max_interval_minutes: Maximum interval between presses (in minutes)
+            macro: Optional macro definition pressed instead of the keys
+        """
+        with self.settings.batch():
+            self.settings.set('keys_config', keys_config)
+            self.settings.set('macro', macro or '')
+            self.settings.set('min_interval_minutes', min_interval_minutes)
+            self.settings.set('max_interval_minutes', max_interval_minutes)
+        self._on_settings_reloaded()
+
+    def _update_running_config(self, keys_config):
+        """
+        Push a configuration into the running key presser, if any.
+
+        Args:
+            keys_config: List of dicts with 'key' and 'press_twice' settings
+        """
+        if not (self.key_presser and self.key_presser.is_running()):
+            return
+
+        intervals = self._get_intervals()
+        macro = self.settings.get('macro') or None
+        if not (keys_config or macro) or intervals is None or intervals[0] > intervals[1]:
+            logger.warning("Invalid configuration, keeping the previous settings for the running session")
+            return
+        min_int, max_int = intervals
+
+        try:
+            self.key_presser.update_config(keys_config, min_int, max_int, macro=macro)
+        except ValueError as e:
+            logger.error("Failed to update key pressing: %s", e)
 
     def _start_pressing(self):
         """Start key pressing"""
         # Validate settings
-        if not self.key_frames:
-            messagebox.showwarning("No Keys", "Please add at least one key to press.")
+        macro = self.settings.get('macro') or None
+        if not self.key_frames and not macro:
+            messagebox.showwarning("No Keys", "Please add at least one key to press or enter a macro.")
             return
 
-        min_int = self.min_interval_var.get()
-        max_int = self.max_interval_var.get()
+        intervals = self._get_intervals()
+        if intervals is None:
+            messagebox.showwarning("Invalid Interval", "Intervals must be positive numbers.")
+            return
 
+        min_int, max_int = intervals
         if min_int > max_int:
             messagebox.showwarning(
                 "Invalid Interval",
@@ -584,66 +899,48 @@ class MainWindow:
         try:
             def start_thread():
                 try:
+                    backend = get_backend(self.settings.get('input_backend', DEFAULT_BACKEND))
                     self.key_presser = KeyPresser(
                         keys_config=keys_config,
                         min_interval_minutes=min_int,
                         max_interval_minutes=max_int,
-                        status_callback=self._on_key_presser_status
+                        status_callback=self._on_key_presser_status,
+                        backend=backend,
+                        journal=self.journal,
+                        macro=macro
                     )
                     self.key_presser.start()
                     logger.info("Key presser started successfully")
+                    self.root.after(0, self._refresh_stats)
                 except Exception as e:
                     logger.error(f"Failed to start key pressing: {e}", exc_info=True)
                     self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to start key pressing:\n{e}"))
                     # Reset buttons on error
                     self.root.after(0, lambda: self.start_button.config(state='normal'))
                     self.root.after(0, lambda: self.stop_button.config(state='disabled'))
-                    self.root.after(0, self._set_config_enabled, True)
 
             import threading
             setup_thread = threading.Thread(target=start_thread, daemon=True)
             setup_thread.start()
 
-            # Disable configuration
-            self._set_config_enabled(False)
-
         except Exception as e:
             logger.error(f"Failed to start key pressing: {e}", exc_info=True)
             messagebox.showerror("Error", f"Failed to start key pressing:\n{e}")
             # Reset button states
             self.start_button.config(state='normal')
             self.stop_button.config(state='disabled')
-            self._set_config_enabled(True)
 
     def _stop_pressing(self):
         """Stop key pressing"""
         if self.key_presser:
             self.key_presser.stop()
+        # Show the final values (stops the periodic refresh)
+        self._refresh_stats()
 
         # Update buttons
         self.start_button.config(state='normal')
         self.stop_button.config(state='disabled')
 
-        # Enable configuration
-        self._set_config_enabled(True)
-
-    def _set_config_enabled(self, enabled):
-        """
-        Enable or disable configuration controls.
-
-        Args:
-            enabled: True to enable, False to disable
-        """
-        state = 'normal' if enabled else 'disabled'
-
-        # Disable add key button and key widgets
-        self.add_key_button.config(state=state)
-
-        for key_frame, key_name, press_twice_var in self.key_frames:
-            for widget in key_frame.winfo_children():
-                if isinstance(widget, tk.Button) or isinstance(widget, ttk.Button):
-                    widget.config(state=state)
-
     def _on_key_presser_status(self, message):
         """
         Handle status message from key presser.
@@ -654,6 +951,36 @@ class MainWindow:
         # Message is already logged by the key presser, just display in UI
         pass
 
+    def handle_instance_message(self, message):
+        """
+        Apply the actions of another launch (called from the instance server thread).
+
+        Args:
+            message: Request from utils.single_instance.make_message()
+        """
+        try:
+            self.root.after(0, self._apply_actions, message['actions'], message.get('profile'))
+        except (RuntimeError, tk.TclError):
+            # The window is already closing
+            pass
+
+    def _apply_actions(self, actions, profile):
+        """Show the window, switch profile, start or stop as requested"""
+        for action in actions:
+            if action == 'show':
+                self.root.deiconify()
+                self.root.lift()
+                self.root.focus_force()
+            elif action == 'switch_profile':
+                if not self._switch_profile(profile):
+                    return
+            elif action == 'start':
+                if str(self.start_button['state']) != 'disabled':
+                    self._start_pressing()
+            elif action == 'stop':
+                if str(self.stop_button['state']) != 'disabled':
+                    self._stop_pressing()
+
     def _open_discord(self):
         """Open Osiris DevWorks Discord"""
         webbrowser.open("https://discord.gg/BNzRegKZ7k")
@@ -672,5 +999,25 @@ class MainWindow:
         if self.key_presser and self.key_presser.is_running():
             self.key_presser.stop()
 
+        # Stop accepting control requests
+        if self.control_server:
+            self.control_server.stop()
+
+        # Remove the keyboard hook
+        get_input_hook().stop()
+
+        # Write pending settings changes and a final metrics snapshot
+        self.settings_watcher.stop()
+        self.settings.flush()
+        self.metrics_writer.stop()
+
+        # Close the press journal and the profile store
+        if self.journal:
+            self.journal.close()
+        self.profiles.close()
+
+        # Stop logging to the window before it is destroyed
+        remove_handler(self.log_handler)
+
         # Close window
         self.root.destroy()
@@ -1,35 +1,52 @@
-"""Custom logging handler for tkinter Text widget"""
+"""Custom logging handler for the activity log view"""
 import logging
 import tkinter as tk
 from datetime import datetime
-import queue
+from collections import deque
 import threading
+import time
+
+# Virtual event used to wake the log pump from other threads
+PUMP_EVENT = '<<LogQueued>>'
+
+# Messages held while the GUI catches up; the oldest are dropped beyond this
+MAX_QUEUED_MESSAGES = 10000
+
+# Messages rendered per pump tick (the rest wait for the next tick)
+PUMP_BATCH_SIZE = 500
 
 
 class TextHandler(logging.Handler):
-    """Logging handler that writes to a tkinter Text widget"""
+    """Logging handler that writes to a LogView widget"""
 
-    def __init__(self, text_widget):
+    def __init__(self, log_view):
         """
         Initialize the handler.
 
         Args:
-            text_widget: tkinter.Text widget to write log messages to
+            log_view: LogView widget to write log messages to
         """
         super().__init__()
-        self.text_widget = text_widget
-        self.max_lines = 1000  # Limit number of lines to prevent memory issues
+        self.log_view = log_view
         # Only show INFO level and above to GUI (not DEBUG)
         self.setLevel(logging.INFO)
-        # Use a queue to avoid blocking the GUI event loop
-        self.msg_queue = queue.Queue()
+        # Use a bounded queue (drop-oldest) to avoid blocking the GUI event loop
+        self.msg_queue = deque(maxlen=MAX_QUEUED_MESSAGES)
+        self.dropped = 0
         self.main_thread_id = threading.current_thread().ident
-        # Start processing queue periodically
-        self._schedule_queue_check()
+        # The pump only runs when emit() has queued something; this flag keeps
+        # at most one wake-up outstanding
+        self._pump_pending = False
+        self._pump_lock = threading.Lock()
+        self.log_view.bind(PUMP_EVENT, lambda event: self._process_queue())
+        # Wake-ups from other threads go through a waker thread so that
+        # logging never blocks the caller on a cross-thread Tk call
+        self._wake_event = threading.Event()
+        self._waker = None
 
     def emit(self, record):
         """
-        Emit a log record to the text widget.
+        Emit a log record to the log view.
 
         Args:
             record: logging.LogRecord to emit
@@ -37,41 +54,81 @@ class TextHandler(logging.Handler):
         try:
             # Format the log message
             msg = self.format(record)
-            # Add to queue without blocking
-            self.msg_queue.put_nowait(msg)
+            # Add to queue without blocking (emit calls are serialized by the
+            # handler lock, so the drop count is exact)
+            if len(self.msg_queue) == self.msg_queue.maxlen:
+                self.dropped += 1
+            self.msg_queue.append((record.levelno, msg))
+            self._request_pump()
         except Exception:
             self.handleError(record)
 
-    def _schedule_queue_check(self):
-        """Check the queue periodically and process messages"""
-        try:
-            while True:
-                try:
-                    msg = self.msg_queue.get_nowait()
-                    self.text_widget.configure(state='normal')
-                    self.text_widget.insert(tk.END, msg + '\n')
-                    self.text_widget.see(tk.END)
-                    self._trim_lines()
-                    self.text_widget.configure(state='disabled')
-                except queue.Empty:
-                    break
-        except Exception:
-            pass
-        # Schedule next check
-        self.text_widget.after(100, self._schedule_queue_check)
+    def _request_pump(self):
+        """Wake the GUI thread to process the queue, unless already requested"""
+        with self._pump_lock:
+            if self._pump_pending:
+                return
+            self._pump_pending = True
+
+        if threading.current_thread().ident == self.main_thread_id:
+            try:
+                self.log_view.after_idle(self._process_queue)
+            except Exception:
+                # Widget destroyed; allow a later retry
+                with self._pump_lock:
+                    self._pump_pending = False
+        else:
+            if self._waker is None:
+                self._waker = threading.Thread(target=self._wake_loop, daemon=True)
+                self._waker.start()
+            self._wake_event.set()
+
+    def _wake_loop(self):
+        """Forward wake-up requests from other threads to the GUI thread"""
+        while True:
+            self._wake_event.wait()
+            self._wake_event.clear()
+            try:
+                # event_generate is safe to call from non-GUI threads
+                self.log_view.event_generate(PUMP_EVENT, when='tail')
+            except tk.TclError:
+                return  # Widget destroyed
+            except RuntimeError:
+                # Event loop not running yet; try again shortly
+                time.sleep(0.05)
+                self._wake_event.set()
+
+    def _process_queue(self):
+        """Write a batch of queued messages to the log view"""
+        with self._pump_lock:
+            self._pump_pending = False
 
-    def _trim_lines(self):
-        """Trim text widget to maximum number of lines"""
         try:
-            # Get current line count
-            line_count = int(self.text_widget.index('end-1c').split('.')[0])
+            # Take up to one batch, plus a marker for anything dropped
+            entries = []
+            with self.lock:
+                dropped, self.dropped = self.dropped, 0
+            if dropped:
+                entries.append((logging.WARNING, f"... {dropped} messages dropped ..."))
+            for _ in range(min(PUMP_BATCH_SIZE, len(self.msg_queue))):
+                entries.append(self.msg_queue.popleft())
 
-            if line_count > self.max_lines:
-                # Delete oldest lines
-                lines_to_delete = line_count - self.max_lines
-                self.text_widget.delete('1.0', f'{lines_to_delete}.0')
+            if entries:
+                self.log_view.append(entries)
         except Exception:
-            pass  # Ignore errors during trimming
+            pass
+
+        # Leave the rest for the next tick so the UI stays responsive
+        if self.msg_queue:
+            with self._pump_lock:
+                if self._pump_pending:
+                    return
+                self._pump_pending = True
+            try:
+                self.log_view.after(1, self._process_queue)
+            except Exception:
+                with self._pump_lock:
+                    self._pump_pending = False
 
 
 class SimpleFormatter(logging.Formatter):
@@ -0,0 +1,112 @@
+"""Control server commands for the main window"""
+import concurrent.futures
+
+from core.control_server import presser_status
+from core.input_backend import get_backend, DEFAULT_BACKEND
+from core.key_plan import compile_plan
+from core.macro import compile_macro
+
+# Seconds an update waits for the Tk thread to apply it
+APPLY_TIMEOUT = 5.0
+
+
+class WindowController:
+    """
+    Control commands for a MainWindow.
+
+    Changes are posted to the Tk thread so the window stays in sync with
+    the session. Start and stop take effect once the event loop runs them;
+    update waits until the window has applied it, so the status in its
+    reply already shows the new configuration. Status reads the key
+    presser and the settings directly and never waits for the Tk thread.
+    """
+
+    def __init__(self, window):
+        """
+        Initialize the controller.
+
+        Args:
+            window: MainWindow to control
+        """
+        self.window = window
+
+    def start(self):
+        """Press Start"""
+        self.window.handle_instance_message({'actions': ['start']})
+
+    def stop(self):
+        """Press Stop"""
+        self.window.handle_instance_message({'actions': ['stop']})
+
+    def update(self, keys_config, min_interval_minutes, max_interval_minutes, macro=None):
+        """
+        Show and apply new keys, intervals and macro (also to a running session).
+
+        The whole request is checked before anything is applied, so an
+        invalid update is answered with an error and never reaches the
+        window or settings.json.
+
+        Raises:
+            ValueError: If the settings would be invalid, a key name or the
+                macro does not compile, or there is nothing to press
+            RuntimeError: If the window does not apply the change within APPLY_TIMEOUT
+        """
+        settings = self.window.settings
+        settings.validate_changes({
+            'keys_config': keys_config,
+            'min_interval_minutes': min_interval_minutes,
+            'max_interval_minutes': max_interval_minutes,
+            'macro': macro or '',
+        })
+        if not (keys_config or macro):
+            raise ValueError("Nothing to press: give keys or a macro")
+
+        presser = self.window.key_presser
+        backend = presser.backend if presser else get_backend(settings.get('input_backend', DEFAULT_BACKEND))
+        compile_plan(keys_config, backend)
+        if macro:
+            compile_macro(macro, backend)
+
+        self._run_on_tk(self.window.apply_config, keys_config, min_interval_minutes, max_interval_minutes, macro)
+
+    def _run_on_tk(self, func, *args):
+        """
+        Run a function on the Tk thread and wait for it to return.
+
+        Called on a control server executor thread, never the Tk thread
+        (which would wait on itself).
+
+        Returns:
+            The function's return value
+
+        Raises:
+            RuntimeError: If the Tk thread does not run it within APPLY_TIMEOUT
+        """
+        future = concurrent.futures.Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+        self.window.root.after(0, run)
+        try:
+            return future.result(timeout=APPLY_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            # Skip it if the event loop gets to it later
+            future.cancel()
+            raise RuntimeError("The window did not apply the change in time") from None
+
+    def status(self):
+        """Get the session state, or the configured settings when no session exists"""
+        settings = self.window.settings
+        return presser_status(
+            self.window.key_presser,
+            keys_config=settings.get_keys_config(),
+            min_interval_minutes=settings.get('min_interval_minutes'),
+            max_interval_minutes=settings.get('max_interval_minutes'),
+            macro=settings.get('macro')
+        )
@@ -1,88 +1,220 @@
 """Main entry point for Extended AFK application"""
-# Import keyboard library FIRST, before anything else
-# This initializes keyboard hooks before tkinter starts
-try:
-    import keyboard
-except Exception as e:
-    print(f"Warning: Failed to import keyboard library: {e}")
-
-import tkinter as tk
-import ttkbootstrap as ttk_bootstrap
+import argparse
+import json
 import logging
-from logging.handlers import RotatingFileHandler
 import os
 import sys
 
 # Add src directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from gui.main_window import MainWindow
-
-
-def setup_logging():
-    """Set up logging with file and console handlers"""
-    # Create logs directory
-    log_dir = os.path.join(os.getenv('APPDATA'), 'extended-afk', 'logs')
-    os.makedirs(log_dir, exist_ok=True)
-    log_file = os.path.join(log_dir, 'extended-afk.log')
-
-    # Root logger
-    logger = logging.getLogger()
-    logger.setLevel(logging.DEBUG)
-
-    # File handler (rotating, 5MB max, 3 backups)
-    file_handler = RotatingFileHandler(
-        log_file,
-        maxBytes=5 * 1024 * 1024,  # 5MB
-        backupCount=3
-    )
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(
-        logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-    )
-    logger.addHandler(file_handler)
-
-    # Console handler (for development)
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(
-        logging.Formatter(
-            '%(levelname)s - %(message)s'
-        )
-    )
-    logger.addHandler(console_handler)
-
-    # Suppress noisy debug logging from PIL
-    logging.getLogger('PIL').setLevel(logging.WARNING)
-
-    logger.info("Extended AFK started")
-
-
-def main():
-    """Main application entry point"""
+from utils.startup_profiler import PROFILER
+
+# Same as core.control_server.DEFAULT_ADDRESS (not imported here to keep
+# asyncio off the startup path)
+DEFAULT_CONTROL_ADDRESS = '127.0.0.1:8765'
+
+
+def gui_actions(args):
+    """Get the window actions requested on the command line"""
+    actions = []
+    if args.profile:
+        actions.append('switch_profile')
+    if args.start:
+        actions.append('start')
+    if args.stop:
+        actions.append('stop')
+    return actions or ['show']
+
+
+def run_gui(args):
+    """Run the desktop application"""
+    # A second launch hands its actions to the running instance and exits
+    # before any GUI module is imported
+    with PROFILER.phase("single instance"):
+        from utils.single_instance import make_message, claim_or_forward
+        message = make_message(gui_actions(args), args.profile)
+        try:
+            server, reply = claim_or_forward(message)
+        except RuntimeError as e:
+            print(f"Extended AFK could not start: {e}", file=sys.stderr)
+            sys.exit(1)
+    if reply is not None:
+        if not reply.get('ok'):
+            print(f"Extended AFK is already running: {reply.get('error')}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    # Input libraries (keyboard, pynput) are imported in the
+    # background once the window is interactive (see WARM_UP_MODULES)
+    with PROFILER.phase("import ttkbootstrap"):
+        import ttkbootstrap as ttk_bootstrap
+
+    with PROFILER.phase("import gui"):
+        from gui.main_window import MainWindow, WARM_UP_MODULES
+        from utils.deferred_import import warm_up
+        from utils.log_setup import setup_logging
+
     # Set up logging
-    setup_logging()
+    with PROFILER.phase("setup logging"):
+        setup_logging()
 
     try:
         # Create themed tkinter root window using system theme
         # Use darkly theme which automatically adapts to Windows theme
-        root = ttk_bootstrap.Window(themename="darkly")
+        with PROFILER.phase("create root window"):
+            root = ttk_bootstrap.Window(themename="darkly")
 
         # Create main window
-        app = MainWindow(root)
+        with PROFILER.phase("MainWindow"):
+            app = MainWindow(root)
+
+        # Log time-to-first-paint and time-to-interactive, then warm up
+        # the deferred modules and install the shared keyboard hook
+        PROFILER.watch_first_paint(
+            root, on_interactive=lambda: warm_up(WARM_UP_MODULES, then=app.start_input_hook))
+
+        # Apply this launch's own actions, then those of later launches
+        if message['actions'] != ['show']:
+            app.handle_instance_message(message)
+        server.set_handler(app.handle_instance_message)
 
         # Start event loop
         root.mainloop()
 
     except Exception as e:
-        logging.error(f"Fatal error: {e}", exc_info=True)
+        logging.error("Fatal error: %s", e, exc_info=True)
         import traceback
         traceback.print_exc()
         sys.exit(1)
 
+    finally:
+        if server is not None:
+            server.close()
+
+
+def run_headless(args):
+    """Press keys without a window until interrupted"""
+    from core.headless import run
+    from utils.log_setup import setup_logging
+
+    setup_logging()
+    sys.exit(run(profile_name=args.profile, backend_name=args.backend, control_address=args.control))
+
+
+def run_control(args):
+    """Send a command to the control server of a running session"""
+    from core.control_server import ControlClient
+
+    params = {}
+    if args.keys:
+        params['keys'] = [key.strip() for key in args.keys.split(',') if key.strip()]
+    if args.macro is not None:
+        params['macro'] = args.macro
+    if args.min is not None:
+        params['min_interval_minutes'] = args.min
+    if args.max is not None:
+        params['max_interval_minutes'] = args.max
+
+    try:
+        with ControlClient(args.address) as client:
+            result = client.request(args.command, **params)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"Control request failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(result, indent=2))
+
+
+def run_logstats(args):
+    """Print press, interval and error statistics from the logs"""
+    from core.log_stats import analyze
+
+    stats = analyze(args.log_dir)
+    if args.json:
+        print(json.dumps(stats.to_dict(), indent=2))
+    else:
+        print(stats.format())
+
+
+def run_profiles(args):
+    """List or import key pressing profiles"""
+    from core.profiles import ProfileStore
+
+    store = ProfileStore()
+    try:
+        if args.action == "import":
+            for path in args.files:
+                profile = store.import_settings_file(
+                    path, name=args.name if len(args.files) == 1 else None, tags=args.tag or ())
+                print(f"Imported {path} as '{profile.name}'")
+        else:
+            active = store.active_name()
+            for name in store.names(tag=args.tag[0] if args.tag else None):
+                marker = "*" if name == active else " "
+                print(f"{marker} {name}")
+    finally:
+        store.close()
+
+
+def build_parser():
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(prog="extended-afk", description="Extended AFK")
+    parser.set_defaults(handler=run_gui, profile=None, start=False, stop=False)
+    parser.add_argument(
+        "--profile-startup", action="store_true",
+        help="time module imports and profile startup, writing a report to the log directory")
+    subparsers = parser.add_subparsers(title="commands")
+
+    gui_parser = subparsers.add_parser(
+        "gui", help="run the desktop application (default), or pass the actions to the one already running")
+    gui_parser.add_argument("--profile", help="switch to this profile")
+    actions = gui_parser.add_mutually_exclusive_group()
+    actions.add_argument("--start", action="store_true", help="start pressing keys")
+    actions.add_argument("--stop", action="store_true", help="stop pressing keys")
+    gui_parser.set_defaults(handler=run_gui)
+
+    run_parser = subparsers.add_parser("run", help="press keys without a window (stop with Ctrl+C or SIGTERM)")
+    run_parser.add_argument("--profile", help="profile to run (default: the saved settings)")
+    run_parser.add_argument("--backend", help="input backend (default: the input_backend setting)")
+    run_parser.add_argument(
+        "--control", metavar="ADDRESS",
+        help="serve the control API on host:port or unix:PATH (default: the control_address setting)")
+    run_parser.set_defaults(handler=run_headless)
+
+    control_parser = subparsers.add_parser("control", help="send a command to a running session's control API")
+    control_parser.add_argument("command", choices=["status", "metrics", "start", "stop", "update"])
+    control_parser.add_argument(
+        "--address", default=DEFAULT_CONTROL_ADDRESS,
+        help=f"control API address (default: {DEFAULT_CONTROL_ADDRESS})")
+    control_parser.add_argument("--keys", help="comma-separated keys (update)")
+    control_parser.add_argument("--macro", help="macro definition, empty to press the keys again (update)")
+    control_parser.add_argument("--min", type=float, help="minimum interval in minutes (update)")
+    control_parser.add_argument("--max", type=float, help="maximum interval in minutes (update)")
+    control_parser.set_defaults(handler=run_control)
+
+    logstats_parser = subparsers.add_parser(
+        "logstats", help="report presses, intervals, errors and gaps from the logs")
+    logstats_parser.add_argument("--log-dir", help="log directory (default: the application log directory)")
+    logstats_parser.add_argument("--json", action="store_true", help="print the statistics as JSON")
+    logstats_parser.set_defaults(handler=run_logstats)
+
+    profiles_parser = subparsers.add_parser("profiles", help="list or import key pressing profiles")
+    profiles_parser.add_argument("action", nargs="?", choices=["list", "import"], default="list")
+    profiles_parser.add_argument("files", nargs="*", help="settings.json files to import")
+    profiles_parser.add_argument("--name", help="profile name for a single imported file (default: file name)")
+    profiles_parser.add_argument("--tag", action="append", help="tag to filter by (list) or to add (import)")
+    profiles_parser.set_defaults(handler=run_profiles)
+
+    return parser
+
+
+def main(argv=None):
+    """Main application entry point"""
+    args = build_parser().parse_args(argv)
+    if args.profile_startup:
+        PROFILER.enable_detailed()
+    args.handler(args)
+
 
 if __name__ == '__main__':
     main()
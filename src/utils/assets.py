@@ -0,0 +1,153 @@
+"""Pre-scaled image assets shared by the build step and the GUI"""
+import os
+import sys
+import logging
+
+from utils.paths import get_app_dir
+from utils.resource_path import get_resource_path
+
+logger = logging.getLogger(__name__)
+
+ASSETS_DIR = 'assets'
+
+# Output of scripts/build_assets.py, bundled with the application
+SCALED_DIR = os.path.join(ASSETS_DIR, 'scaled')
+
+# Images scaled on first use when no up-to-date build output exists
+CACHE_DIRNAME = 'asset-cache'
+
+# Footer branding and donation images and the height they are shown at
+FOOTER_IMAGES = ['osiris-devworks.png', 'paypal.png', 'venmo.png']
+FOOTER_IMAGE_HEIGHT = 40
+
+
+def scaled_filename(name, height, mtime_ns=None):
+    """
+    Get the file name of a scaled copy of an image.
+
+    Args:
+        name: Source image file name
+        height: Target height (in pixels)
+        mtime_ns: Source modification time, for runtime cache entries
+
+    Returns:
+        str: File name such as "paypal-h40.png" or "paypal-h40-<mtime_ns>.png"
+    """
+    stem = os.path.splitext(name)[0]
+    if mtime_ns is None:
+        return f"{stem}-h{height}.png"
+    return f"{stem}-h{height}-{mtime_ns}.png"
+
+
+def scale_image(source, destination, height):
+    """
+    Write a copy of an image scaled to the given height as PNG.
+
+    Uses PIL (LANCZOS resampling). The file is written atomically so a
+    concurrent reader never sees a partial image.
+
+    Args:
+        source: Source image path
+        destination: Output PNG path
+        height: Target height (in pixels)
+
+    Raises:
+        RuntimeError: If PIL is not installed
+    """
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise RuntimeError("Scaling images requires Pillow (pip install pillow)") from e
+
+    with Image.open(source) as img:
+        width = max(1, int(img.width * height / img.height))
+        # RGBA keeps transparency and is a PNG flavour Tk reads natively
+        scaled = img.convert('RGBA').resize((width, height), Image.Resampling.LANCZOS)
+
+    os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+    temp_path = destination + '.tmp'
+    scaled.save(temp_path, format='PNG', optimize=True)
+    os.replace(temp_path, destination)
+
+
+def build_scaled_images(names=None, height=FOOTER_IMAGE_HEIGHT, source_dir=ASSETS_DIR,
+                        output_dir=SCALED_DIR):
+    """
+    Pre-scale images at build time.
+
+    Args:
+        names: Source image file names (defaults to FOOTER_IMAGES)
+        height: Target height (in pixels)
+        source_dir: Directory holding the source images
+        output_dir: Directory receiving the scaled copies
+
+    Returns:
+        list: Paths of the written images
+    """
+    written = []
+    for name in names or FOOTER_IMAGES:
+        destination = os.path.join(output_dir, scaled_filename(name, height))
+        scale_image(os.path.join(source_dir, name), destination, height)
+        written.append(destination)
+    return written
+
+
+def get_scaled_image(name, height):
+    """
+    Get a PNG of an asset scaled to the given height, ready for tk.PhotoImage.
+
+    The build output in assets/scaled is used when it is at least as new
+    as the source image (always, in a frozen build). Otherwise the image is
+    scaled once into the runtime cache, keyed by height and source mtime,
+    so later launches load it without resampling.
+
+    Args:
+        name: Image file name in the assets directory
+        height: Target height (in pixels)
+
+    Returns:
+        str or None: PNG path, or None if the image is missing or cannot be scaled
+    """
+    source = get_resource_path(os.path.join(ASSETS_DIR, name))
+    prebuilt = get_resource_path(os.path.join(SCALED_DIR, scaled_filename(name, height)))
+    try:
+        source_mtime_ns = os.stat(source).st_mtime_ns
+    except OSError:
+        source_mtime_ns = None
+
+    try:
+        prebuilt_mtime_ns = os.stat(prebuilt).st_mtime_ns
+    except OSError:
+        prebuilt_mtime_ns = None
+    if prebuilt_mtime_ns is not None:
+        # PyInstaller does not preserve modification times when extracting
+        if getattr(sys, 'frozen', False) or source_mtime_ns is None or prebuilt_mtime_ns >= source_mtime_ns:
+            return prebuilt
+
+    if source_mtime_ns is None:
+        return None
+
+    cache_dir = os.path.join(get_app_dir(), CACHE_DIRNAME)
+    cached = os.path.join(cache_dir, scaled_filename(name, height, source_mtime_ns))
+    if os.path.exists(cached):
+        return cached
+
+    try:
+        scale_image(source, cached, height)
+    except (OSError, RuntimeError) as e:
+        logger.error("Failed to scale %s: %s", name, e)
+        return None
+    logger.debug("Scaled %s to height %d into the asset cache", name, height)
+    _remove_stale_entries(cache_dir, name, height, keep=cached)
+    return cached
+
+
+def _remove_stale_entries(cache_dir, name, height, keep):
+    prefix = scaled_filename(name, height)[:-len('.png')] + '-'
+    for entry in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, entry)
+        if entry.startswith(prefix) and path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,116 @@
+"""Deferred imports that can be warmed up on a background thread"""
+import importlib
+import sys
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+_modules = {}
+_modules_lock = threading.Lock()
+
+
+class DeferredModule:
+    """
+    Stand-in for a module that is imported on first use.
+
+    Attribute access imports the module if needed and forwards to it. If a
+    background warm-up is importing the module at that moment, the import
+    lock makes the caller wait for that import only, not the whole warm-up.
+    """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+        self.__dict__['_error'] = None
+
+    @property
+    def ready(self):
+        """Whether the module has been imported"""
+        if self._module is not None:
+            return True
+        module = sys.modules.get(self._name)
+        # Modules being imported by another thread are already in sys.modules
+        spec = getattr(module, '__spec__', None)
+        return module is not None and not getattr(spec, '_initializing', False)
+
+    @property
+    def failed(self):
+        """Whether the last import attempt raised an error"""
+        return self._error is not None
+
+    def get(self):
+        """
+        Import the module (if needed) and return it.
+
+        Returns:
+            module: The imported module
+
+        Raises:
+            ImportError: If the module cannot be imported
+        """
+        module = self._module
+        if module is None:
+            try:
+                module = importlib.import_module(self._name)
+            except Exception as e:
+                self.__dict__['_error'] = e
+                raise
+            self.__dict__['_module'] = module
+            self.__dict__['_error'] = None
+        return module
+
+    def __getattr__(self, attribute):
+        return getattr(self.get(), attribute)
+
+    def __repr__(self):
+        state = "imported" if self.ready else "deferred"
+        return f"<deferred module {self._name!r} ({state})>"
+
+
+def deferred(name):
+    """
+    Get the shared deferred stand-in for a module.
+
+    Args:
+        name: Dotted module name
+
+    Returns:
+        DeferredModule: Stand-in that imports the module on first use
+    """
+    with _modules_lock:
+        module = _modules.get(name)
+        if module is None:
+            module = _modules[name] = DeferredModule(name)
+        return module
+
+
+def warm_up(names, then=None):
+    """
+    Import modules one after another on a background thread.
+
+    Failures are logged and skipped; code using the module sees the error
+    when it imports it for real.
+
+    Args:
+        names: Dotted module names, most urgently needed first
+        then: Optional callable run on the same thread once the imports are done
+
+    Returns:
+        threading.Thread: The started warm-up thread
+    """
+    def run():
+        started = time.perf_counter()
+        for name in names:
+            try:
+                deferred(name).get()
+            except Exception as e:
+                logger.debug("Warm-up import of %s failed: %s", name, e)
+        logger.debug("Warm-up imports finished in %.0f ms", (time.perf_counter() - started) * 1000)
+        if then is not None:
+            then()
+
+    thread = threading.Thread(target=run, name="extended-afk-warm-up", daemon=True)
+    thread.start()
+    return thread
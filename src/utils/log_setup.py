@@ -0,0 +1,210 @@
+"""Logging setup: every handler runs behind a queue on a dedicated writer thread"""
+import atexit
+import gzip
+import logging
+import os
+import queue
+import shutil
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from utils.paths import get_log_dir
+
+LOG_FORMAT = '%(asctime)s.%(msecs)03d - %(name)s - %(levelname)s - %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+LOG_FILENAME = 'extended-afk.log'
+
+# Live log size before rotation, and number of compressed segments kept
+# (text logs compress roughly tenfold, so this fits in about 15 MB)
+LOG_MAX_BYTES = 5 * 1024 * 1024  # 5MB
+LOG_BACKUP_COUNT = 20
+
+_listener = None
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that hands records over without formatting them.
+
+    The standard QueueHandler formats each record on the calling thread so
+    it can be pickled; records here never leave the process, so formatting
+    (and the %-style message merge) is left to the writer thread. Logging
+    calls must therefore pass immutable values as arguments.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class CompressingRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotating file handler that gzips finished segments on a background thread.
+
+    Rotated segments are named extended-afk.log.1.gz, .2.gz, ... The live log
+    is renamed aside at rollover and compressed by a worker thread so writing
+    can continue immediately; the next rollover waits for that compression
+    to finish before shifting segments. A segment that cannot be compressed
+    is kept uncompressed as extended-afk.log.N and shifted like the others.
+    """
+
+    def __init__(self, filename, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, **kwargs):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, **kwargs)
+        self._compressor = None
+
+    def namer(self, default_name):
+        return default_name + '.gz'
+
+    def rotator(self, source, dest):
+        pending = source + '.rotating'
+        os.replace(source, pending)
+        self._compressor = threading.Thread(
+            target=self._compress,
+            args=(pending, dest),
+            name="extended-afk-log-compressor",
+            daemon=True
+        )
+        self._compressor.start()
+
+    def doRollover(self):
+        self.wait_for_compression()
+        if self.backupCount > 0:
+            self._shift_uncompressed()
+        super().doRollover()
+
+    def _shift_uncompressed(self):
+        """Shift segments left uncompressed by a failed compression"""
+        for index in range(self.backupCount - 1, 0, -1):
+            source = f"{self.baseFilename}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.baseFilename}.{index + 1}")
+
+    def wait_for_compression(self):
+        """Block until the last rotated segment has been compressed"""
+        if self._compressor is not None:
+            self._compressor.join()
+            self._compressor = None
+
+    def close(self):
+        self.wait_for_compression()
+        super().close()
+
+    def _compress(self, source, dest):
+        temp_path = dest + '.tmp'
+        try:
+            with open(source, 'rb') as f_in, gzip.open(temp_path, 'wb') as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            os.replace(temp_path, dest)
+            os.remove(source)
+        except OSError:
+            # Keep the segment uncompressed under its final name (without
+            # .gz) so the next rollover does not overwrite it and logstats
+            # still reads it, and report through the handler (logging from
+            # here would re-enter the handler mid-rollover)
+            record = logging.LogRecord(
+                self.name, logging.ERROR, __file__, 0,
+                "Failed to compress log segment %s", (source,), None
+            )
+            try:
+                os.replace(source, dest[:-len('.gz')])
+            except OSError:
+                pass
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            self.handleError(record)
+
+
+def start_queue_logging(handlers, level=logging.DEBUG):
+    """
+    Route all root logger records through a queue to handlers on a writer thread.
+
+    Args:
+        handlers: Handlers that receive records on the writer thread
+        level: Root logger level
+
+    Returns:
+        QueueListener: The running listener
+    """
+    global _listener
+    stop_logging()
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    for handler in list(root.handlers):
+        if isinstance(handler, DeferredQueueHandler):
+            root.removeHandler(handler)
+    root.addHandler(DeferredQueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def add_handler(handler):
+    """
+    Add a handler behind the logging queue.
+
+    Args:
+        handler: Handler to receive records on the writer thread
+    """
+    if _listener is None:
+        logging.getLogger().addHandler(handler)
+    else:
+        _listener.handlers = _listener.handlers + (handler,)
+
+
+def remove_handler(handler):
+    """
+    Remove a handler added with add_handler().
+
+    Args:
+        handler: Handler to remove
+    """
+    if _listener is None:
+        logging.getLogger().removeHandler(handler)
+    else:
+        _listener.handlers = tuple(h for h in _listener.handlers if h is not handler)
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.flush()
+        _listener = None
+
+
+def setup_logging():
+    """Set up logging with file and console handlers"""
+    # Create logs directory
+    log_dir = get_log_dir()
+    os.makedirs(log_dir, exist_ok=True)
+    log_file = os.path.join(log_dir, LOG_FILENAME)
+
+    # File handler (rotating, 5MB max, 20 gzipped backups)
+    file_handler = CompressingRotatingFileHandler(log_file)
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT))
+
+    # Console handler (for development)
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(
+        logging.Formatter(
+            '%(levelname)s - %(message)s'
+        )
+    )
+
+    # Both handlers run on the queue's writer thread, so disk writes and
+    # rotations never happen on the caller's (e.g. the key presser's) thread
+    start_queue_logging([file_handler, console_handler])
+    atexit.register(stop_logging)
+
+    # Suppress noisy debug logging from PIL
+    logging.getLogger('PIL').setLevel(logging.WARNING)
+
+    logging.getLogger().info("Extended AFK started")
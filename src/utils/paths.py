@@ -0,0 +1,33 @@
+"""Application data directory helpers"""
+import os
+import sys
+
+APP_NAME = 'extended-afk'
+
+
+def get_app_dir():
+    """
+    Get the per-user directory for settings, logs and runtime state.
+
+    On Windows this is %APPDATA%\\extended-afk. Elsewhere it follows the XDG
+    base directory spec: $XDG_STATE_HOME/extended-afk, falling back to
+    ~/.local/state/extended-afk.
+
+    Returns:
+        str: Absolute directory path (not created)
+    """
+    if sys.platform == 'win32' and os.getenv('APPDATA'):
+        base = os.getenv('APPDATA')
+    else:
+        base = os.getenv('XDG_STATE_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'state')
+    return os.path.join(base, APP_NAME)
+
+
+def get_log_dir():
+    """
+    Get the directory holding the application log files.
+
+    Returns:
+        str: Absolute directory path (not created)
+    """
+    return os.path.join(get_app_dir(), 'logs')
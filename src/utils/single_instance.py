@@ -0,0 +1,273 @@
+"""Single-instance endpoint for handing command line actions to a running process"""
+import json
+import os
+import stat
+import sys
+import threading
+import time
+import logging
+from multiprocessing.connection import Listener, Client
+
+from utils.paths import APP_NAME, get_app_dir
+
+logger = logging.getLogger(__name__)
+
+# Actions a second launch can pass to the running instance
+ACTIONS = ('show', 'start', 'stop', 'switch_profile')
+
+# Seconds a connection may take to send its request or read the reply
+REQUEST_TIMEOUT = 1.0
+
+# Requests are a few dozen bytes; anything larger is not from a launcher
+MAX_MESSAGE_BYTES = 4096
+
+SOCKET_FILENAME = 'instance.sock'
+
+# Seconds a launch keeps trying to reach or claim a busy endpoint before
+# giving up (it never starts a second window instead)
+CLAIM_TIMEOUT = 3.0
+CLAIM_RETRY_INTERVAL = 0.05
+
+
+def get_address():
+    """
+    Get the per-user endpoint address.
+
+    A named pipe on Windows, and a socket file elsewhere, in a directory
+    only this user can enter ($XDG_RUNTIME_DIR/extended-afk, or the run
+    directory inside the application directory), so other local users can
+    neither connect nor take the name first.
+
+    Returns:
+        str: Address for multiprocessing.connection
+    """
+    if sys.platform == 'win32':
+        user = os.getenv('USERNAME', 'user')
+        return f'\\\\.\\pipe\\{APP_NAME}-{user}'
+    runtime_dir = os.getenv('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        socket_dir = os.path.join(runtime_dir, APP_NAME)
+    else:
+        socket_dir = os.path.join(get_app_dir(), 'run')
+    return os.path.join(socket_dir, SOCKET_FILENAME)
+
+
+def _make_private_dir(path):
+    """
+    Create a directory only the current user can use, or check an existing one.
+
+    Args:
+        path: Directory path
+
+    Raises:
+        OSError: If the directory belongs to another user or cannot be made private
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+        raise OSError(f"Instance socket directory is not owned by this user: {path}")
+    if stat.S_IMODE(info.st_mode) & 0o077:
+        os.chmod(path, 0o700)
+
+
+def make_message(actions, profile=None):
+    """
+    Build a request for the running instance.
+
+    Args:
+        actions: Action names from ACTIONS, applied in order
+        profile: Profile name for the 'switch_profile' action
+
+    Returns:
+        dict: Request message
+
+    Raises:
+        ValueError: If an action is unknown or switch_profile has no profile
+    """
+    unknown = [action for action in actions if action not in ACTIONS]
+    if unknown:
+        raise ValueError(f"Unknown action(s): {', '.join(unknown)}")
+    if 'switch_profile' in actions and not profile:
+        raise ValueError("switch_profile needs a profile name")
+    return {'actions': list(actions), 'profile': profile}
+
+
+def send_to_running_instance(message, address=None, timeout=REQUEST_TIMEOUT):
+    """
+    Pass a request to the running instance, if there is one.
+
+    Args:
+        message: Request from make_message()
+        address: Endpoint address (defaults to get_address())
+        timeout: Seconds to wait for the reply
+
+    Returns:
+        dict or None: The instance's reply, or None if no instance is listening
+    """
+    try:
+        conn = Client(address or get_address())
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    except OSError as e:
+        logger.debug("Could not reach a running instance: %s", e)
+        return None
+
+    with conn:
+        try:
+            conn.send_bytes(json.dumps(message).encode('utf-8'))
+            if not conn.poll(timeout):
+                return {'ok': False, 'error': "The running instance did not reply"}
+            return json.loads(conn.recv_bytes(MAX_MESSAGE_BYTES))
+        except (OSError, EOFError, ValueError) as e:
+            return {'ok': False, 'error': f"Lost connection to the running instance: {e}"}
+
+
+class InstanceServer:
+    """
+    Endpoint owned by the running instance.
+
+    Binding the endpoint is what makes a process the running instance:
+    the named pipe is created as the first instance only and socket
+    addresses cannot be bound twice. Requests are answered on a daemon
+    thread; they are queued until set_handler() is called, so a launch
+    that arrives while the window is still being built is not lost.
+    """
+
+    def __init__(self, address=None):
+        """
+        Bind the endpoint and start serving.
+
+        Args:
+            address: Endpoint address (defaults to get_address())
+
+        Raises:
+            OSError: If another process holds the endpoint
+        """
+        self.address = address or get_address()
+        if sys.platform != 'win32':
+            _make_private_dir(os.path.dirname(self.address))
+        self._listener = Listener(self.address, backlog=8)
+        self._lock = threading.Lock()
+        self._handler = None
+        self._pending = []
+        self._closed = False
+        self._thread = threading.Thread(target=self._serve, name="extended-afk-instance", daemon=True)
+        self._thread.start()
+
+    def set_handler(self, handler):
+        """
+        Set the callback for requests and replay queued ones.
+
+        The handler runs on the server thread.
+
+        Args:
+            handler: Callable taking a request message
+        """
+        with self._lock:
+            self._handler = handler
+            pending, self._pending = self._pending, []
+        for message in pending:
+            handler(message)
+
+    def close(self):
+        """Stop serving and release the endpoint"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        # A blocked accept() on a named pipe is not woken by closing the
+        # listener, so connect once to let the server thread see the flag
+        try:
+            Client(self.address).close()
+        except OSError:
+            pass
+        self._thread.join(timeout=REQUEST_TIMEOUT)
+        self._listener.close()
+
+    def _serve(self):
+        while True:
+            try:
+                conn = self._listener.accept()
+            except OSError as e:
+                if self._closed:
+                    return
+                logger.error("Instance endpoint failed: %s", e)
+                return
+            if self._closed:
+                conn.close()
+                return
+            with conn:
+                try:
+                    self._handle(conn)
+                except (OSError, EOFError) as e:
+                    logger.debug("Dropped instance request: %s", e)
+
+    def _handle(self, conn):
+        if not conn.poll(REQUEST_TIMEOUT):
+            return
+        try:
+            request = json.loads(conn.recv_bytes(MAX_MESSAGE_BYTES))
+            message = make_message(request.get('actions', ['show']), request.get('profile'))
+        except (ValueError, AttributeError, TypeError) as e:
+            conn.send_bytes(json.dumps({'ok': False, 'error': str(e)}).encode('utf-8'))
+            return
+
+        logger.info("Received from another launch: %s", ', '.join(message['actions']))
+        with self._lock:
+            handler = self._handler
+            if handler is None:
+                self._pending.append(message)
+        if handler is not None:
+            handler(message)
+        conn.send_bytes(b'{"ok": true}')
+
+
+def claim_or_forward(message, address=None, timeout=CLAIM_TIMEOUT):
+    """
+    Become the running instance, or hand the request to the one that is.
+
+    The running instance is asked first, which is the cheap path for a
+    second launch. If none answers, the endpoint is bound; losing that
+    race to a concurrent launch falls back to forwarding once more. A
+    socket file left behind by a crashed instance is removed. While the
+    endpoint can be neither reached nor bound (a named pipe busy with
+    another launch's request), both are retried until timeout.
+
+    Args:
+        message: Request from make_message()
+        address: Endpoint address (defaults to get_address())
+        timeout: Seconds to keep retrying a busy endpoint
+
+    Returns:
+        tuple: (server, reply) - the InstanceServer if this process is now the
+        running instance (reply is None), otherwise None and the reply of the
+        running instance
+
+    Raises:
+        RuntimeError: If the endpoint could not be reached or claimed in time
+    """
+    address = address or get_address()
+    deadline = time.monotonic() + timeout
+    removed_stale = False
+    while True:
+        reply = send_to_running_instance(message, address)
+        if reply is not None:
+            return None, reply
+
+        try:
+            return InstanceServer(address), None
+        except OSError as e:
+            bind_error = e
+
+        if not removed_stale and sys.platform != 'win32' and os.path.exists(address):
+            # Nobody answers on the socket file: a crashed instance left it behind
+            removed_stale = True
+            try:
+                os.remove(address)
+                continue
+            except OSError as e:
+                bind_error = e
+
+        if time.monotonic() >= deadline:
+            raise RuntimeError(f"Could not reach the running instance or claim its endpoint: {bind_error}")
+        time.sleep(CLAIM_RETRY_INTERVAL)
@@ -0,0 +1,249 @@
+"""Startup instrumentation: phase timings, import costs and first paint"""
+import importlib.abc
+import os
+import sys
+import threading
+import time
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Origin of every startup timestamp (this module is imported at the top
+# of main.py, before any application or GUI module)
+STARTED_NS = time.perf_counter_ns()
+
+REPORT_FILENAME = 'startup-report.txt'
+PROFILE_FILENAME = 'startup.prof'
+
+# Number of modules listed in the import sections of the report
+TOP_IMPORTS = 25
+
+
+def _ms(ns):
+    return ns / 1_000_000
+
+
+class StartupProfiler:
+    """
+    Records how long each startup phase takes.
+
+    Phases are timed with perf_counter_ns relative to STARTED_NS and may
+    nest. Milestones (first paint, interactive) are single timestamps.
+    With detailed profiling enabled, per-module import costs and a cProfile
+    run of the whole startup are collected as well.
+    """
+
+    def __init__(self):
+        self.phases = []       # (name, depth, start_ns, end_ns)
+        self.milestones = {}   # name -> ns since STARTED_NS
+        self.imports = {}      # module -> (cumulative_ns, self_ns)
+        self._depth = 0
+        self._import_timer = None
+        self._cprofile = None
+        self._finished = False
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a startup phase.
+
+        Args:
+            name: Phase name shown in the report
+        """
+        index = len(self.phases)
+        self.phases.append((name, self._depth, time.perf_counter_ns() - STARTED_NS, None))
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            name, depth, start, _ = self.phases[index]
+            self.phases[index] = (name, depth, start, time.perf_counter_ns() - STARTED_NS)
+
+    def mark(self, name):
+        """
+        Record a milestone at the current time.
+
+        Args:
+            name: Milestone name
+        """
+        self.milestones.setdefault(name, time.perf_counter_ns() - STARTED_NS)
+
+    @property
+    def detailed(self):
+        """Whether import timing and cProfile are enabled"""
+        return self._cprofile is not None
+
+    def enable_detailed(self):
+        """Start timing module imports and profiling with cProfile"""
+        import cProfile
+
+        self._import_timer = _ImportTimer(self)
+        sys.meta_path.insert(0, self._import_timer)
+        self._cprofile = cProfile.Profile()
+        self._cprofile.enable()
+
+    def watch_first_paint(self, root, on_interactive=None):
+        """
+        Record first paint and time-to-interactive for a Tk root window.
+
+        First paint is taken when Tk goes idle after mapping the window
+        (pending redraws run at idle time); the window counts as interactive
+        once the event loop runs its first timer after that.
+
+        Args:
+            root: Tk root window
+            on_interactive: Optional callback run once the window is interactive
+        """
+        def on_idle_after_map():
+            self.mark('first_paint')
+            root.after(1, on_first_timer)
+
+        def on_first_timer():
+            self.mark('interactive')
+            self.finish()
+            if on_interactive:
+                on_interactive()
+
+        def on_map(event):
+            if event.widget is root and 'first_paint' not in self.milestones:
+                root.after_idle(on_idle_after_map)
+
+        root.bind('<Map>', on_map, add='+')
+
+    def finish(self, directory=None):
+        """
+        Log the startup milestones and, if detailed profiling is enabled,
+        write the report and the cProfile dump.
+
+        Args:
+            directory: Output directory for the report (defaults to the log directory)
+        """
+        if self._finished:
+            return
+        self._finished = True
+
+        logger.info(
+            "Startup: first paint %.0f ms, interactive %.0f ms",
+            _ms(self.milestones.get('first_paint', 0)),
+            _ms(self.milestones.get('interactive', 0))
+        )
+
+        if not self.detailed:
+            return
+
+        self._cprofile.disable()
+        if self._import_timer in sys.meta_path:
+            sys.meta_path.remove(self._import_timer)
+
+        if directory is None:
+            from utils.paths import get_log_dir
+            directory = get_log_dir()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            report_path = os.path.join(directory, REPORT_FILENAME)
+            with open(report_path, 'w') as f:
+                f.write(self.report())
+            profile_path = os.path.join(directory, PROFILE_FILENAME)
+            self._cprofile.dump_stats(profile_path)
+            logger.info("Startup report written to %s (cProfile data: %s)", report_path, profile_path)
+        except OSError as e:
+            logger.error("Failed to write startup report: %s", e)
+
+    def report(self):
+        """
+        Render the collected timings.
+
+        Returns:
+            str: Report text
+        """
+        lines = ["Startup phases (ms since main.py started):", ""]
+        lines.append(f"  {'start':>9} {'duration':>9}  phase")
+        for name, depth, start, end in self.phases:
+            duration = f"{_ms(end - start):9.1f}" if end is not None else "      ..."
+            lines.append(f"  {_ms(start):9.1f} {duration}  {'  ' * depth}{name}")
+
+        lines.append("")
+        lines.append("Milestones:")
+        for name, when in sorted(self.milestones.items(), key=lambda item: item[1]):
+            lines.append(f"  {_ms(when):9.1f}  {name}")
+
+        if self.imports:
+            for title, column in (("cumulative", 0), ("self", 1)):
+                lines.append("")
+                lines.append(f"Slowest imports by {title} time (ms):")
+                ranked = sorted(self.imports.items(), key=lambda item: item[1][column], reverse=True)
+                for module, times in ranked[:TOP_IMPORTS]:
+                    lines.append(f"  {_ms(times[column]):9.1f}  {module}")
+            total = sum(self_ns for cumulative, self_ns in self.imports.values())
+            lines.append("")
+            lines.append(f"{len(self.imports)} modules imported in {_ms(total):.1f} ms")
+
+        return "\n".join(lines) + "\n"
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path finder that wraps loaders to time module execution"""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        # Per-thread stack of the time spent in nested imports
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def begin(self):
+        self._stack().append(0)
+
+    def end(self, name, started):
+        total = time.perf_counter_ns() - started
+        stack = self._stack()
+        children = stack.pop()
+        if stack:
+            stack[-1] += total
+        self.profiler.imports[name] = (total, total - children)
+
+
+class _TimedLoader:
+    """Loader proxy that times exec_module()"""
+
+    def __init__(self, loader, timer):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._timer.begin()
+        started = time.perf_counter_ns()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.end(module.__name__, started)
+
+
+# Process-wide profiler
+PROFILER = StartupProfiler()
@@ -0,0 +1,122 @@
+"""Tests for the control server and client"""
+import json
+import socket
+import stat
+import sys
+
+import pytest
+
+from core.control_server import ControlClient, ControlServer, PresserController, load_token, parse_address
+from core.input_backend import RecordingBackend
+from core.key_presser import KeyPresser
+from core.metrics import MetricsRegistry
+from core.scheduler import Scheduler
+
+
+TOKEN = 'test-token'
+
+
+@pytest.fixture
+def presser():
+    presser = KeyPresser([{'key': 'a', 'press_twice': False}], 1, 2, scheduler=Scheduler(name="test-scheduler"),
+                         backend=RecordingBackend(valid_keys={'a', 'b'}), metrics=MetricsRegistry())
+    yield presser
+    if presser.is_running():
+        presser.stop()
+
+
+@pytest.fixture
+def server(presser):
+    server = ControlServer(PresserController(presser), '127.0.0.1:0', metrics=MetricsRegistry(), token=TOKEN)
+    yield server.start()
+    server.stop()
+
+
+@pytest.fixture
+def client(server):
+    with ControlClient(server.bound_address, token=TOKEN) as client:
+        yield client
+
+
+def send_raw(server, payload):
+    """Send raw bytes to the server and read until it closes the connection"""
+    with socket.create_connection(parse_address(server.bound_address)[1], timeout=5) as connection:
+        connection.sendall(payload)
+        replies = b''
+        while True:
+            data = connection.recv(4096)
+            if not data:
+                return [json.loads(line) for line in replies.splitlines()]
+            replies += data
+
+
+def test_start_update_and_stop(client):
+    status = client.request('status')
+    assert status['running'] is False
+    assert status['keys_config'] == [{'key': 'a', 'press_twice': False}]
+
+    assert client.request('start')['running'] is True
+    status = client.request('update', keys=['b'], max_interval_minutes=3)
+    assert status['keys_config'] == [{'key': 'b', 'press_twice': False}]
+    assert (status['min_interval_minutes'], status['max_interval_minutes']) == (1, 3)
+    assert status['next_deadline_in'] is not None
+
+    assert client.request('stop')['running'] is False
+    assert isinstance(client.request('metrics'), dict)
+
+
+@pytest.mark.parametrize('params, message', [
+    ({'keys': ['zz']}, "Invalid key 'zz'"),
+    ({'keys_config': [{'name': 'b'}]}, "'key' name"),
+    ({'keys_config': 'b'}, "must be a list"),
+    ({'min_interval_minutes': 'x'}, "positive numbers"),
+    ({'min_interval_minutes': 5, 'max_interval_minutes': 4}, "cannot be greater"),
+    ({'macro': 'bogus b'}, "unknown statement"),
+])
+def test_invalid_update_is_rejected_and_changes_nothing(client, params, message):
+    before = client.request('status')
+    with pytest.raises(RuntimeError, match=message):
+        client.request('update', **params)
+    assert client.request('status') == before
+
+
+def test_unknown_command_is_rejected(client):
+    with pytest.raises(RuntimeError, match="Unknown command"):
+        client.request('reboot')
+
+
+def test_browser_request_is_dropped_before_its_body(server, presser):
+    body = b'{"command":"start"}\n'
+    request = (
+        b'POST / HTTP/1.1\r\n'
+        b'Host: 127.0.0.1\r\n'
+        b'Origin: https://evil.example\r\n'
+        b'Content-Type: text/plain\r\n'
+        b'Content-Length: ' + str(len(body)).encode() + b'\r\n'
+        b'\r\n' + body
+    )
+    replies = send_raw(server, request)
+
+    # One error for the request line, then the connection is closed
+    assert [reply['ok'] for reply in replies] == [False]
+    assert not presser.is_running()
+
+
+@pytest.mark.parametrize('token', [None, 'wrong-token'])
+def test_request_without_the_token_is_dropped(server, presser, token):
+    request = {'id': 1, 'command': 'start'}
+    if token is not None:
+        request['token'] = token
+    replies = send_raw(server, json.dumps(request).encode() + b'\n' + b'{"command":"status"}\n')
+
+    assert replies == [{'id': None, 'ok': False, 'error': "Invalid or missing token"}]
+    assert not presser.is_running()
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="POSIX file modes")
+def test_token_file_is_private_and_stable(tmp_path):
+    path = str(tmp_path / 'control.token')
+    token = load_token(path, create=True)
+
+    assert load_token(path, create=True) == token == load_token(path)
+    assert stat.S_IMODE((tmp_path / 'control.token').stat().st_mode) == 0o600
@@ -0,0 +1,83 @@
+"""Tests for the binary press journal"""
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from core.journal import FLAG_TOGGLE, RESULT_FAILED, JournalReader, SessionJournal
+
+from conftest import SRC_DIR
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'journal.bin')
+
+
+def test_records_survive_growth_and_reopening(path):
+    journal = SessionJournal(path, chunk_records=4)
+    f1, space = journal.key_id('f1'), journal.key_id('space')
+    for n in range(10):
+        journal.append(float(n), 1000.0 + n, f1 if n % 2 else space, flags=FLAG_TOGGLE, duration=0.001)
+    journal.append(10.0, 1010.0, f1, result=RESULT_FAILED)
+    journal.close()
+
+    journal = SessionJournal(path, chunk_records=4)
+    assert len(journal) == 11
+    assert journal.key_id('f1') == f1
+    journal.close()
+
+    with JournalReader(path) as reader:
+        assert len(reader) == 11
+        assert reader[0].key_id == space and reader[0].flags == FLAG_TOGGLE
+        assert reader[-1].result == RESULT_FAILED
+        assert reader.key_name(reader[1].key_id) == 'f1'
+        assert [record.wall_time for record in reader.between(1003.0, 1006.0)] == [1003.0, 1004.0, 1005.0]
+        assert reader.find_time(2000.0) == 11
+
+
+def test_incompatible_file_is_rejected(path):
+    with open(path, 'wb') as f:
+        f.write(b'not a journal' * 10)
+    with pytest.raises(ValueError, match="Not a compatible press journal"):
+        SessionJournal(path)
+
+
+def test_concurrent_key_ids_are_unique(path):
+    journal = SessionJournal(path)
+    barrier = threading.Barrier(8)
+    ids = []
+
+    def add():
+        barrier.wait()
+        ids.append(tuple(journal.key_id(f"key{n}") for n in range(50)))
+
+    threads = [threading.Thread(target=add) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    journal.close()
+
+    # Every thread sees the same id per name, and each name is stored once
+    assert len(set(ids)) == 1
+    with open(path + '.keys', encoding='utf-8') as f:
+        assert sorted(f.read().split()) == sorted(f"key{n}" for n in range(50))
+
+
+def test_second_process_cannot_open_the_journal(path):
+    journal = SessionJournal(path)
+    code = (
+        f"import sys; sys.path.insert(0, {SRC_DIR!r})\n"
+        "from core.journal import SessionJournal\n"
+        f"SessionJournal({path!r})\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    journal.close()
+
+    assert result.returncode != 0
+    assert "in use by another process" in result.stderr
+
+    # Free again once closed
+    SessionJournal(path).close()
@@ -0,0 +1,77 @@
+"""Tests for the key presser session"""
+import random
+
+from core import key_presser
+from core.clock import VirtualClock
+from core.input_backend import RecordingBackend
+from core.key_presser import KeyPresser
+from core.metrics import MetricsRegistry
+from core.scheduler import Scheduler
+
+
+class FlakyBackend(RecordingBackend):
+    """Records events but fails partway through any batch pressing a given key"""
+
+    def __init__(self, failing_key, clock):
+        super().__init__(clock=clock)
+        self.failing_key = failing_key
+
+    def send(self, events):
+        for index, (code, is_down) in enumerate(events):
+            if code == self.failing_key and is_down:
+                super().send(events[:index])
+                raise OSError("injection failed")
+        super().send(events)
+
+
+def make_presser(macro, failing_key=None):
+    """Create a macro session on virtual time, with a backend failing on failing_key if given"""
+    clock = VirtualClock()
+    scheduler = Scheduler(clock=clock, threaded=False)
+    if failing_key is None:
+        backend = RecordingBackend(clock=clock.monotonic)
+    else:
+        backend = FlakyBackend(failing_key, clock=clock.monotonic)
+    presser = KeyPresser([], 1, 1, scheduler=scheduler, backend=backend, rng=random.Random(0),
+                         metrics=MetricsRegistry(), macro=macro)
+    return presser, scheduler, backend
+
+
+def key_events(backend, key):
+    return [is_down for _, code, is_down in backend.events if code == key]
+
+
+def test_stop_during_a_hold_releases_the_key():
+    presser, scheduler, backend = make_presser("hold w 800ms")
+    presser.start()
+    scheduler.run_until(key_presser.STARTUP_DELAY + 0.3)
+    assert key_events(backend, 'w') == [True]
+
+    presser.stop()
+    assert key_events(backend, 'w') == [True, False]
+
+
+def test_failed_chord_releases_the_keys_it_pressed():
+    presser, scheduler, backend = make_presser("ctrl+a; wait 100ms; tap b", failing_key='a')
+    presser.start()
+    scheduler.run_until(key_presser.STARTUP_DELAY + 1.0)
+
+    # ctrl went down before the chord failed, and is released by the end of the cycle
+    assert key_events(backend, 'ctrl') == [True, False]
+    assert key_events(backend, 'b') == [True, False]
+    presser.stop()
+
+
+def test_update_between_steps_releases_held_keys_before_the_new_plan():
+    presser, scheduler, backend = make_presser("down w; wait 500ms; up w")
+    presser.start()
+    scheduler.run_until(key_presser.STARTUP_DELAY + 0.1)
+    presser.update_config([], 1, 1, macro="tap e")
+    scheduler.run_until(key_presser.STARTUP_DELAY + 120)
+    presser.stop()
+
+    # The old cycle finishes (releasing w) before the new plan presses e
+    codes = [(code, is_down) for _, code, is_down in backend.events]
+    assert codes[:2] == [('w', True), ('w', False)]
+    assert codes[2:4] == [('e', True), ('e', False)]
+    assert key_events(backend, 'w') == [True, False]
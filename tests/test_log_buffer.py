@@ -0,0 +1,64 @@
+"""Tests for the activity log ring buffer"""
+import logging
+
+from gui.log_buffer import LogRingBuffer
+
+
+def make_buffer(lines, **kwargs):
+    buffer = LogRingBuffer(**kwargs)
+    for text in lines:
+        buffer.append(text, logging.INFO)
+    return buffer
+
+
+def test_oldest_lines_are_evicted_at_capacity():
+    buffer = make_buffer([f"line {n}" for n in range(10)], capacity=4)
+
+    assert len(buffer) == 4
+    assert buffer.first_seq == 6
+    assert buffer.lines(0, 10) == ["line 6", "line 7", "line 8", "line 9"]
+
+
+def test_lines_overwritten_in_the_arena_are_evicted():
+    buffer = make_buffer(["a" * 40, "b" * 40, "c" * 40], capacity=10, arena_size=100)
+
+    # The third line wraps to the start of the arena, over the first one
+    assert buffer.lines(0, 10) == ["b" * 40, "c" * 40]
+
+
+def test_search_in_both_directions():
+    buffer = make_buffer(["Pressed F1", "waiting", "pressed f2", "waiting"])
+
+    assert buffer.search("PRESSED", 3) == (2, None)
+    assert buffer.search("pressed", 1) == (0, None)
+    assert buffer.search("pressed", 1, backward=False) == (2, None)
+    assert buffer.search("missing", 3) == (None, None)
+
+
+def test_search_past_either_end_finds_nothing():
+    buffer = make_buffer(["match", "other", "match"])
+
+    # "Next" from a match on the newest line, or "previous" from the oldest
+    assert buffer.search("match", 3, backward=False) == (None, None)
+    assert buffer.search("match", -1, backward=True) == (None, None)
+
+
+def test_search_folds_case_beyond_ascii():
+    buffer = make_buffer(["Ärger mit Taste F1", "plain"])
+
+    assert buffer.search("ärger", 1) == (0, None)
+    assert buffer.search("ÄRGER", 1) == (0, None)
+
+
+def test_search_respects_level_and_limit():
+    buffer = LogRingBuffer()
+    buffer.append("error: key failed", logging.ERROR)
+    for n in range(5):
+        buffer.append(f"info {n}", logging.INFO)
+    buffer.append("info: key pressed", logging.INFO)
+
+    assert buffer.search("key", 6, min_level=logging.ERROR) == (0, None)
+    # A limited search hands back where to resume
+    assert buffer.search("error", 6, limit=3) == (None, 3)
+    assert buffer.search("error", 3, limit=3) == (None, 0)
+    assert buffer.search("error", 0, limit=3) == (0, None)
@@ -0,0 +1,74 @@
+"""Tests for the compressing log rotation"""
+import gzip
+import logging
+import os
+
+from core.log_stats import iter_log_files, iter_log_lines
+from utils import log_setup
+from utils.log_setup import CompressingRotatingFileHandler
+
+
+def make_handler(tmp_path, backup_count=3):
+    """Create a handler rotating every four lines, collecting its reported errors"""
+    handler = CompressingRotatingFileHandler(str(tmp_path / 'app.log'), maxBytes=50, backupCount=backup_count)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    handler.reported = []
+    handler.handleError = handler.reported.append
+    return handler
+
+
+def write_lines(handler, first, count):
+    for number in range(first, first + count):
+        handler.handle(logging.LogRecord('test', logging.INFO, __file__, 0, "line %04d", (number,), None))
+
+
+def read_all(tmp_path):
+    return list(iter_log_lines(iter_log_files(str(tmp_path), filename='app.log')))
+
+
+def test_rollover_gzips_segments_and_keeps_backup_count(tmp_path):
+    handler = make_handler(tmp_path)
+    write_lines(handler, 0, 40)
+    handler.close()
+
+    assert sorted(os.listdir(tmp_path)) == ['app.log', 'app.log.1.gz', 'app.log.2.gz', 'app.log.3.gz']
+    with gzip.open(tmp_path / 'app.log.1.gz', 'rt') as f:
+        assert f.read().splitlines() == ["line 0032", "line 0033", "line 0034", "line 0035"]
+
+    # The kept segments and the live log read back oldest first, ending with the last line
+    lines = read_all(tmp_path)
+    first = int(lines[0].split()[1])
+    assert lines == [f"line {number:04d}" for number in range(first, 40)]
+    assert handler.reported == []
+
+
+def test_failed_compression_keeps_the_segment_uncompressed(tmp_path, monkeypatch):
+    handler = make_handler(tmp_path)
+    write_lines(handler, 0, 4)
+
+    def broken_open(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(log_setup.gzip, 'open', broken_open)
+    write_lines(handler, 4, 1)
+    handler.wait_for_compression()
+    monkeypatch.undo()
+
+    assert sorted(os.listdir(tmp_path)) == ['app.log', 'app.log.1']
+    assert [record.args for record in handler.reported] == [(str(tmp_path / 'app.log.rotating'),)]
+
+    # The next rollover shifts the uncompressed segment instead of overwriting it
+    write_lines(handler, 5, 4)
+    handler.close()
+    assert sorted(os.listdir(tmp_path)) == ['app.log', 'app.log.1.gz', 'app.log.2']
+    assert read_all(tmp_path) == [f"line {number:04d}" for number in range(9)]
+
+
+def test_log_files_are_listed_oldest_first(tmp_path):
+    for name in ('app.log', 'app.log.1.gz', 'app.log.10.gz', 'app.log.2', 'app.log.3.gz', 'other.log.1.gz'):
+        (tmp_path / name).touch()
+
+    assert [os.path.basename(path) for path in iter_log_files(str(tmp_path), filename='app.log')] == [
+        'app.log.10.gz', 'app.log.3.gz', 'app.log.2', 'app.log.1.gz', 'app.log',
+    ]
+    assert iter_log_files(str(tmp_path / 'missing'), filename='app.log') == []
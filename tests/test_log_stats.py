@@ -0,0 +1,106 @@
+"""Tests for the log statistics"""
+import logging
+from datetime import datetime
+
+import pytest
+
+from core.input_backend import RecordingBackend
+from core.key_plan import compile_plan
+from core.macro import compile_macro
+from core.log_stats import LogStats
+from utils.log_setup import DATE_FORMAT, LOG_FORMAT
+
+START = datetime(2026, 1, 5, 12, 0, 0).timestamp()
+FORMATTER = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+
+
+def record(offset, message, level=logging.INFO):
+    """Format a log line as the file handler writes it, offset seconds after START"""
+    entry = logging.LogRecord('core.key_presser', level, __file__, 0, message, None, None)
+    entry.created = START + offset
+    entry.msecs = int(round(entry.created % 1 * 1000)) % 1000
+    return FORMATTER.format(entry)
+
+
+def feed(lines):
+    stats = LogStats()
+    for line in lines:
+        stats.feed(line)
+    return stats
+
+
+def test_key_plan_duration():
+    keys_config = [{'key': 'a', 'press_twice': True}, {'key': 'b'}]
+    assert compile_plan(keys_config, RecordingBackend()).duration() == pytest.approx((1.0, 1.0))
+
+    macro = compile_macro("tap a; wait 100-300ms; tap b; wait 200ms; tap c", RecordingBackend())
+    assert macro.duration() == pytest.approx((0.3, 0.5))
+
+
+def test_sub_second_intervals_flag_short_and_long_ones():
+    # 0.25-2 second intervals with a 0.1 second cycle: consecutive "Pressed"
+    # records are 0.35-2.1 seconds apart, give or take 0.05 seconds
+    lines = [record(0, "Starting key presser (interval 0.00416667-0.0333333 minutes, "
+                       "cycle 0.100-0.100 seconds)...")]
+    offset = 5.0
+    for interval in (0.36, 2.1, 0.2, 2.5, 0.32, 2.14):
+        lines.append(record(offset, "Pressed: a + b"))
+        offset += interval
+    lines.append(record(offset, "Pressed: a + b"))
+    stats = feed(lines)
+
+    intervals = stats.to_dict()['intervals_seconds']
+    assert intervals['within_range'] == 4
+    assert intervals['below_min'] == 1
+    assert intervals['above_max'] == 1
+    assert stats.gap_count == 1
+
+
+def test_tolerance_scales_with_the_interval():
+    # 10 % of a 5 minute interval is 30 seconds, capped at 10 seconds
+    lines = [record(0, "Starting key presser (interval 5-10 minutes, cycle 0.500-0.500 seconds)...")]
+    offset = 5.0
+    for interval in (291, 289.5, 610, 611.5):
+        lines.append(record(offset, "Pressed: a"))
+        offset += interval
+    lines.append(record(offset, "Pressed: a"))
+    stats = feed(lines)
+
+    intervals = stats.to_dict()['intervals_seconds']
+    assert (intervals['below_min'], intervals['within_range'], intervals['above_max']) == (1, 2, 1)
+
+
+def test_reconfigure_updates_the_range_and_cycle():
+    lines = [
+        record(0, "Starting key presser (interval 1-1 minutes, cycle 0.000-0.000 seconds)..."),
+        record(5, "Pressed: a"),
+        record(65, "Pressed: a"),
+        record(66, "Key presser reconfigured (interval 0.01-0.01 minutes, cycle 1.000-1.000 seconds)"),
+        record(66.6, "Pressed: a"),
+    ]
+    stats = feed(lines)
+
+    intervals = stats.to_dict()['intervals_seconds']
+    assert intervals['within_range'] == 2
+    assert stats.configs == {(1.0, 1.0): 1, (0.01, 0.01): 1}
+
+
+def test_older_logs_without_milliseconds_or_cycle_still_parse():
+    lines = [
+        "2025-06-01 08:00:00 - core.key_presser - INFO - Starting key presser (interval 1-2 minutes)...",
+        "2025-06-01 08:00:05 - core.key_presser - INFO - Pressed: shift",
+        "2025-06-01 08:01:10 - core.key_presser - INFO - Pressed: shift",
+        "2025-06-01 08:01:50 - core.key_presser - INFO - Pressed: shift",
+        "2025-06-01 08:04:10 - core.key_presser - INFO - Pressed: shift",
+        "2025-06-01 08:04:11 - core.key_presser - ERROR - Error pressing key 'shift'",
+        "2025-06-01 08:04:12 - core.key_presser - INFO - Key pressing stopped",
+    ]
+    stats = feed(lines)
+
+    data = stats.to_dict()
+    assert data['records'] == 7
+    assert data['sessions'] == 1
+    assert data['press_errors'] == 1
+    intervals = data['intervals_seconds']
+    # The fixed 10 second allowance still applies
+    assert (intervals['below_min'], intervals['within_range'], intervals['above_max']) == (1, 1, 1)
@@ -0,0 +1,47 @@
+"""Tests for macro parsing and compilation"""
+import pytest
+
+from core.input_backend import RecordingBackend
+from core.macro import compile_macro, parse_macro
+
+
+@pytest.mark.parametrize('text, message', [
+    ('bogus a', "unknown statement"),
+    ('wait 5', "invalid duration"),
+    ('wait 400-200ms', "range is reversed"),
+    ('wait 61s', "longer than"),
+    ('ctrl+', "invalid key combination"),
+    ('ctrl+ctrl', "key repeated"),
+    ('down a; down a', "already held"),
+])
+def test_invalid_macros_are_rejected(text, message):
+    with pytest.raises(ValueError, match=message):
+        parse_macro(text)
+
+
+def test_unknown_key_is_rejected_when_compiled():
+    with pytest.raises(ValueError, match="Invalid key 'zz'"):
+        compile_macro("tap zz", RecordingBackend(valid_keys={'a'}))
+
+
+def test_events_without_a_wait_share_one_batch():
+    plan = compile_macro("ctrl+a; tap b; wait 100ms; hold w 300ms", RecordingBackend())
+
+    assert [action.key for action in plan.actions] == ['ctrl', 'a', 'b', 'w']
+    assert [batch for _, batch in plan.steps] == [
+        (('ctrl', True), ('a', True), ('a', False), ('ctrl', False), ('b', True), ('b', False)),
+        (('w', True),),
+        (('w', False),),
+    ]
+    assert list(plan.gaps) == pytest.approx([0.1, 0.3, 0.0])
+    assert list(plan.jitters) == [0.0, 0.0, 0.0]
+    assert list(plan.presses) == [3, 1, 0]
+
+
+def test_leading_wait_and_jitter_ranges():
+    plan = compile_macro("wait 50ms; tap a; wait 200-300ms; wait 100ms; tap b; wait 1s", RecordingBackend())
+
+    assert [batch for _, batch in plan.steps] == [(), (('a', True), ('a', False)), (('b', True), ('b', False))]
+    # Consecutive waits add up, and a trailing wait is dropped
+    assert list(plan.gaps) == pytest.approx([0.05, 0.3, 0.0])
+    assert list(plan.jitters) == pytest.approx([0.0, 0.1, 0.0])
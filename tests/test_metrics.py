@@ -0,0 +1,52 @@
+"""Tests for the runtime metrics registry"""
+import threading
+
+import pytest
+
+from core.metrics import Counter, Histogram, MetricsRegistry, SharedCounter, SharedHistogram
+
+
+def test_shared_metrics_are_locked_and_press_metrics_are_not():
+    registry = MetricsRegistry()
+    assert type(registry.counter('presses', "Presses")) is Counter
+    assert type(registry.counter('stops', "Stops", shared=True)) is SharedCounter
+    assert type(registry.histogram('press_duration_seconds', "Duration")) is Histogram
+    assert type(registry.histogram('status_callback_seconds', "Callbacks", shared=True)) is SharedHistogram
+
+    # The same name always returns the same metric, of the same kind
+    assert registry.counter('presses', "Presses") is registry.get('presses')
+    with pytest.raises(ValueError, match="already registered"):
+        registry.counter('presses', "Presses", shared=True)
+
+
+def test_shared_counter_counts_every_thread():
+    counter = SharedCounter('stops', "Stops")
+
+    def work():
+        for _ in range(10000):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.value == 40000
+
+
+def test_histogram_quantiles_and_snapshot():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('slip_seconds', "Slip", buckets=(0.001, 0.01, 0.1))
+    for value in (0.0005, 0.0005, 0.005, 0.05, 2.0):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.4) == 0.001
+    assert histogram.quantile(0.6) == 0.01
+    # The overflow bucket reports the observed maximum
+    assert histogram.quantile(1.0) == 2.0
+    assert histogram.mean() == pytest.approx(2.056 / 5)
+
+    snapshot = registry.snapshot()['histograms']['slip_seconds']
+    assert snapshot['counts'] == [2, 1, 1, 1]
+    assert snapshot['count'] == 5
+    assert 'extended_afk_slip_seconds_bucket{le="+Inf"} 5' in registry.to_openmetrics()
@@ -0,0 +1,87 @@
+"""Tests for the shared deadline scheduler"""
+import threading
+import time
+
+from core.clock import VirtualClock
+from core.scheduler import Scheduler
+
+
+class BlockingSession:
+    """Session whose on_deadline blocks until released, then asks to run again"""
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.calls = 0
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def on_deadline(self, now):
+        self.calls += 1
+        self.entered.set()
+        self.release.wait(5)
+        return self.scheduler.clock.monotonic() + 0.01
+
+
+class SelfCancellingSession:
+    """Session that unregisters itself while firing but still returns a deadline"""
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.calls = 0
+
+    def on_deadline(self, now):
+        self.calls += 1
+        self.scheduler.unregister(self)
+        return now + 1.0
+
+
+def test_unregister_waits_for_a_firing_session():
+    scheduler = Scheduler(name="test-scheduler")
+    session = BlockingSession(scheduler)
+    scheduler.register(session, scheduler.clock.monotonic())
+    assert session.entered.wait(5)
+
+    result = {}
+    canceller = threading.Thread(target=lambda: result.setdefault('removed', scheduler.unregister(session)))
+    canceller.start()
+    canceller.join(0.1)
+    # Still inside on_deadline, so unregister has not returned yet
+    assert canceller.is_alive()
+    assert not scheduler.is_registered(session)
+
+    session.release.set()
+    canceller.join(5)
+    assert result == {'removed': True}
+
+    # The deadline returned by the cancelled call is dropped
+    time.sleep(0.05)
+    assert session.calls == 1
+    assert scheduler.next_deadline(session) is None
+    assert scheduler.session_count() == 0
+
+
+def test_unregister_from_inside_on_deadline_drops_the_next_deadline():
+    scheduler = Scheduler(clock=VirtualClock(), threaded=False)
+    session = SelfCancellingSession(scheduler)
+    scheduler.register(session, 1.0)
+
+    assert scheduler.run_until(10.0) == 1
+    assert session.calls == 1
+    assert not scheduler.is_registered(session)
+
+
+def test_register_while_firing_keeps_the_new_deadline():
+    scheduler = Scheduler(clock=VirtualClock(), threaded=False)
+    calls = []
+
+    class Session:
+        def on_deadline(self, now):
+            calls.append(now)
+            # Cancel, then re-register: the new deadline wins over the returned one
+            scheduler.unregister(self)
+            scheduler.register(self, now + 5.0)
+            return now + 1.0
+
+    scheduler.register(Session(), 1.0)
+    scheduler.run_until(12.0)
+    assert calls == [1.0, 6.0, 11.0]
@@ -0,0 +1,109 @@
+"""Tests for settings persistence"""
+import json
+import os
+
+import pytest
+
+from core import settings as settings_module
+from core.clock import VirtualClock
+from core.scheduler import Scheduler
+from core.settings import FLUSH_DELAY, AppSettings
+
+
+@pytest.fixture
+def scheduler():
+    return Scheduler(clock=VirtualClock(), threaded=False)
+
+
+@pytest.fixture
+def make_settings(monkeypatch, tmp_path, scheduler):
+    """Factory for AppSettings stored in a temporary directory"""
+    monkeypatch.setattr(settings_module, 'get_app_dir', lambda: str(tmp_path / 'extended-afk'))
+    return lambda: AppSettings(scheduler=scheduler)
+
+
+def read_file(settings):
+    with open(settings.settings_file) as f:
+        return json.load(f)
+
+
+def write_file(settings, **values):
+    # Written by "another program", with a new size so the change is noticed
+    data = {**read_file(settings), **values, 'note': 'x' * len(values)}
+    with open(settings.settings_file, 'w') as f:
+        json.dump(data, f)
+
+
+def test_changes_are_written_once_after_the_delay(make_settings, scheduler, monkeypatch):
+    settings = make_settings()
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, 'fsync', lambda fd: synced.append(fd) or real_fsync(fd))
+
+    with settings.batch():
+        settings.set('min_interval_minutes', 3)
+        settings.set('max_interval_minutes', 4)
+    assert not os.path.exists(settings.settings_file)
+
+    scheduler.run_until(FLUSH_DELAY)
+    assert read_file(settings)['min_interval_minutes'] == 3
+    assert read_file(settings)['max_interval_minutes'] == 4
+    # Written through the temporary file, synced before it is swapped in
+    assert len(synced) == 1
+    assert not os.path.exists(settings.settings_file + '.tmp')
+
+
+def test_failed_write_is_retried_on_flush(make_settings, monkeypatch):
+    settings = make_settings()
+    settings.set('min_interval_minutes', 3)
+
+    real_replace = os.replace
+    monkeypatch.setattr(os, 'replace', lambda *args: (_ for _ in ()).throw(OSError("disk full")))
+    settings.flush()
+    assert not os.path.exists(settings.settings_file)
+
+    monkeypatch.setattr(os, 'replace', real_replace)
+    settings.flush()
+    assert read_file(settings)['min_interval_minutes'] == 3
+
+
+def test_reload_keeps_unsaved_changes(make_settings, scheduler):
+    settings = make_settings()
+    settings.save()
+    settings.set('macro', 'tap a')
+    write_file(settings, max_interval_minutes=20)
+
+    assert settings.reload_if_changed()
+    assert settings.get('max_interval_minutes') == 20
+    assert settings.get('macro') == 'tap a'
+
+    scheduler.run_until(FLUSH_DELAY)
+    assert read_file(settings)['macro'] == 'tap a'
+    assert read_file(settings)['max_interval_minutes'] == 20
+
+
+def test_reload_drops_unsaved_changes_that_conflict(make_settings, scheduler):
+    settings = make_settings()
+    settings.save()
+    settings.set('min_interval_minutes', 13)
+    write_file(settings, max_interval_minutes=12)
+
+    assert settings.reload_if_changed()
+    assert settings.get('min_interval_minutes') == 10
+    assert settings.get('max_interval_minutes') == 12
+    settings.flush()
+    assert read_file(settings)['min_interval_minutes'] == 10
+
+
+@pytest.mark.parametrize('values', [
+    {'keys_config': [{'name': 'a'}]},
+    {'min_interval_minutes': 'soon'},
+    {'min_interval_minutes': 20},
+    {'input_backend': 'telepathy'},
+])
+def test_invalid_file_falls_back_to_defaults(make_settings, values):
+    settings = make_settings()
+    settings.save()
+    write_file(settings, **values)
+
+    assert make_settings().get_all() == settings.defaults
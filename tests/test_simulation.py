@@ -0,0 +1,33 @@
+"""Tests for the virtual-time schedule simulation"""
+from core.key_presser import STARTUP_DELAY
+from core.key_plan import PRESS_GAP
+from core.simulation import simulate
+
+KEYS = [{'key': 'a', 'press_twice': False}, {'key': 'b', 'press_twice': True}]
+
+
+def test_same_seed_gives_same_timeline():
+    first = simulate(KEYS, 1, 2, days=1, seed=7)
+    second = simulate(KEYS, 1, 2, days=1, seed=7)
+    assert first.to_json() == second.to_json()
+
+
+def test_different_seed_gives_different_timeline():
+    assert simulate(KEYS, 1, 2, days=1, seed=1).to_list() != simulate(KEYS, 1, 2, days=1, seed=2).to_list()
+
+
+def test_cycles_follow_the_configured_intervals():
+    result = simulate(KEYS, 1, 2, days=1, seed=3)
+    presses = result.presses()
+
+    # Each cycle presses a once and b twice, PRESS_GAP apart
+    assert presses[:3] == [(STARTUP_DELAY, 'a'), (STARTUP_DELAY + PRESS_GAP, 'b'), (STARTUP_DELAY + 2 * PRESS_GAP, 'b')]
+    cycles = [presses[i:i + 3] for i in range(0, len(presses) - 2, 3)]
+    assert all([key for _, key in cycle] == ['a', 'b', 'b'] for cycle in cycles)
+
+    # The next cycle starts 1-2 minutes after the last press of the previous one
+    for previous, cycle in zip(cycles, cycles[1:]):
+        assert 60 <= cycle[0][0] - previous[-1][0] <= 120
+
+    # Every press is released
+    assert sum(1 for _, _, is_down in result.events if not is_down) == len(presses)
@@ -0,0 +1,56 @@
+"""Tests for the single-instance endpoint"""
+import os
+import socket
+import stat
+import sys
+
+import pytest
+
+from utils import single_instance
+from utils.single_instance import claim_or_forward, get_address, make_message
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason="Unix socket endpoint")
+
+
+@pytest.fixture
+def address(tmp_path):
+    return str(tmp_path / 'run' / 'instance.sock')
+
+
+def test_address_is_a_socket_in_a_private_runtime_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    assert get_address() == os.path.join(str(tmp_path), 'extended-afk', 'instance.sock')
+
+
+def test_second_launch_is_forwarded_to_the_first(address):
+    received = []
+    server, reply = claim_or_forward(make_message(['show']), address)
+    try:
+        assert reply is None
+        assert stat.S_IMODE(os.stat(os.path.dirname(address)).st_mode) == 0o700
+        server.set_handler(received.append)
+
+        server_2, reply = claim_or_forward(make_message(['start']), address)
+        assert server_2 is None
+        assert reply == {'ok': True}
+        assert received == [{'actions': ['start'], 'profile': None}]
+    finally:
+        server.close()
+
+
+def test_stale_socket_file_is_replaced(address):
+    # A socket file left behind by a crashed instance: nobody answers on it
+    os.makedirs(os.path.dirname(address), mode=0o700)
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(address)
+    stale.close()
+
+    server, reply = claim_or_forward(make_message(['show']), address)
+    assert reply is None
+    server.close()
+
+
+def test_unreachable_endpoint_fails_instead_of_starting_a_second_window(monkeypatch, address):
+    monkeypatch.setattr(single_instance, 'InstanceServer', lambda address: (_ for _ in ()).throw(OSError("busy")))
+    with pytest.raises(RuntimeError, match="busy"):
+        claim_or_forward(make_message(['show']), address, timeout=0.1)
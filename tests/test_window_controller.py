@@ -0,0 +1,97 @@
+"""Tests for the main window's control server commands"""
+import queue
+import threading
+import time
+
+import pytest
+
+from core import settings as settings_module
+from core.clock import VirtualClock
+from core.control_server import ControlClient, ControlServer
+from core.input_backend import RecordingBackend
+from core.metrics import MetricsRegistry
+from core.scheduler import Scheduler
+from core.settings import AppSettings
+from gui import window_controller
+from gui.window_controller import WindowController
+
+TOKEN = 'test-token'
+
+
+class FakeRoot:
+    """Stands in for the Tk root: runs after() callbacks on its own thread, a little late"""
+
+    def __init__(self):
+        self.calls = queue.Queue()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def after(self, delay, func, *args):
+        self.calls.put((func, args))
+
+    def close(self):
+        self.calls.put(None)
+        self.thread.join()
+
+    def _loop(self):
+        while True:
+            call = self.calls.get()
+            if call is None:
+                return
+            time.sleep(0.05)
+            call[0](*call[1])
+
+
+class FakeWindow:
+    """The parts of MainWindow the controller uses"""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.key_presser = None
+        self.root = FakeRoot()
+
+    def apply_config(self, keys_config, min_interval_minutes, max_interval_minutes, macro=None):
+        with self.settings.batch():
+            self.settings.set('keys_config', keys_config)
+            self.settings.set('macro', macro or '')
+            self.settings.set('min_interval_minutes', min_interval_minutes)
+            self.settings.set('max_interval_minutes', max_interval_minutes)
+
+
+@pytest.fixture
+def window(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings_module, 'get_app_dir', lambda: str(tmp_path))
+    monkeypatch.setattr(window_controller, 'get_backend', lambda name: RecordingBackend(valid_keys={'a', 'b'}))
+    window = FakeWindow(AppSettings(scheduler=Scheduler(clock=VirtualClock(), threaded=False)))
+    yield window
+    window.root.close()
+
+
+@pytest.fixture
+def client(window):
+    server = ControlServer(WindowController(window), '127.0.0.1:0', metrics=MetricsRegistry(), token=TOKEN).start()
+    with ControlClient(server.bound_address, token=TOKEN) as client:
+        yield client
+    server.stop()
+
+
+def test_update_reply_shows_the_applied_config(client):
+    status = client.request('update', keys=['b'], min_interval_minutes=2, max_interval_minutes=3, macro='tap a')
+
+    assert status['keys_config'] == [{'key': 'b', 'press_twice': False}]
+    assert (status['min_interval_minutes'], status['max_interval_minutes']) == (2, 3)
+    assert status['macro'] == 'tap a'
+
+
+def test_invalid_update_never_reaches_the_window(client, window):
+    with pytest.raises(RuntimeError, match="Invalid key 'zz'"):
+        client.request('update', keys=['zz'])
+    with pytest.raises(RuntimeError, match="Nothing to press"):
+        client.request('update', keys=[], macro='')
+    assert 'keys_config' not in window.settings.get_all()
+
+
+def test_update_fails_if_the_window_does_not_apply_it(window, monkeypatch):
+    monkeypatch.setattr(window_controller, 'APPLY_TIMEOUT', 0.01)
+    with pytest.raises(RuntimeError, match="did not apply"):
+        WindowController(window).update([{'key': 'a', 'press_twice': False}], 1, 2)